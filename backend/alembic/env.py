@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from app.core.config import get_settings
 from app.db.base import Base
 from app.db.models import (  # noqa: F401
+    ArtifactBlobModel,
     LedgerEntryModel,
     MemoryNodeModel,
     MemoryRelationshipModel,
@@ -0,0 +1,51 @@
+"""Ordered, append-only ledger entries.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "002"
+down_revision: str | None = "001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ledger_entries",
+        sa.Column("sequence", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Backfill existing rows in timestamp order per passport
+    op.execute(
+        """
+        UPDATE ledger_entries AS le
+        SET sequence = ordered.seq
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY passport_id ORDER BY timestamp, id) AS seq
+            FROM ledger_entries
+        ) AS ordered
+        WHERE le.id = ordered.id
+        """
+    )
+
+    op.create_unique_constraint(
+        "uq_ledger_entries_passport_sequence",
+        "ledger_entries",
+        ["passport_id", "sequence"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_ledger_entries_passport_sequence", "ledger_entries", type_="unique"
+    )
+    op.drop_column("ledger_entries", "sequence")
@@ -0,0 +1,35 @@
+"""Content-addressed artifact blobs.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "003"
+down_revision: str | None = "002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "artifact_blobs",
+        sa.Column("digest", sa.String(64), nullable=False),
+        sa.Column("oid", postgresql.OID(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("digest"),
+    )
+
+
+def downgrade() -> None:
+    op.execute("SELECT lo_unlink(oid) FROM artifact_blobs")
+    op.drop_table("artifact_blobs")
@@ -0,0 +1,95 @@
+"""Composite indexes matching memory and passport query shapes.
+
+Memory queries always filter on tenant_id and team_id, optionally layer or
+node_type, and order by (salience, id) descending. Mission listings filter on
+tenant_id (and status) and order by (created_at, id) descending. The single
+column indexes these replace made the planner intersect bitmaps and sort.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "004"
+down_revision: str | None = "003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SALIENCE_ORDER = [sa.text("salience DESC"), sa.text("id DESC")]
+CREATED_ORDER = [sa.text("created_at DESC"), sa.text("id DESC")]
+
+# Superseded by the composite indexes below
+REPLACED_MEMORY_INDEXES = {
+    "ix_memory_nodes_team_id": ["team_id"],
+    "ix_memory_nodes_layer": ["layer"],
+    "ix_memory_nodes_node_type": ["node_type"],
+    "ix_memory_nodes_salience": ["salience"],
+}
+
+
+def upgrade() -> None:
+    # Lets a GIN index lead with the scalar tenant/team columns
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    op.create_index(
+        "ix_memory_nodes_scope_salience",
+        "memory_nodes",
+        ["tenant_id", "team_id", *SALIENCE_ORDER],
+    )
+    op.create_index(
+        "ix_memory_nodes_scope_layer_salience",
+        "memory_nodes",
+        ["tenant_id", "team_id", "layer", *SALIENCE_ORDER],
+    )
+    op.create_index(
+        "ix_memory_nodes_scope_type_salience",
+        "memory_nodes",
+        ["tenant_id", "team_id", "node_type", *SALIENCE_ORDER],
+    )
+    # Prefix LIKE ('event.finding.%') on symbol regardless of collation
+    op.create_index(
+        "ix_memory_nodes_symbol_prefix",
+        "memory_nodes",
+        ["tenant_id", sa.text("symbol text_pattern_ops")],
+    )
+    op.create_index(
+        "ix_memory_nodes_scope_tags",
+        "memory_nodes",
+        ["tenant_id", "team_id", "tags"],
+        postgresql_using="gin",
+    )
+    op.drop_index("ix_memory_nodes_tags", table_name="memory_nodes")
+    for name in REPLACED_MEMORY_INDEXES:
+        op.drop_index(name, table_name="memory_nodes")
+
+    op.create_index(
+        "ix_passports_tenant_created",
+        "passports",
+        ["tenant_id", *CREATED_ORDER],
+    )
+    op.create_index(
+        "ix_passports_tenant_status_created",
+        "passports",
+        ["tenant_id", "status", *CREATED_ORDER],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_passports_tenant_status_created", table_name="passports")
+    op.drop_index("ix_passports_tenant_created", table_name="passports")
+
+    for name, columns in REPLACED_MEMORY_INDEXES.items():
+        op.create_index(name, "memory_nodes", columns)
+    op.create_index("ix_memory_nodes_tags", "memory_nodes", ["tags"], postgresql_using="gin")
+    op.drop_index("ix_memory_nodes_scope_tags", table_name="memory_nodes")
+    op.drop_index("ix_memory_nodes_symbol_prefix", table_name="memory_nodes")
+    op.drop_index("ix_memory_nodes_scope_type_salience", table_name="memory_nodes")
+    op.drop_index("ix_memory_nodes_scope_layer_salience", table_name="memory_nodes")
+    op.drop_index("ix_memory_nodes_scope_salience", table_name="memory_nodes")
@@ -0,0 +1,36 @@
+"""Trigram index on memory node symbols.
+
+Symbol globs with a leading or middle wildcard (``*.finding.*``,
+``event.*.dayton*``) cannot use the text_pattern_ops prefix index and fell
+back to a sequential scan. A pg_trgm GIN index serves any LIKE pattern with
+a literal run of three or more characters.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_memory_nodes_symbol_trgm",
+        "memory_nodes",
+        ["tenant_id", "symbol"],
+        postgresql_using="gin",
+        postgresql_ops={"symbol": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_memory_nodes_symbol_trgm", table_name="memory_nodes")
@@ -0,0 +1,165 @@
+"""Partition memory_nodes and memory_relationships by tenant.
+
+Both tables become ``PARTITION BY LIST (tenant_id)`` with one partition per
+existing tenant plus a DEFAULT partition. Partitioned tables need the
+partition key in every unique constraint, so primary keys become
+(tenant_id, id) and relationship foreign keys reference
+memory_nodes (tenant_id, id). New tenants get partitions from
+app.db.partitions.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "006"
+down_revision: str | None = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("memory_nodes", "memory_relationships")
+
+SALIENCE_ORDER = [sa.text("salience DESC"), sa.text("id DESC")]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS) "
+            "PARTITION BY LIST (tenant_id)"
+        )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table}_partitioned DEFAULT")
+
+    tenant_ids = op.get_bind().execute(sa.text("SELECT id FROM tenants")).scalars().all()
+    for tenant_id in tenant_ids:
+        for table in TABLES:
+            # Same naming as app.db.partitions.partition_name
+            op.execute(
+                f"CREATE TABLE {table}_{tenant_id.hex} PARTITION OF {table}_partitioned "
+                f"FOR VALUES IN ('{tenant_id}')"
+            )
+
+    for table in TABLES:
+        op.execute(f"INSERT INTO {table}_partitioned SELECT * FROM {table}")
+    for table in reversed(TABLES):
+        op.drop_table(table)
+    for table in TABLES:
+        op.rename_table(f"{table}_partitioned", table)
+
+    op.create_primary_key("memory_nodes_pkey", "memory_nodes", ["tenant_id", "id"])
+    op.create_foreign_key(None, "memory_nodes", "tenants", ["tenant_id"], ["id"])
+    op.create_unique_constraint(
+        "uq_memory_nodes_tenant_symbol", "memory_nodes", ["tenant_id", "symbol"]
+    )
+    _create_memory_node_indexes()
+
+    op.create_primary_key(
+        "memory_relationships_pkey", "memory_relationships", ["tenant_id", "id"]
+    )
+    op.create_foreign_key(None, "memory_relationships", "tenants", ["tenant_id"], ["id"])
+    for end in ("source", "target"):
+        op.create_foreign_key(
+            f"fk_memory_relationships_{end}",
+            "memory_relationships",
+            "memory_nodes",
+            ["tenant_id", f"{end}_id"],
+            ["tenant_id", "id"],
+        )
+        op.create_index(
+            f"ix_memory_relationships_{end}_id",
+            "memory_relationships",
+            ["tenant_id", f"{end}_id"],
+        )
+    op.create_unique_constraint(
+        "uq_memory_relationships_source_target_type",
+        "memory_relationships",
+        ["tenant_id", "source_id", "target_id", "relation_type"],
+    )
+    _create_relationship_indexes()
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"CREATE TABLE {table}_plain (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_plain SELECT * FROM {table}")
+    for table in reversed(TABLES):
+        op.execute(f"DROP TABLE {table} CASCADE")  # Drops the partitions with it
+    for table in TABLES:
+        op.rename_table(f"{table}_plain", table)
+
+    op.create_primary_key("memory_nodes_pkey", "memory_nodes", ["id"])
+    op.create_foreign_key(None, "memory_nodes", "tenants", ["tenant_id"], ["id"])
+    op.create_unique_constraint(
+        "uq_memory_nodes_tenant_symbol", "memory_nodes", ["tenant_id", "symbol"]
+    )
+    _create_memory_node_indexes()
+
+    op.create_primary_key("memory_relationships_pkey", "memory_relationships", ["id"])
+    op.create_foreign_key(None, "memory_relationships", "tenants", ["tenant_id"], ["id"])
+    for end in ("source", "target"):
+        op.create_foreign_key(
+            None, "memory_relationships", "memory_nodes", [f"{end}_id"], ["id"]
+        )
+        op.create_index(
+            f"ix_memory_relationships_{end}_id", "memory_relationships", [f"{end}_id"]
+        )
+    op.create_unique_constraint(
+        "uq_memory_relationships_source_target_type",
+        "memory_relationships",
+        ["source_id", "target_id", "relation_type"],
+    )
+    _create_relationship_indexes()
+
+
+def _create_memory_node_indexes() -> None:
+    """Indexes from 001, 004 and 005; on a partitioned table they cascade."""
+    op.create_index("ix_memory_nodes_tenant_id", "memory_nodes", ["tenant_id"])
+    op.create_index(
+        "ix_memory_nodes_scope_salience",
+        "memory_nodes",
+        ["tenant_id", "team_id", *SALIENCE_ORDER],
+    )
+    op.create_index(
+        "ix_memory_nodes_scope_layer_salience",
+        "memory_nodes",
+        ["tenant_id", "team_id", "layer", *SALIENCE_ORDER],
+    )
+    op.create_index(
+        "ix_memory_nodes_scope_type_salience",
+        "memory_nodes",
+        ["tenant_id", "team_id", "node_type", *SALIENCE_ORDER],
+    )
+    op.create_index(
+        "ix_memory_nodes_symbol_prefix",
+        "memory_nodes",
+        ["tenant_id", sa.text("symbol text_pattern_ops")],
+    )
+    op.create_index(
+        "ix_memory_nodes_symbol_trgm",
+        "memory_nodes",
+        ["tenant_id", "symbol"],
+        postgresql_using="gin",
+        postgresql_ops={"symbol": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_memory_nodes_scope_tags",
+        "memory_nodes",
+        ["tenant_id", "team_id", "tags"],
+        postgresql_using="gin",
+    )
+
+
+def _create_relationship_indexes() -> None:
+    op.create_index(
+        "ix_memory_relationships_tenant_id", "memory_relationships", ["tenant_id"]
+    )
+    op.create_index(
+        "ix_memory_relationships_relation_type", "memory_relationships", ["relation_type"]
+    )
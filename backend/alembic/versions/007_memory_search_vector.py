@@ -0,0 +1,44 @@
+"""Full-text search vector on memory nodes.
+
+A stored generated tsvector over micro (weight A), summary (B) and every
+string in full_content (C), with a GIN index scoped by (tenant_id, team_id).
+Generated columns propagate to existing and future tenant partitions.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('english', coalesce(micro, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(summary, '')), 'B')
+    || setweight(jsonb_to_tsvector('english', coalesce(full_content, '{}'), '["string"]'), 'C')
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE memory_nodes ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    op.create_index(  # Needs btree_gin (004) for the scalar columns
+        "ix_memory_nodes_scope_search",
+        "memory_nodes",
+        ["tenant_id", "team_id", "search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_memory_nodes_scope_search", table_name="memory_nodes")
+    op.drop_column("memory_nodes", "search_vector")
@@ -0,0 +1,45 @@
+"""Transactional outbox for vector index writes.
+
+Node changes record an upsert/delete event in the same transaction; a relay
+applies the events to the vector index, so rolled-back transactions leave no
+orphan vectors and deleted nodes lose their embeddings.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "memory_outbox",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("team_id", sa.String(100), nullable=False),
+        sa.Column("node_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("operation", sa.String(10), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("available_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_memory_outbox_available", "memory_outbox", ["available_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_memory_outbox_available", table_name="memory_outbox")
+    op.drop_table("memory_outbox")
@@ -0,0 +1,36 @@
+"""Backfill per-tag keys in vector metadata.
+
+Vectors written before metadata layout 2 have no ``tag:*`` keys, so tag
+filters pushed into the vector search skip them. Enqueue an outbox upsert for
+every node: the relay rewrites their metadata in the current layout (the text
+is unchanged, so nothing is re-embedded).
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO memory_outbox (tenant_id, team_id, node_id, operation, created_at)
+        SELECT tenant_id, team_id, id, 'upsert', now()
+        FROM memory_nodes
+        ORDER BY tenant_id, team_id
+        """
+    )
+
+
+def downgrade() -> None:
+    pass  # Applied events only rewrote metadata; pending ones are harmless
@@ -0,0 +1,36 @@
+"""Newest-first index for cursor-paged memory listings.
+
+Memory query cursors key on (created_at, id): salience changes on every read,
+so pages keyed on it could skip or repeat nodes. On the partitioned table the
+index cascades to every tenant partition.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CREATED_ORDER = [sa.text("created_at DESC"), sa.text("id DESC")]
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_memory_nodes_scope_created",
+        "memory_nodes",
+        ["tenant_id", "team_id", *CREATED_ORDER],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_memory_nodes_scope_created", table_name="memory_nodes")
@@ -1,15 +1,24 @@
 """Base agent class with confidence tracking and tool execution."""
 
+import json
+import logging
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from anthropic import AsyncAnthropic
 from pydantic import BaseModel
 
+from app.agents.context import ContextFormat, ContextRenderer, ContextRules, RenderedContext
+from app.artifacts import get_artifact_store
 from app.core.config import get_settings
-from app.models.passport import ConfidenceVector, Passport
+from app.models.passport import ConfidenceVector, ContextRef, Passport
+
+if TYPE_CHECKING:
+    from app.platform.ledger import LedgerWriter
+
+logger = logging.getLogger(__name__)
 
 
 class AgentConfig(BaseModel):
@@ -24,6 +33,12 @@ class AgentConfig(BaseModel):
     tools: list[dict[str, Any]] = []
     autonomy_level: int = 1  # 1-5, per de-scaffolding spec
 
+    # Prompt context rendering
+    context_format: ContextFormat = ContextFormat.YAML
+    context_token_budget: int | None = 1500
+    context_include: list[str] | None = None  # Keys in priority order (None = all)
+    context_exclude: list[str] = []
+
 
 @dataclass
 class AgentResult:
@@ -46,6 +61,7 @@ class Agent(ABC):
         self.config = config
         self.settings = get_settings()
         self.client = AsyncAnthropic(api_key=self.settings.anthropic_api_key)
+        self.artifact_store = get_artifact_store()
         self._calibration_history: list[tuple[float, bool]] = []
 
     @property
@@ -64,17 +80,26 @@ class Agent(ABC):
         """
         pass
 
-    async def execute(self, passport: Passport) -> Passport:
-        """Execute agent logic and update passport."""
+    async def execute(
+        self,
+        passport: Passport,
+        ledger_writer: "LedgerWriter | None" = None,
+    ) -> Passport:
+        """Execute agent logic and update passport.
+
+        Ledger entries are handed to ledger_writer as they are appended, so the
+        audit trail is persisted incrementally rather than at mission end.
+        """
         start_time = time.time()
         passport.current_agent = self.agent_id
 
         try:
             result = await self.process(passport)
+            await self._offload_context(passport)
             duration_ms = int((time.time() - start_time) * 1000)
 
             # Update passport with results
-            passport.add_ledger_entry(
+            entry = passport.add_ledger_entry(
                 agent_id=self.agent_id,
                 action=f"{self.config.agent_type}_process",
                 inputs_summary=self._summarize_inputs(passport),
@@ -84,6 +109,8 @@ class Agent(ABC):
                 tokens_used=result.tokens_used,
                 tool_calls=result.tool_calls,
             )
+            if ledger_writer:
+                await ledger_writer.append(passport.id, entry)
 
             # Update artifacts
             for name, ref in result.artifacts.items():
@@ -99,7 +126,7 @@ class Agent(ABC):
 
         except Exception as e:
             duration_ms = int((time.time() - start_time) * 1000)
-            passport.add_ledger_entry(
+            entry = passport.add_ledger_entry(
                 agent_id=self.agent_id,
                 action=f"{self.config.agent_type}_error",
                 inputs_summary=self._summarize_inputs(passport),
@@ -108,12 +135,89 @@ class Agent(ABC):
                 confidence=ConfidenceVector(value=0.0),
                 notes=str(e),
             )
+            if ledger_writer:
+                await ledger_writer.append(passport.id, entry)
             passport.status = "failed"
             passport.routing.escalation_required = True
             passport.routing.escalation_reason = str(e)
 
         return passport
 
+    # -------------------------------------------------------------------------
+    # Context by Reference
+    # -------------------------------------------------------------------------
+
+    async def put_context(
+        self,
+        passport: Passport,
+        key: str,
+        value: Any,
+        summary: str = "",
+    ) -> ContextRef:
+        """Store a context value in the artifact store, keeping only a ref inline."""
+        payload = json.dumps(value, default=str).encode()
+        summary = summary or ContextRef.summarize(value)
+        return await self._store_context(passport, key, payload, summary)
+
+    async def load_context(self, passport: Passport, key: str, default: Any = None) -> Any:
+        """Get a context value, dereferencing it from the artifact store if needed."""
+        value = passport.context.get(key, default)
+        ref = ContextRef.parse(value)
+        if ref is None:
+            return value
+        payload = await self.artifact_store.retrieve(ref.artifact_ref)
+        return json.loads(payload)
+
+    async def _store_context(
+        self, passport: Passport, key: str, payload: bytes, summary: str
+    ) -> ContextRef:
+        artifact_ref = await self.artifact_store.store(payload)
+        ref = ContextRef(artifact_ref=artifact_ref, summary=summary, size_bytes=len(payload))
+        passport.context[key] = ref.model_dump()
+        return ref
+
+    async def _offload_context(self, passport: Passport) -> None:
+        """Move oversized context values out of the passport.
+
+        Keeps per-step checkpoint and prompt size flat as missions grow.
+        """
+        limit = self.settings.context_inline_max_bytes
+        for key, value in list(passport.context.items()):
+            if ContextRef.parse(value) is not None:
+                continue
+            payload = json.dumps(value, default=str).encode()
+            if len(payload) > limit:
+                await self._store_context(passport, key, payload, ContextRef.summarize(value))
+
+    def render_context(
+        self,
+        passport: Passport,
+        exclude: list[str] | None = None,
+    ) -> RenderedContext:
+        """Render passport context for a prompt using this agent's format and budget.
+
+        Args:
+            passport: Current passport state
+            exclude: Extra keys to skip (e.g. fields already shown in the prompt)
+        """
+        renderer = ContextRenderer(
+            format=self.config.context_format,
+            rules=ContextRules(
+                include=self.config.context_include,
+                exclude=[*self.config.context_exclude, *(exclude or [])],
+            ),
+            token_budget=self.config.context_token_budget,
+        )
+        rendered = renderer.render(passport.context)
+        logger.debug(
+            "%s rendered context: %d tokens (%s), omitted=%s",
+            self.agent_id,
+            rendered.tokens,
+            rendered.format.value,
+            rendered.omitted,
+        )
+        return rendered
+
     async def call_llm(
         self,
         messages: list[dict[str, str]],
@@ -0,0 +1,268 @@
+"""Token-efficient rendering of passport context for agent prompts.
+
+Agents used to interpolate ``passport.context`` directly, which hands the LLM
+a Python repr of nested dicts, including node dumps full of UUIDs and
+timestamps. The renderer drops bookkeeping fields, applies per-field
+inclusion rules and a token budget, and encodes what is left in one of
+several formats.
+"""
+
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+from app.core.tokens import count_tokens
+from app.models.passport import ContextRef
+from app.uniq import encode_node
+
+
+class ContextFormat(str, Enum):
+    """Prompt encodings for passport context."""
+
+    UNIQ = "uniq"    # Compact symbolic encoding (planning/research/UNIQ_SPEC.md)
+    YAML = "yaml"    # Indented key: value lines
+    PROSE = "prose"  # Plain sentences
+
+
+# Bookkeeping fields that cost tokens but carry no meaning for the model
+DEFAULT_DROP_FIELDS = frozenset({
+    "id",
+    "tenant_id",
+    "team_id",
+    "timestamp",
+    "created_at",
+    "updated_at",
+    "embedding",
+    "relationships",
+    "artifact_ref",
+    "size_bytes",
+})
+
+
+@dataclass
+class ContextRules:
+    """Per-field inclusion rules applied before rendering."""
+
+    include: list[str] | None = None  # Top-level keys in priority order (None = all)
+    exclude: list[str] = field(default_factory=list)
+    drop_fields: frozenset[str] = DEFAULT_DROP_FIELDS
+    max_list_items: int = 20
+    max_str_chars: int = 600
+
+    def select(self, context: dict[str, Any]) -> list[tuple[str, Any]]:
+        """Pick the top-level fields to render, in render order."""
+        keys = self.include if self.include is not None else list(context)
+        return [(k, context[k]) for k in keys if k in context and k not in self.exclude]
+
+
+@dataclass
+class RenderedContext:
+    """Rendered context plus its token cost."""
+
+    text: str
+    tokens: int
+    format: ContextFormat
+    omitted: list[str] = field(default_factory=list)  # Keys dropped to fit the budget
+
+
+class _Ref(str):
+    """Summary of a value that is stored by reference."""
+
+
+class ContextRenderer:
+    """Render passport context into a compact prompt section."""
+
+    def __init__(
+        self,
+        format: ContextFormat = ContextFormat.YAML,
+        rules: ContextRules | None = None,
+        token_budget: int | None = None,
+    ):
+        self.format = ContextFormat(format)
+        self.rules = rules or ContextRules()
+        self.token_budget = token_budget
+
+    def render(self, context: dict[str, Any]) -> RenderedContext:
+        """Render context fields in priority order until the budget is spent."""
+        sections: list[str] = []
+        omitted: list[str] = []
+        used = 0
+
+        for key, value in self.rules.select(context):
+            section = self._render_field(key, self._clean(value))
+            if not section:
+                continue
+            tokens = count_tokens(section)
+            if self.token_budget is not None and used + tokens > self.token_budget:
+                omitted.append(key)
+                continue
+            sections.append(section)
+            used += tokens
+
+        if omitted:
+            sections.append(self._omitted_note(omitted))
+
+        text = "\n".join(sections)
+        return RenderedContext(
+            text=text,
+            tokens=count_tokens(text),
+            format=self.format,
+            omitted=omitted,
+        )
+
+    # -------------------------------------------------------------------------
+    # Cleaning
+    # -------------------------------------------------------------------------
+
+    def _clean(self, value: Any) -> Any:
+        """Drop bookkeeping fields, collapse refs, and truncate long values."""
+        ref = ContextRef.parse(value)
+        if ref is not None:
+            return _Ref(ref.summary)
+
+        if isinstance(value, dict):
+            return {
+                k: self._clean(v)
+                for k, v in value.items()
+                if k not in self.rules.drop_fields and v not in (None, "", [], {})
+            }
+
+        if isinstance(value, list | tuple):
+            items = [self._clean(v) for v in value[: self.rules.max_list_items]]
+            hidden = len(value) - len(items)
+            if hidden > 0:
+                items.append(f"+{hidden} more")
+            return items
+
+        if isinstance(value, str) and len(value) > self.rules.max_str_chars:
+            return value[: self.rules.max_str_chars - 3] + "..."
+
+        return value
+
+    # -------------------------------------------------------------------------
+    # Formats
+    # -------------------------------------------------------------------------
+
+    def _render_field(self, key: str, value: Any) -> str:
+        if self.format == ContextFormat.UNIQ:
+            return self._uniq_field(key, value)
+        if self.format == ContextFormat.PROSE:
+            return self._prose_field(key, value)
+        return "\n".join(self._yaml_lines(key, value, 0))
+
+    def _omitted_note(self, keys: list[str]) -> str:
+        if self.format == ContextFormat.UNIQ:
+            return f"⚑omitted⟨{'·'.join(keys)}⟩"
+        if self.format == ContextFormat.PROSE:
+            return f"Omitted for length: {', '.join(keys)}."
+        return f"# omitted: {', '.join(keys)}"
+
+    # YAML-lite --------------------------------------------------------------
+
+    def _yaml_lines(self, key: str, value: Any, indent: int) -> list[str]:
+        pad = "  " * indent
+
+        if isinstance(value, _Ref):
+            return [f"{pad}{key}: {value} (stored by reference)"]
+
+        if isinstance(value, dict):
+            if not value:
+                return []
+            lines = [f"{pad}{key}:"]
+            for k, v in value.items():
+                lines.extend(self._yaml_lines(k, v, indent + 1))
+            return lines
+
+        if isinstance(value, list):
+            if not value:
+                return []
+            lines = [f"{pad}{key}:"]
+            for item in value:
+                lines.append(f"{pad}  - {self._yaml_item(item)}")
+            return lines
+
+        return [f"{pad}{key}: {_scalar(value)}"]
+
+    def _yaml_item(self, item: Any) -> str:
+        if _is_node(item):
+            return f"{item['symbol']}: {_node_text(item)}"
+        if isinstance(item, dict):
+            return ", ".join(f"{k}: {_scalar(v)}" for k, v in item.items())
+        return _scalar(item)
+
+    # Prose -------------------------------------------------------------------
+
+    def _prose_field(self, key: str, value: Any) -> str:
+        label = key.replace("_", " ").capitalize()
+
+        if isinstance(value, _Ref):
+            return f"{label} (stored by reference): {value}."
+
+        if isinstance(value, dict):
+            if not value:
+                return ""
+            parts = [f"{k.replace('_', ' ')} {_scalar(v)}" for k, v in value.items()]
+            return f"{label}: {'; '.join(parts)}."
+
+        if isinstance(value, list):
+            if not value:
+                return ""
+            if all(_is_node(item) for item in value if isinstance(item, dict)):
+                lines = [f"{label} ({len(value)}):"]
+                for item in value:
+                    text = _node_text(item) if _is_node(item) else _scalar(item)
+                    lines.append(f"- {text}")
+                return "\n".join(lines)
+            return f"{label}: {', '.join(self._yaml_item(item) for item in value)}."
+
+        return f"{label}: {_scalar(value)}."
+
+    # UNI-Q -------------------------------------------------------------------
+
+    def _uniq_field(self, key: str, value: Any) -> str:
+        if isinstance(value, _Ref):
+            return f"{key}⟨ref⟩{value}"
+
+        if isinstance(value, dict):
+            if not value:
+                return ""
+            attrs = "·".join(f"{k}:{_scalar(v)}" for k, v in value.items())
+            return f"{key}⟨{attrs}⟩"
+
+        if isinstance(value, list):
+            if not value:
+                return ""
+            items = [encode_node(item) if _is_node(item) else _scalar(item) for item in value]
+            return f"{key}│" + ";".join(items)
+
+        return f"{key}:{_scalar(value)}"
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _is_node(value: Any) -> bool:
+    """Check whether a dict is a dumped MemoryNode."""
+    return isinstance(value, dict) and "symbol" in value and "micro" in value
+
+
+def _node_text(node: dict[str, Any]) -> str:
+    text = node.get("summary") or node.get("micro", "")
+    tags = node.get("tags")
+    if tags:
+        text = f"{text} [{', '.join(str(t) for t in tags)}]"
+    return _scalar(text)
+
+
+def _scalar(value: Any) -> str:
+    """Render a leaf value on a single line."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, dict | list):
+        return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+    return " ".join(str(value).split())
@@ -44,10 +44,16 @@ class ExecutorAgent(Agent):
     async def process(self, passport: Passport) -> AgentResult:
         """Execute the mission objective."""
         # Get triage context
-        triage = passport.context.get("triage_analysis", {})
+        triage = await self.load_context(passport, "triage_analysis", {})
         category = passport.context.get("category", "general")
         complexity = passport.context.get("complexity", "medium")
 
+        # Triage fields are already shown above the context section
+        context = self.render_context(
+            passport,
+            exclude=["triage_analysis", "category", "complexity", "execution_complete"],
+        )
+
         messages = [
             {
                 "role": "user",
@@ -70,7 +76,7 @@ Complexity: {complexity}
 Additional Analysis: {triage.get('reasoning', 'N/A')}
 
 ## Context
-{passport.context}
+{context.text or 'None'}
 
 Execute this mission and provide your structured output.""",
             }
@@ -79,8 +85,9 @@ Execute this mission and provide your structured output.""",
         try:
             response, tool_calls, tokens = await self.call_llm(messages)
 
-            # Store the draft output
-            passport.artifacts["draft_output"] = response
+            # Store the draft output by reference (deduplicated across revisions)
+            draft_ref = await self.artifact_store.store(response.encode())
+            passport.artifacts["draft_output"] = draft_ref
             passport.context["execution_complete"] = True
 
             # Determine confidence based on complexity and response quality
@@ -113,7 +120,7 @@ Execute this mission and provide your structured output.""",
                 output=f"Execution complete. Confidence: {confidence.value:.2f}",
                 confidence=confidence,
                 tokens_used=tokens,
-                artifacts={"draft_output": response},
+                artifacts={"draft_output": draft_ref},
             )
 
         except Exception as e:
@@ -104,7 +104,7 @@ If output is acceptable, say so clearly without inventing issues."""
     async def process(self, passport: Passport) -> AgentResult:
         """Process validation request from passport."""
         # Extract validation request from context
-        validation_request = passport.context.get("validation_request", {})
+        validation_request = await self.load_context(passport, "validation_request", {})
 
         if not validation_request:
             return AgentResult(
@@ -1,6 +1,7 @@
 """Librarian agent for knowledge retrieval from organizational memory."""
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import asdict, dataclass, field
 from typing import Any
 from uuid import UUID
 
@@ -8,13 +9,20 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.base import Agent, AgentConfig, AgentResult
-from app.memory.embeddings import EmbeddingStore
+from app.memory.cache import RetrievalCache
+from app.memory.embeddings import EmbeddingStoreFactory
+from app.memory.precedents import PrecedentEngine
 from app.memory.queries import MemoryQueryBuilder
+from app.memory.retrieval import HybridRetriever
 from app.memory.storage import MemoryStorage
 from app.models.memory import (
     MemoryLayer,
     MemoryNode,
     MemoryResolution,
+    PrecedentContext,
+    PrefetchRule,
+    QueryIntent,
+    RankingWeights,
     RelationType,
 )
 from app.models.passport import Passport
@@ -38,6 +46,7 @@ class LibrarianConfig:
     default_resolution: MemoryResolution = MemoryResolution.SUMMARY
     max_context_tokens: int = 4000
     salience_boost_on_retrieve: float = 0.05
+    ranking: RankingWeights = field(default_factory=RankingWeights)  # Hybrid search weights
 
 
 class Librarian(Agent):
@@ -71,7 +80,7 @@ class Librarian(Agent):
         self.lib_config = config or LibrarianConfig(tenant_id=tenant_id, team_id=team_id)
 
         self._storage = MemoryStorage(session, tenant_id)
-        self._embeddings = EmbeddingStore(tenant_id, team_id)
+        self._embeddings = EmbeddingStoreFactory.get_store(tenant_id, team_id)
 
     def _system_prompt(self) -> str:
         return """You are a Librarian agent responsible for knowledge retrieval.
@@ -83,7 +92,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
     async def process(self, passport: Passport) -> AgentResult:
         """Process a retrieval request from the passport."""
         # Extract retrieval request from passport context
-        retrieval_request = passport.context.get("retrieval_request", {})
+        retrieval_request = await self.load_context(passport, "retrieval_request", {})
 
         if not retrieval_request:
             return AgentResult(
@@ -97,6 +106,9 @@ Always prioritize high-salience, recent information unless specifically asked ot
         method = retrieval_request.get("method", "query")
         nodes: list[MemoryNode] = []
 
+        if method == "precedents":
+            return await self._process_precedents(passport, retrieval_request)
+
         if method == "symbols":
             symbols = retrieval_request.get("symbols", [])
             resolution = MemoryResolution(retrieval_request.get("resolution", "summary"))
@@ -110,7 +122,17 @@ Always prioritize high-salience, recent information unless specifically asked ot
                 layer = MemoryLayer(layer)
             resolution = MemoryResolution(retrieval_request.get("resolution", "micro"))
             limit = retrieval_request.get("limit", 20)
-            nodes = await self.query(pattern, tags, layer, resolution, limit)
+            intent = retrieval_request.get("intent")
+            prefetch = [PrefetchRule(**rule) for rule in retrieval_request.get("prefetch", [])]
+            nodes = await self.query(
+                pattern,
+                tags,
+                layer,
+                resolution,
+                limit,
+                intent=QueryIntent(intent) if intent else None,
+                prefetch=prefetch,
+            )
 
         elif method == "similar":
             text = retrieval_request.get("text", "")
@@ -120,6 +142,14 @@ Always prioritize high-salience, recent information unless specifically asked ot
             limit = retrieval_request.get("limit", 10)
             nodes = await self.find_similar(text, layer, limit)
 
+        elif method == "search":
+            text = retrieval_request.get("text", "")
+            layer = retrieval_request.get("layer")
+            if layer:
+                layer = MemoryLayer(layer)
+            limit = retrieval_request.get("limit", 10)
+            nodes = await self.search(text, layer, limit)
+
         elif method == "traverse":
             start_symbol = retrieval_request.get("start_symbol", "")
             relation_types = [
@@ -128,9 +158,13 @@ Always prioritize high-salience, recent information unless specifically asked ot
             max_depth = retrieval_request.get("max_depth", 2)
             nodes = await self.traverse(start_symbol, relation_types, max_depth)
 
-        # Store results in passport artifacts
+        # Store results by reference; only micro summaries stay on the passport
         context_key = retrieval_request.get("context_key", "retrieved_context")
-        passport.context[context_key] = [n.model_dump() for n in nodes]
+        ref = await self.put_context(
+            passport,
+            context_key,
+            [n.model_dump(mode="json") for n in nodes],
+        )
 
         return AgentResult(
             success=True,
@@ -140,7 +174,32 @@ Always prioritize high-salience, recent information unless specifically asked ot
                 evidence_count=len(nodes),
                 evidence_quality=0.8,
             ),
-            artifacts={context_key: f"{len(nodes)} nodes"},
+            artifacts={context_key: ref.artifact_ref},
+        )
+
+    async def _process_precedents(
+        self, passport: Passport, retrieval_request: dict[str, Any]
+    ) -> AgentResult:
+        """Put a PrecedentContext on the passport for the requesting agent."""
+        precedents = await self.precedent_context(
+            retrieval_request.get("text", ""),
+            node_type=retrieval_request.get("node_type"),
+            limit=retrieval_request.get("limit", 5),
+            tags=retrieval_request.get("tags"),
+        )
+        context_key = retrieval_request.get("context_key", "precedents")
+        ref = await self.put_context(passport, context_key, precedents.model_dump(mode="json"))
+
+        cases = len(precedents.similar_cases)
+        return AgentResult(
+            success=True,
+            output=precedents.pattern_summary,
+            confidence=self.calculate_confidence(
+                base_value=0.9 if cases else 0.5,
+                evidence_count=cases,
+                evidence_quality=0.8,
+            ),
+            artifacts={context_key: ref.artifact_ref},
         )
 
     # -------------------------------------------------------------------------
@@ -178,6 +237,8 @@ Always prioritize high-salience, recent information unless specifically asked ot
         layer: MemoryLayer | None = None,
         resolution: MemoryResolution = MemoryResolution.MICRO,
         limit: int = 20,
+        intent: QueryIntent | None = None,
+        prefetch: list[PrefetchRule] | None = None,
     ) -> list[MemoryNode]:
         """Query memory by pattern or tags.
 
@@ -187,6 +248,8 @@ Always prioritize high-salience, recent information unless specifically asked ot
             layer: Filter by memory layer
             resolution: Content resolution level
             limit: Max results to return
+            intent: Query intent; overrides resolution (route -> micro, audit -> full)
+            prefetch: Rules that load matching nodes at a higher resolution
 
         Returns:
             List of matching nodes
@@ -202,6 +265,10 @@ Always prioritize high-salience, recent information unless specifically asked ot
             builder = builder.layer(layer)
 
         builder = builder.resolution(resolution).limit(limit)
+        if intent:
+            builder = builder.intent(intent)
+        for rule in prefetch or []:
+            builder = builder.prefetch(rule.condition, rule.resolution)
         result = await builder.execute()
         return result.nodes
 
@@ -210,6 +277,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
         text: str,
         layer: MemoryLayer | None = None,
         limit: int = 10,
+        tags: list[str] | None = None,
     ) -> list[MemoryNode]:
         """Find semantically similar nodes.
 
@@ -217,6 +285,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
             text: Query text for similarity search
             layer: Filter by memory layer
             limit: Max results to return
+            tags: Tags every result must carry, filtered inside the vector search
 
         Returns:
             List of similar nodes ordered by similarity
@@ -225,10 +294,36 @@ Always prioritize high-salience, recent information unless specifically asked ot
         builder = builder.semantic(text).limit(limit)
         if layer:
             builder = builder.layer(layer)
+        if tags:
+            builder = builder.tags(*tags)
 
         result = await builder.execute()
         return result.nodes
 
+    async def search(
+        self,
+        text: str,
+        layer: MemoryLayer | None = None,
+        limit: int = 10,
+    ) -> list[MemoryNode]:
+        """Hybrid keyword + semantic search, ranked with the team's weights.
+
+        Args:
+            text: Query text; exact identifiers and citations match lexically
+            layer: Filter by memory layer
+            limit: Max results to return
+
+        Returns:
+            List of nodes ordered by fused score
+        """
+        retriever = HybridRetriever(
+            self.session, self.tenant_id, self.team_id, weights=self.lib_config.ranking
+        )
+        hits = await retriever.search(
+            text, limit=limit, layer=layer, resolution=self.lib_config.default_resolution
+        )
+        return [hit.node for hit in hits]
+
     async def traverse(
         self,
         start_symbol: str,
@@ -398,6 +493,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
         description: str,
         node_type: str | None = None,
         limit: int = 5,
+        tags: list[str] | None = None,
     ) -> list[MemoryNode]:
         """Find similar past cases for precedent matching.
 
@@ -407,6 +503,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
             description: Description of current case
             node_type: Filter by node type (e.g., "finding", "decision")
             limit: Max precedents to return
+            tags: Scope tags, e.g. ["facility:dayton-fleet"]
 
         Returns:
             List of similar past cases ordered by relevance
@@ -422,10 +519,68 @@ Always prioritize high-salience, recent information unless specifically asked ot
 
         if node_type:
             builder = builder.type(node_type)
+        if tags:
+            builder = builder.tags(*tags)
 
         result = await builder.execute()
         return result.nodes
 
+    async def find_precedents_many(
+        self,
+        descriptions: list[str],
+        node_type: str | None = None,
+        limit: int = 5,
+        tags: list[str] | None = None,
+    ) -> list[list[MemoryNode]]:
+        """Find precedents for several cases with one batched search.
+
+        Args:
+            descriptions: Descriptions of the current cases
+            node_type: Filter by node type (e.g., "finding", "decision")
+            limit: Max precedents to return per case
+            tags: Scope tags, e.g. ["facility:dayton-fleet"]
+
+        Returns:
+            One list of similar past cases per description, in order
+        """
+        builder = MemoryQueryBuilder(self.session, self.tenant_id, self.team_id)
+        builder = (
+            builder
+            .semantic_many(*descriptions)
+            .layer(MemoryLayer.EVENT)
+            .resolution(MemoryResolution.SUMMARY)
+            .limit(limit)
+        )
+
+        if node_type:
+            builder = builder.type(node_type)
+        if tags:
+            builder = builder.tags(*tags)
+
+        results = await builder.execute_many()
+        return [result.nodes for result in results]
+
+    async def precedent_context(
+        self,
+        description: str,
+        node_type: str | None = None,
+        limit: int = 5,
+        tags: list[str] | None = None,
+    ) -> PrecedentContext:
+        """Decision-ready precedents: similar cases with outcomes, policies and entities.
+
+        Args:
+            description: Description of current case
+            node_type: Filter by node type (e.g., "finding", "decision")
+            limit: Max similar cases
+            tags: Scope tags, e.g. ["facility:dayton-fleet"]
+
+        Returns:
+            PrecedentContext with outcome distribution and key factors
+        """
+        engine = PrecedentEngine(self.session, self.tenant_id, self.team_id)
+        return await engine.build(description, node_type=node_type, tags=tags, limit=limit)
+
     # -------------------------------------------------------------------------
     # Memory Management
     # -------------------------------------------------------------------------
@@ -433,19 +588,16 @@ Always prioritize high-salience, recent information unless specifically asked ot
     async def store(self, node: MemoryNode) -> MemoryNode:
         """Store a new memory node.
 
+        The embedding is written by the outbox relay once the session's
+        transaction commits.
+
         Args:
             node: Node to store
 
         Returns:
             Stored node
         """
-        # Store in PostgreSQL
-        stored = await self._storage.create(node)
-
-        # Store embedding in ChromaDB
-        self._embeddings.add(node)
-
-        return stored
+        return await self._storage.create(node)
 
     async def store_many(self, nodes: list[MemoryNode]) -> list[MemoryNode]:
         """Store multiple nodes in a batch.
@@ -456,9 +608,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
         Returns:
             Stored nodes
         """
-        stored = await self._storage.create_many(nodes)
-        self._embeddings.add_many(nodes)
-        return stored
+        return await self._storage.create_many(nodes)
 
     async def update(self, node: MemoryNode) -> MemoryNode:
         """Update an existing memory node.
@@ -469,9 +619,7 @@ Always prioritize high-salience, recent information unless specifically asked ot
         Returns:
             Updated node
         """
-        updated = await self._storage.update(node)
-        self._embeddings.update(node)
-        return updated
+        return await self._storage.update(node)
 
     async def add_relationship(
         self,
@@ -499,13 +647,16 @@ Always prioritize high-salience, recent information unless specifically asked ot
         """Get memory statistics for this team.
 
         Returns:
-            Dict with node counts per layer and total embeddings
+            Dict with node counts per layer, total embeddings and retrieval
+            cache hit/miss counts
         """
         layer_counts = await self._storage.count_by_layer(self.team_id)
-        embedding_count = self._embeddings.count()
+        embedding_count = await asyncio.to_thread(self._embeddings.count)
+        cache_stats = await RetrievalCache.from_settings(self.tenant_id, self.team_id).stats()
 
         return {
             "nodes_by_layer": layer_counts,
             "total_nodes": sum(layer_counts.values()),
             "total_embeddings": embedding_count,
+            "retrieval_cache": asdict(cache_stats),
         }
@@ -2,10 +2,14 @@
 
 from app.agents.executor import ExecutorAgent
 from app.agents.triage import TriageAgent
+from app.platform.ledger import LedgerWriter
 from app.platform.orchestrator import Orchestrator, TeamConfig
 
 
-def create_basic_team(team_id: str = "basic") -> Orchestrator:
+def create_basic_team(
+    team_id: str = "basic",
+    ledger_writer: LedgerWriter | None = None,
+) -> Orchestrator:
     """Create a basic 2-agent team for testing."""
     triage = TriageAgent()
     executor = ExecutorAgent()
@@ -30,4 +34,4 @@ def create_basic_team(team_id: str = "basic") -> Orchestrator:
         },
     )
 
-    return Orchestrator(config)
+    return Orchestrator(config, ledger_writer=ledger_writer)
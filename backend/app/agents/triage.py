@@ -32,11 +32,13 @@ class TriageAgent(Agent):
             system_prompt=TRIAGE_SYSTEM_PROMPT,
             temperature=0.3,  # Lower temperature for consistent classification
             autonomy_level=2,
+            context_token_budget=800,
         )
         super().__init__(config)
 
     async def process(self, passport: Passport) -> AgentResult:
         """Analyze mission and determine routing."""
+        context = self.render_context(passport)
         messages = [
             {
                 "role": "user",
@@ -50,7 +52,7 @@ Success Criteria: {', '.join(passport.mission.success_criteria) or 'None specifi
 Priority: {passport.routing.priority}
 
 Additional Context:
-{passport.context}
+{context.text or 'None'}
 
 Provide your triage analysis as JSON.""",
             }
@@ -1,15 +1,32 @@
 """Memory API endpoints for knowledge storage and retrieval."""
 
+from dataclasses import asdict
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
+from app.db.pagination import InvalidCursorError
+from app.memory.cache import RetrievalCache
+from app.memory.export import MemoryExporter, SnapshotTable, table_schema
+from app.memory.precedents import PrecedentEngine
 from app.memory.queries import MemoryQueryBuilder
+from app.memory.retrieval import HybridRetriever
 from app.memory.storage import MemoryStorage
-from app.models.memory import MemoryLayer, MemoryNode, MemoryResolution, RelationType
+from app.models.memory import (
+    MemoryLayer,
+    MemoryNode,
+    MemoryResolution,
+    PrecedentContext,
+    PrefetchRule,
+    QueryIntent,
+    RankingWeights,
+    RelationType,
+)
 
 router = APIRouter(prefix="/memory", tags=["memory"])
 
@@ -59,6 +76,7 @@ class NodeResponse(BaseModel):
     confidence: float
     created_at: str
     updated_at: str
+    highlight: str | None = None  # Keyword match snippet for text queries
 
     @classmethod
     def from_node(cls, node: MemoryNode) -> "NodeResponse":
@@ -83,11 +101,17 @@ class QueryRequest(BaseModel):
     """Request for querying memory."""
 
     pattern: str | None = None
+    text: str | None = None  # Keywords: "exact phrase", prefix*, -excluded
     tags: dict[str, str] | None = None
     layer: MemoryLayer | None = None
     node_type: str | None = None
     resolution: MemoryResolution = MemoryResolution.MICRO
+    intent: QueryIntent | None = None  # Overrides resolution when set
+    prefetch: list[PrefetchRule] = Field(default_factory=list)
+    order: Literal["salience", "newest"] = "salience"
     limit: int = Field(default=20, ge=1, le=100)
+    offset: int = Field(default=0, ge=0)
+    cursor: str | None = None  # From a previous page's X-Next-Cursor header (newest order)
 
 
 class SimilarityRequest(BaseModel):
@@ -95,9 +119,57 @@ class SimilarityRequest(BaseModel):
 
     text: str
     layer: MemoryLayer | None = None
+    tags: list[str] = Field(default_factory=list)  # "key:value", all must match
     limit: int = Field(default=10, ge=1, le=50)
 
 
+class SimilarityBatchRequest(BaseModel):
+    """Request for several semantic similarity searches sharing filters."""
+
+    texts: list[str] = Field(min_length=1, max_length=100)
+    layer: MemoryLayer | None = None
+    node_type: str | None = None
+    tags: list[str] = Field(default_factory=list)  # "key:value", all must match
+    limit: int = Field(default=10, ge=1, le=50)
+
+
+class SimilarityBatchResult(BaseModel):
+    """Matches for one text of a batch request."""
+
+    text: str
+    nodes: list[NodeResponse]
+
+
+class HybridSearchRequest(BaseModel):
+    """Request for hybrid keyword + semantic search."""
+
+    text: str
+    layer: MemoryLayer | None = None
+    node_type: str | None = None
+    tags: list[str] = Field(default_factory=list)
+    resolution: MemoryResolution = MemoryResolution.SUMMARY
+    limit: int = Field(default=10, ge=1, le=50)
+    weights: RankingWeights | None = None  # Team ranking weights; defaults when omitted
+
+
+class HybridHitResponse(BaseModel):
+    """One hybrid search hit with its score breakdown."""
+
+    node: NodeResponse
+    score: float
+    lexical_rank: int | None
+    vector_rank: int | None
+
+
+class PrecedentRequest(BaseModel):
+    """Request for precedents of a case."""
+
+    text: str
+    node_type: str | None = None  # Event type, e.g. "finding"
+    tags: list[str] = Field(default_factory=list)  # Scope, e.g. ["facility:dayton-fleet"]
+    limit: int = Field(default=5, ge=1, le=20)
+
+
 class RelationshipRequest(BaseModel):
     """Request to create a relationship."""
 
@@ -195,6 +267,7 @@ async def update_node(
     if request.confidence is not None:
         existing.confidence = request.confidence
 
+    # The outbox relay re-embeds after commit (metadata only if the text is unchanged)
     updated = await storage.update(existing)
     return NodeResponse.from_node(updated)
 
@@ -221,13 +294,60 @@ async def query_nodes(
     tenant_id: UUID,
     team_id: str,
     request: QueryRequest,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ) -> list[NodeResponse]:
-    """Query memory nodes with filters."""
+    """Query memory nodes with filters.
+
+    Results are ordered by salience and paged by offset. With
+    order="newest" they are newest first instead, and a full page carries
+    the cursor for the next one in the X-Next-Cursor header.
+    Text queries above micro resolution return a highlighted snippet per node.
+    """
+    builder = _query_builder(db, tenant_id, team_id, request)
+    builder = _paginate(builder.resolution(request.resolution), request)
+    if request.intent:
+        builder = builder.intent(request.intent)
+    for rule in request.prefetch:
+        builder = builder.prefetch(rule.condition, rule.resolution)
+    try:
+        result = await builder.execute()
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if result.next_cursor:
+        response.headers["X-Next-Cursor"] = result.next_cursor
+    nodes = [NodeResponse.from_node(n) for n in result.nodes]
+    for node in nodes:
+        node.highlight = result.highlights.get(node.symbol)
+    return nodes
+
+
+@router.post("/query/{tenant_id}/{team_id}/count")
+async def count_nodes(
+    tenant_id: UUID,
+    team_id: str,
+    request: QueryRequest,
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, int]:
+    """Count memory nodes matching the query filters (limit is ignored)."""
+    builder = _query_builder(db, tenant_id, team_id, request)
+    return {"count": await builder.count()}
+
+
+def _query_builder(
+    db: AsyncSession,
+    tenant_id: UUID,
+    team_id: str,
+    request: QueryRequest,
+) -> MemoryQueryBuilder:
+    """Apply the filters of a QueryRequest to a new builder."""
     builder = MemoryQueryBuilder(db, tenant_id, team_id)
 
     if request.pattern:
         builder = builder.pattern(request.pattern)
+    if request.text:
+        builder = builder.text(request.text)
     if request.tags:
         for key, value in request.tags.items():
             builder = builder.tag(key, value)
@@ -235,11 +355,15 @@ async def query_nodes(
         builder = builder.layer(request.layer)
     if request.node_type:
         builder = builder.type(request.node_type)
+    return builder
 
-    builder = builder.resolution(request.resolution).limit(request.limit)
-    result = await builder.execute()
 
-    return [NodeResponse.from_node(n) for n in result.nodes]
+def _paginate(builder: MemoryQueryBuilder, request: QueryRequest) -> MemoryQueryBuilder:
+    """Apply the page size and order; only newest-first pages are keyset-paged."""
+    builder = builder.limit(request.limit)
+    if request.order == "newest" or request.cursor:
+        return builder.newest_first().after(request.cursor)
+    return builder.offset(request.offset)
 
 
 @router.post("/similar/{tenant_id}/{team_id}", response_model=list[NodeResponse])
@@ -251,7 +375,7 @@ async def find_similar(
 ) -> list[NodeResponse]:
     """Find semantically similar nodes."""
     builder = MemoryQueryBuilder(db, tenant_id, team_id)
-    builder = builder.semantic(request.text).limit(request.limit)
+    builder = builder.semantic(request.text).limit(request.limit).tags(*request.tags)
 
     if request.layer:
         builder = builder.layer(request.layer)
@@ -260,6 +384,73 @@ async def find_similar(
     return [NodeResponse.from_node(n) for n in result.nodes]
 
 
+@router.post(
+    "/similar/batch/{tenant_id}/{team_id}", response_model=list[SimilarityBatchResult]
+)
+async def find_similar_batch(
+    tenant_id: UUID,
+    team_id: str,
+    request: SimilarityBatchRequest,
+    db: AsyncSession = Depends(get_db),
+) -> list[SimilarityBatchResult]:
+    """Find semantically similar nodes for several texts in one vector search."""
+    builder = MemoryQueryBuilder(db, tenant_id, team_id)
+    builder = builder.semantic_many(*request.texts).limit(request.limit).tags(*request.tags)
+
+    if request.layer:
+        builder = builder.layer(request.layer)
+    if request.node_type:
+        builder = builder.type(request.node_type)
+
+    results = await builder.execute_many()
+    return [
+        SimilarityBatchResult(text=text, nodes=[NodeResponse.from_node(n) for n in result.nodes])
+        for text, result in zip(request.texts, results, strict=True)
+    ]
+
+
+@router.post("/search/{tenant_id}/{team_id}", response_model=list[HybridHitResponse])
+async def hybrid_search(
+    tenant_id: UUID,
+    team_id: str,
+    request: HybridSearchRequest,
+    db: AsyncSession = Depends(get_db),
+) -> list[HybridHitResponse]:
+    """Search by keywords and meaning together (exact citations and paraphrases)."""
+    retriever = HybridRetriever(db, tenant_id, team_id, weights=request.weights or RankingWeights())
+    hits = await retriever.search(
+        request.text,
+        limit=request.limit,
+        layer=request.layer,
+        node_type=request.node_type,
+        tags=request.tags,
+        resolution=request.resolution,
+    )
+    return [
+        HybridHitResponse(
+            node=NodeResponse.from_node(hit.node),
+            score=hit.score,
+            lexical_rank=hit.lexical_rank,
+            vector_rank=hit.vector_rank,
+        )
+        for hit in hits
+    ]
+
+
+@router.post("/precedents/{tenant_id}/{team_id}", response_model=PrecedentContext)
+async def find_precedents(
+    tenant_id: UUID,
+    team_id: str,
+    request: PrecedentRequest,
+    db: AsyncSession = Depends(get_db),
+) -> PrecedentContext:
+    """Similar past events with their outcomes, applied policies and involved entities."""
+    engine = PrecedentEngine(db, tenant_id, team_id)
+    return await engine.build(
+        request.text, node_type=request.node_type, tags=request.tags, limit=request.limit
+    )
+
+
 @router.post("/relationships/{tenant_id}")
 async def create_relationship(
     tenant_id: UUID,
@@ -316,10 +507,38 @@ async def get_stats(
     """Get memory statistics for a team."""
     storage = MemoryStorage(db, tenant_id)
     layer_counts = await storage.count_by_layer(team_id)
+    cache_stats = await RetrievalCache.from_settings(tenant_id, team_id).stats()
 
     return {
         "tenant_id": str(tenant_id),
         "team_id": team_id,
         "nodes_by_layer": layer_counts,
         "total_nodes": sum(layer_counts.values()),
+        "retrieval_cache": asdict(cache_stats),
     }
+
+
+@router.get("/export/{tenant_id}/{team_id}")
+async def export_snapshot(
+    tenant_id: UUID,
+    team_id: str,
+    table: SnapshotTable = SnapshotTable.NODES,
+) -> StreamingResponse:
+    """Stream one snapshot table as Arrow IPC (nodes, relationships or embeddings).
+
+    Rows are read through a server-side cursor, one record batch per chunk.
+    For whole-team Parquet snapshots use ``python -m app.memory.export``.
+    """
+    try:
+        table_schema(table)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e)) from e
+
+    exporter = MemoryExporter(tenant_id, team_id)
+    return StreamingResponse(
+        exporter.stream(table),
+        media_type="application/vnd.apache.arrow.stream",
+        headers={
+            "Content-Disposition": f'attachment; filename="{team_id}-{table.value}.arrows"'
+        },
+    )
@@ -1,13 +1,17 @@
 """Mission and Passport API endpoints."""
 
-from typing import Annotated
+import logging
+from datetime import datetime
+from typing import Annotated, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.teams import create_basic_team
+from app.artifacts import ArtifactNotFoundError, get_artifact_store
 from app.api.schemas import (
     LedgerEntryResponse,
     MissionCreate,
@@ -16,8 +20,19 @@ from app.api.schemas import (
     PassportListResponse,
     PassportResponse,
 )
-from app.db import LedgerEntryModel, PassportModel, get_db
+from app.db import LedgerEntryModel, PassportModel, async_session_maker, get_db
+from app.db.pagination import (
+    InvalidCursorError,
+    approximate_count,
+    decode_cursor,
+    encode_cursor,
+    exact_count,
+    keyset_after,
+)
 from app.models.passport import ConfidenceVector, Mission, Passport, RoutingInfo
+from app.platform.ledger import LedgerWriteError, LedgerWriter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/missions", tags=["missions"])
 
@@ -88,24 +103,45 @@ async def list_missions(
     status: str | None = None,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+    count: Literal["exact", "approximate"] = "exact",
 ) -> PassportListResponse:
-    """List missions with pagination."""
+    """List missions, newest first.
+
+    Pass the previous response's next_cursor as ``cursor`` to page by keyset
+    on (created_at, id); ``page`` is only used when no cursor is given.
+    ``count=approximate`` reports the planner's row estimate as the total.
+    """
     query = select(PassportModel).where(PassportModel.tenant_id == tenant_id)
 
     if status:
         query = query.where(PassportModel.status == status)
 
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
+    if count == "approximate":
+        total = await approximate_count(db, query)
+    else:
+        total = await exact_count(db, query)
 
     # Apply pagination
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    query = query.order_by(PassportModel.created_at.desc())
+    query = query.order_by(PassportModel.created_at.desc(), PassportModel.id.desc())
+    if cursor:
+        try:
+            after = decode_cursor(cursor, datetime, UUID)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        query = query.where(keyset_after([PassportModel.created_at, PassportModel.id], after))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size)
 
     result = await db.execute(query)
     passports = result.scalars().all()
 
+    next_cursor = None
+    if len(passports) == page_size:
+        next_cursor = encode_cursor(passports[-1].created_at, passports[-1].id)
+
     return PassportListResponse(
         items=[
             PassportResponse(
@@ -126,6 +162,8 @@ async def list_missions(
         total=total,
         page=page,
         page_size=page_size,
+        total_is_estimate=count == "approximate",
+        next_cursor=next_cursor,
     )
 
 
@@ -151,7 +189,7 @@ async def get_mission(
     ledger_result = await db.execute(
         select(LedgerEntryModel)
         .where(LedgerEntryModel.passport_id == mission_id)
-        .order_by(LedgerEntryModel.timestamp)
+        .order_by(LedgerEntryModel.sequence)
     )
     ledger_entries = ledger_result.scalars().all()
 
@@ -173,6 +211,7 @@ async def get_mission(
         ledger=[
             {
                 "id": str(e.id),
+                "sequence": e.sequence,
                 "timestamp": e.timestamp.isoformat(),
                 "agent_id": e.agent_id,
                 "action": e.action,
@@ -256,13 +295,14 @@ async def get_mission_ledger(
     result = await db.execute(
         select(LedgerEntryModel)
         .where(LedgerEntryModel.passport_id == mission_id)
-        .order_by(LedgerEntryModel.timestamp)
+        .order_by(LedgerEntryModel.sequence)
     )
     entries = result.scalars().all()
 
     return [
         LedgerEntryResponse(
             id=e.id,
+            sequence=e.sequence,
             timestamp=e.timestamp,
             agent_id=e.agent_id,
             action=e.action,
@@ -279,13 +319,115 @@ async def get_mission_ledger(
     ]
 
 
+@router.get("/{mission_id}/artifacts/{name}")
+async def get_mission_artifact(
+    mission_id: UUID,
+    name: str,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+    tenant_id: str = "default",
+) -> StreamingResponse:
+    """Stream a mission artifact, honouring single byte-range requests."""
+    result = await db.execute(
+        select(PassportModel.artifacts).where(
+            PassportModel.id == mission_id,
+            PassportModel.tenant_id == tenant_id,
+        )
+    )
+    artifacts = result.scalar_one_or_none()
+    if artifacts is None:
+        raise HTTPException(status_code=404, detail="Mission not found")
+
+    store = get_artifact_store()
+    ref = artifacts.get(name)
+    if not store.is_ref(ref):
+        raise HTTPException(status_code=404, detail=f"Artifact not found: {name}")
+
+    try:
+        size = await store.size(ref)
+    except ArtifactNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Artifact not found: {name}") from None
+
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{store.digest_of(ref)}"'}
+    byte_range = _parse_range(range_header, size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            store.stream(ref),
+            media_type="application/octet-stream",
+            headers=headers,
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        store.stream(ref, start, end + 1),
+        status_code=206,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=start-end`` range into inclusive offsets.
+
+    Returns None when the full content should be served (no header, another
+    unit, a multi-range request, or an invalid range such as ``bytes=500-100``,
+    which RFC 9110 says to ignore).
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, _, end_str = spec.strip().partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+        else:
+            # Suffix range: last N bytes; the last zero bytes select nothing
+            suffix = int(end_str)
+            if suffix == 0:
+                raise _unsatisfiable(size)
+            start = max(0, size - suffix)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end:
+        return None
+
+    end = min(end, size - 1)
+    if start >= size:
+        raise _unsatisfiable(size)
+    return start, end
+
+
+def _unsatisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=416,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
 @router.post("/{mission_id}/execute", response_model=PassportDetailResponse)
 async def execute_mission(
     mission_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
     tenant_id: str = "default",
 ) -> PassportDetailResponse:
-    """Execute a mission through the agent pipeline."""
+    """Execute a mission through the agent pipeline.
+
+    A ledger write failure after a successful run does not fail the request:
+    the results are saved and the error is recorded in the passport context
+    under "ledger_error". If the run itself fails, its error is raised and
+    any lost ledger entries are only logged.
+    """
     # Get mission from database
     result = await db.execute(
         select(PassportModel).where(
@@ -304,6 +446,13 @@ async def execute_mission(
             detail=f"Mission cannot be executed in {db_passport.status} status",
         )
 
+    # Continue the ledger sequence from what is already persisted
+    ledger_sequence = await db.scalar(
+        select(func.coalesce(func.max(LedgerEntryModel.sequence), 0)).where(
+            LedgerEntryModel.passport_id == mission_id
+        )
+    )
+
     # Reconstruct Pydantic passport from DB
     mission = Mission(**db_passport.mission_data)
     passport = Passport(
@@ -317,11 +466,19 @@ async def execute_mission(
         artifacts=db_passport.artifacts,
         overall_confidence=ConfidenceVector(**db_passport.overall_confidence),
         revision_count=db_passport.revision_count,
+        ledger_sequence=ledger_sequence or 0,
     )
 
-    # Create and run team
-    team = create_basic_team()
-    final_passport = await team.run(passport, thread_id=str(mission_id))
+    # Create and run team; ledger entries are committed as agents append them
+    async with LedgerWriter(async_session_maker) as ledger_writer:
+        team = create_basic_team(ledger_writer=ledger_writer)
+        final_passport = await team.run(passport, thread_id=str(mission_id))
+        try:
+            await ledger_writer.close()
+        except LedgerWriteError as e:
+            # Not fatal: keep the mission's results and flag its incomplete audit trail
+            logger.error("Mission %s: %s", mission_id, e)
+            final_passport.context["ledger_error"] = str(e)
 
     # Update database with results
     db_passport.status = final_passport.status
@@ -332,32 +489,13 @@ async def execute_mission(
     db_passport.overall_confidence = final_passport.overall_confidence.model_dump()
     db_passport.revision_count = final_passport.revision_count
 
-    # Persist ledger entries
-    for entry in final_passport.ledger:
-        db_entry = LedgerEntryModel(
-            id=entry.id,
-            passport_id=mission_id,
-            agent_id=entry.agent_id,
-            action=entry.action,
-            inputs_summary=entry.inputs_summary,
-            outputs_summary=entry.outputs_summary,
-            duration_ms=entry.duration_ms,
-            tokens_used=entry.tokens_used,
-            cost_usd=entry.cost_usd,
-            confidence=entry.confidence.model_dump(),
-            tool_calls=entry.tool_calls,
-            notes=entry.notes,
-            timestamp=entry.timestamp,
-        )
-        db.add(db_entry)
-
     await db.flush()
 
     # Fetch updated ledger for response
     ledger_result = await db.execute(
         select(LedgerEntryModel)
         .where(LedgerEntryModel.passport_id == mission_id)
-        .order_by(LedgerEntryModel.timestamp)
+        .order_by(LedgerEntryModel.sequence)
     )
     ledger_entries = ledger_result.scalars().all()
 
@@ -379,6 +517,7 @@ async def execute_mission(
         ledger=[
             {
                 "id": str(e.id),
+                "sequence": e.sequence,
                 "timestamp": e.timestamp.isoformat(),
                 "agent_id": e.agent_id,
                 "action": e.action,
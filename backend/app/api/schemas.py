@@ -55,12 +55,15 @@ class PassportListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    total_is_estimate: bool = False
+    next_cursor: str | None = None  # Pass as ?cursor= for the next page
 
 
 class LedgerEntryResponse(BaseModel):
     """Single ledger entry response."""
 
     id: UUID
+    sequence: int
     timestamp: datetime
     agent_id: str
     action: str
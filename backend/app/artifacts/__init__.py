@@ -0,0 +1,11 @@
+"""Content-addressed storage for passport artifacts and offloaded context."""
+
+from app.artifacts.filesystem import FilesystemArtifactStore
+from app.artifacts.store import ArtifactNotFoundError, ArtifactStore, get_artifact_store
+
+__all__ = [
+    "ArtifactNotFoundError",
+    "ArtifactStore",
+    "FilesystemArtifactStore",
+    "get_artifact_store",
+]
@@ -0,0 +1,96 @@
+"""Filesystem backend for the content-addressed artifact store."""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from app.artifacts.store import CHUNK_SIZE, ArtifactNotFoundError, ArtifactStore
+
+
+class FilesystemArtifactStore(ArtifactStore):
+    """Artifact store backed by a local directory tree.
+
+    Objects live at ``objects/<ab>/<cd>/<digest>``. Writes stream into a
+    temporary file while hashing and are renamed into place atomically; if the
+    digest already exists the temporary file is discarded.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root).resolve()
+        self._objects = self.root / "objects"
+        self._tmp = self.root / "tmp"
+
+    async def store_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        await asyncio.to_thread(self._tmp.mkdir, parents=True, exist_ok=True)
+        tmp_path = self._tmp / uuid.uuid4().hex
+        hasher = hashlib.sha256()
+
+        handle = await asyncio.to_thread(tmp_path.open, "wb")
+        try:
+            async for chunk in chunks:
+                hasher.update(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(handle.close)
+
+        ref = self.make_ref(hasher.hexdigest())
+        await asyncio.to_thread(self._commit, tmp_path, self._path_for(ref))
+        return ref
+
+    async def stream(
+        self,
+        ref: str,
+        start: int = 0,
+        end: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        path = self._path_for(ref)
+        try:
+            handle: BinaryIO = await asyncio.to_thread(path.open, "rb")
+        except FileNotFoundError as e:
+            raise ArtifactNotFoundError(ref) from e
+
+        try:
+            await asyncio.to_thread(handle.seek, start)
+            remaining = None if end is None else max(0, end - start)
+            while remaining is None or remaining > 0:
+                size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(handle.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def size(self, ref: str) -> int:
+        try:
+            stat = await asyncio.to_thread(self._path_for(ref).stat)
+        except FileNotFoundError as e:
+            raise ArtifactNotFoundError(ref) from e
+        return stat.st_size
+
+    async def exists(self, ref: str) -> bool:
+        if not self.is_ref(ref):
+            return False
+        return await asyncio.to_thread(self._path_for(ref).is_file)
+
+    def _path_for(self, ref: str) -> Path:
+        digest = self.digest_of(ref)
+        return self._objects / digest[:2] / digest[2:4] / digest
+
+    @staticmethod
+    def _commit(tmp_path: Path, path: Path) -> None:
+        """Move a fully written temp file into place, deduplicating by digest."""
+        if path.exists():
+            tmp_path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
@@ -0,0 +1,100 @@
+"""PostgreSQL large-object backend for the content-addressed artifact store."""
+
+import hashlib
+from collections.abc import AsyncIterable, AsyncIterator
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.artifacts.store import CHUNK_SIZE, ArtifactNotFoundError, ArtifactStore
+from app.db.models import ArtifactBlobModel
+
+
+class PostgresArtifactStore(ArtifactStore):
+    """Artifact store backed by PostgreSQL large objects.
+
+    Content is streamed into a new large object with ``lo_put`` while hashing.
+    The ``artifact_blobs`` row maps digest to large-object OID; when the digest
+    is already present the freshly written object is unlinked again.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def store_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        hasher = hashlib.sha256()
+        size = 0
+
+        async with self.session_factory() as session:
+            oid = await session.scalar(text("SELECT lo_create(0)"))
+            async for chunk in chunks:
+                await session.execute(
+                    text("SELECT lo_put(:oid, :offset, :data)"),
+                    {"oid": oid, "offset": size, "data": chunk},
+                )
+                hasher.update(chunk)
+                size += len(chunk)
+
+            digest = hasher.hexdigest()
+            inserted = await session.scalar(
+                pg_insert(ArtifactBlobModel)
+                .values(digest=digest, oid=oid, size_bytes=size)
+                .on_conflict_do_nothing(index_elements=["digest"])
+                .returning(ArtifactBlobModel.digest)
+            )
+            if inserted is None:
+                # Identical content already stored
+                await session.execute(text("SELECT lo_unlink(:oid)"), {"oid": oid})
+            await session.commit()
+
+        return self.make_ref(digest)
+
+    async def stream(
+        self,
+        ref: str,
+        start: int = 0,
+        end: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        async with self.session_factory() as session:
+            oid, size = await self._lookup(session, ref)
+            stop = size if end is None else min(end, size)
+            offset = start
+            while offset < stop:
+                length = min(CHUNK_SIZE, stop - offset)
+                chunk = await session.scalar(
+                    text("SELECT lo_get(:oid, :offset, :length)"),
+                    {"oid": oid, "offset": offset, "length": length},
+                )
+                if not chunk:
+                    break
+                offset += len(chunk)
+                yield bytes(chunk)
+
+    async def size(self, ref: str) -> int:
+        async with self.session_factory() as session:
+            _, size = await self._lookup(session, ref)
+        return size
+
+    async def exists(self, ref: str) -> bool:
+        if not self.is_ref(ref):
+            return False
+        async with self.session_factory() as session:
+            digest = await session.scalar(
+                select(ArtifactBlobModel.digest).where(
+                    ArtifactBlobModel.digest == self.digest_of(ref)
+                )
+            )
+        return digest is not None
+
+    async def _lookup(self, session, ref: str) -> tuple[int, int]:
+        """Resolve a reference to (large-object OID, size in bytes)."""
+        result = await session.execute(
+            select(ArtifactBlobModel.oid, ArtifactBlobModel.size_bytes).where(
+                ArtifactBlobModel.digest == self.digest_of(ref)
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise ArtifactNotFoundError(ref)
+        return row.oid, row.size_bytes
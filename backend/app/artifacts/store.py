@@ -0,0 +1,98 @@
+"""Content-addressed artifact storage.
+
+Passports hold artifact references (``sha256:<hex>``) rather than artifact
+content, so large outputs do not travel through every checkpoint and prompt.
+Content is keyed by its hash, so identical artifacts (e.g. an unchanged draft
+across revisions) are stored once.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
+from functools import lru_cache
+
+from app.core.config import get_settings
+
+REF_PREFIX = "sha256:"
+CHUNK_SIZE = 64 * 1024
+
+_REF_PATTERN = re.compile(r"^sha256:[0-9a-f]{64}$")
+
+
+class ArtifactNotFoundError(KeyError):
+    """Raised when an artifact reference cannot be resolved."""
+
+
+class ArtifactStore(ABC):
+    """Storage backend for artifact content."""
+
+    @abstractmethod
+    async def store_stream(self, chunks: AsyncIterable[bytes]) -> str:
+        """Store content from an async byte stream and return its reference."""
+
+    @abstractmethod
+    def stream(
+        self,
+        ref: str,
+        start: int = 0,
+        end: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream stored content, optionally limited to bytes [start, end)."""
+
+    @abstractmethod
+    async def size(self, ref: str) -> int:
+        """Get the stored size of an artifact in bytes."""
+
+    @abstractmethod
+    async def exists(self, ref: str) -> bool:
+        """Check whether a reference resolves to stored content."""
+
+    async def store(self, content: bytes) -> str:
+        """Store in-memory content and return its reference."""
+
+        async def _chunks() -> AsyncIterator[bytes]:
+            for offset in range(0, len(content), CHUNK_SIZE):
+                yield content[offset : offset + CHUNK_SIZE]
+
+        return await self.store_stream(_chunks())
+
+    async def retrieve(self, ref: str) -> bytes:
+        """Load the full content of an artifact."""
+        return b"".join([chunk async for chunk in self.stream(ref)])
+
+    # -------------------------------------------------------------------------
+    # Reference Helpers
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def make_ref(digest: str) -> str:
+        """Build a reference from a hex sha256 digest."""
+        return f"{REF_PREFIX}{digest}"
+
+    @staticmethod
+    def is_ref(value: object) -> bool:
+        """Check whether a value is a well-formed artifact reference."""
+        return isinstance(value, str) and bool(_REF_PATTERN.match(value))
+
+    @classmethod
+    def digest_of(cls, ref: str) -> str:
+        """Extract the hex digest from a reference."""
+        if not cls.is_ref(ref):
+            raise ArtifactNotFoundError(ref)
+        return ref[len(REF_PREFIX):]
+
+
+@lru_cache
+def get_artifact_store() -> ArtifactStore:
+    """Get the configured artifact store."""
+    settings = get_settings()
+
+    if settings.artifact_backend == "postgres":
+        from app.artifacts.postgres import PostgresArtifactStore
+        from app.db.base import async_session_maker
+
+        return PostgresArtifactStore(async_session_maker)
+
+    from app.artifacts.filesystem import FilesystemArtifactStore
+
+    return FilesystemArtifactStore(settings.artifact_root)
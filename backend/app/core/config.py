@@ -1,6 +1,7 @@
 """Application configuration using pydantic-settings."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +24,8 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_connect_timeout_s: float = 1.0
+    redis_timeout_s: float = 0.5  # Per command; callers degrade instead of waiting
 
     # LLM
     anthropic_api_key: str = ""
@@ -37,6 +40,34 @@ class Settings(BaseSettings):
     chroma_host: str = "localhost"
     chroma_port: int = 8000
 
+    # Vector index
+    vector_backend: Literal["chroma", "local"] = "chroma"
+    vector_root: str = "./data/vectors"  # Local backend collections
+    vector_hnsw_threshold: int = 50_000  # Local backend switches to HNSW at this size
+
+    # Embeddings (computed in-process, see app.memory.vectors.providers)
+    embedding_model: Literal["minilm", "hashing"] = "minilm"  # "hashing" runs offline
+    embedding_batch_size: int = 64
+    embedding_cache_size: int = 10_000  # Content-hash LRU entries
+    embedding_shared_cache: bool = True  # Persistent hash -> vector cache across tenants
+    embedding_shared_cache_size: int = 1_000_000  # Oldest entries evicted beyond this
+
+    # Vector outbox (app.memory.outbox)
+    outbox_relay_in_process: bool = True  # Run the relay inside the API process
+    outbox_batch_size: int = 256
+    outbox_max_attempts: int = 10
+    outbox_poll_interval_s: float = 1.0
+
+    # Semantic retrieval cache in Redis (app.memory.cache)
+    retrieval_cache_enabled: bool = True
+    retrieval_cache_ttl_s: int = 900
+    retrieval_cache_max_entries: int = 1000  # Per team
+
+    # Artifacts
+    artifact_backend: Literal["filesystem", "postgres"] = "filesystem"
+    artifact_root: str = "./data/artifacts"
+    context_inline_max_bytes: int = 2048  # Larger context values are stored by reference
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -11,7 +11,11 @@ from app.core.config import get_settings
 def get_redis_pool() -> redis.ConnectionPool:
     """Get cached Redis connection pool."""
     settings = get_settings()
-    return redis.ConnectionPool.from_url(settings.redis_url)
+    return redis.ConnectionPool.from_url(
+        settings.redis_url,
+        socket_connect_timeout=settings.redis_connect_timeout_s,
+        socket_timeout=settings.redis_timeout_s,
+    )
 
 
 async def get_redis() -> redis.Redis:
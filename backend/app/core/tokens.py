@@ -0,0 +1,37 @@
+"""Local token counting for prompt budgeting."""
+
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# cl100k_base is not Claude's tokenizer, but it tracks it closely enough for
+# budgeting and for comparing context formats against each other.
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache
+def _get_encoding(name: str):
+    """Load a tiktoken encoding, or None when it is unavailable offline."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception:
+        logger.warning("tiktoken encoding %s unavailable; estimating tokens", name)
+        return None
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Count tokens in text, falling back to a chars/4 estimate."""
+    if not text:
+        return 0
+    enc = _get_encoding(encoding)
+    if enc is None:
+        return max(1, len(text) // 4)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def tokenizer_name(encoding: str = DEFAULT_ENCODING) -> str:
+    """Name of the tokenizer count_tokens is using, for reports."""
+    return encoding if _get_encoding(encoding) is not None else "chars/4 estimate"
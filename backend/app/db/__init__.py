@@ -2,13 +2,16 @@
 
 from app.db.base import Base, async_session_maker, engine, get_db
 from app.db.models import (
+    ArtifactBlobModel,
     LedgerEntryModel,
     MemoryNodeModel,
+    MemoryOutboxModel,
     MemoryRelationshipModel,
     PassportModel,
     TeamModel,
     TenantModel,
 )
+from app.db.partitions import ensure_tenant_partitions
 
 __all__ = [
     "Base",
@@ -16,9 +19,12 @@ __all__ = [
     "async_session_maker",
     "get_db",
     "TenantModel",
+    "ArtifactBlobModel",
     "TeamModel",
     "PassportModel",
     "LedgerEntryModel",
     "MemoryNodeModel",
     "MemoryRelationshipModel",
+    "MemoryOutboxModel",
+    "ensure_tenant_partitions",
 ]
@@ -5,20 +5,36 @@ from datetime import datetime
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
+    Computed,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    ForeignKeyConstraint,
+    Identity,
     Index,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, OID, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+# Index key orders matching the keyset pagination in app.db.pagination
+_SALIENCE_ORDER = (text("salience DESC"), text("id DESC"))
+_CREATED_ORDER = (text("created_at DESC"), text("id DESC"))
+
+# Full-text document of a memory node: micro > summary > full_content strings
+_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(micro, '')), 'A')"
+    " || setweight(to_tsvector('english', coalesce(summary, '')), 'B')"
+    " || setweight(jsonb_to_tsvector('english', coalesce(full_content, '{}'), '[\"string\"]'), 'C')"
+)
+
 
 class TenantModel(Base):
     """Multi-tenant organization."""
@@ -107,13 +123,16 @@ class PassportModel(Base):
     tenant: Mapped["TenantModel"] = relationship(back_populates="passports")
     team: Mapped["TeamModel"] = relationship(back_populates="passports")
     ledger_entries: Mapped[list["LedgerEntryModel"]] = relationship(
-        back_populates="passport", order_by="LedgerEntryModel.timestamp"
+        back_populates="passport", order_by="LedgerEntryModel.sequence"
     )
 
     __table_args__ = (
         Index("ix_passports_tenant_id", "tenant_id"),
         Index("ix_passports_team_id", "team_id"),
         Index("ix_passports_status", "status"),
+        # Mission listings, newest first (keyset on created_at, id)
+        Index("ix_passports_tenant_created", "tenant_id", *_CREATED_ORDER),
+        Index("ix_passports_tenant_status_created", "tenant_id", "status", *_CREATED_ORDER),
     )
 
 
@@ -124,6 +143,7 @@ class LedgerEntryModel(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     passport_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("passports.id"), nullable=False)
+    sequence: Mapped[int] = mapped_column(default=0)
 
     # Agent action
     agent_id: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -152,16 +172,31 @@ class LedgerEntryModel(Base):
         Index("ix_ledger_entries_passport_id", "passport_id"),
         Index("ix_ledger_entries_agent_id", "agent_id"),
         Index("ix_ledger_entries_timestamp", "timestamp"),
+        UniqueConstraint("passport_id", "sequence", name="uq_ledger_entries_passport_sequence"),
     )
 
 
+class ArtifactBlobModel(Base):
+    """Content-addressed artifact stored as a PostgreSQL large object."""
+
+    __tablename__ = "artifact_blobs"
+
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 hex
+    oid: Mapped[int] = mapped_column(OID, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class MemoryNodeModel(Base):
     """Persisted memory node with multi-resolution content."""
 
     __tablename__ = "memory_nodes"
 
+    # Partitioned by LIST (tenant_id), so the key includes tenant_id (app.db.partitions)
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("tenants.id"), primary_key=True, nullable=False
+    )
     team_id: Mapped[str] = mapped_column(String(100), nullable=False)
 
     # Symbol addressing: layer.type.id
@@ -173,6 +208,9 @@ class MemoryNodeModel(Base):
     micro: Mapped[str] = mapped_column(Text, nullable=False)
     summary: Mapped[str] = mapped_column(Text, nullable=False)
     full_content: Mapped[dict] = mapped_column(JSONB, default=dict)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(_SEARCH_VECTOR, persisted=True), deferred=True
+    )
 
     # Structured tags for filtering: ["facility:dayton-fleet", "priority:high_30"]
     tags: Mapped[list[str]] = mapped_column(ARRAY(String), default=list)
@@ -191,21 +229,49 @@ class MemoryNodeModel(Base):
     tenant: Mapped["TenantModel"] = relationship()
     outgoing_relations: Mapped[list["MemoryRelationshipModel"]] = relationship(
         back_populates="source_node",
-        foreign_keys="MemoryRelationshipModel.source_id",
+        foreign_keys="[MemoryRelationshipModel.tenant_id, MemoryRelationshipModel.source_id]",
+        overlaps="incoming_relations,target_node",
     )
     incoming_relations: Mapped[list["MemoryRelationshipModel"]] = relationship(
         back_populates="target_node",
-        foreign_keys="MemoryRelationshipModel.target_id",
+        foreign_keys="[MemoryRelationshipModel.tenant_id, MemoryRelationshipModel.target_id]",
+        overlaps="outgoing_relations,source_node",
     )
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "symbol", name="uq_memory_nodes_tenant_symbol"),
         Index("ix_memory_nodes_tenant_id", "tenant_id"),
-        Index("ix_memory_nodes_team_id", "team_id"),
-        Index("ix_memory_nodes_layer", "layer"),
-        Index("ix_memory_nodes_node_type", "node_type"),
-        Index("ix_memory_nodes_tags", "tags", postgresql_using="gin"),
-        Index("ix_memory_nodes_salience", "salience"),
+        # Every query is scoped to (tenant_id, team_id) and ordered by salience
+        Index("ix_memory_nodes_scope_salience", "tenant_id", "team_id", *_SALIENCE_ORDER),
+        Index(
+            "ix_memory_nodes_scope_layer_salience",
+            "tenant_id", "team_id", "layer", *_SALIENCE_ORDER,
+        ),
+        Index(
+            "ix_memory_nodes_scope_type_salience",
+            "tenant_id", "team_id", "node_type", *_SALIENCE_ORDER,
+        ),
+        # Cursor-paged listings, newest first (keyset on created_at, id)
+        Index("ix_memory_nodes_scope_created", "tenant_id", "team_id", *_CREATED_ORDER),
+        Index(
+            "ix_memory_nodes_symbol_prefix",
+            "tenant_id", "symbol",
+            postgresql_ops={"symbol": "text_pattern_ops"},
+        ),
+        Index(  # Leading/middle wildcard globs; needs pg_trgm and btree_gin
+            "ix_memory_nodes_symbol_trgm",
+            "tenant_id", "symbol",
+            postgresql_using="gin",
+            postgresql_ops={"symbol": "gin_trgm_ops"},
+        ),
+        Index(  # Needs btree_gin for the scalar columns
+            "ix_memory_nodes_scope_tags", "tenant_id", "team_id", "tags", postgresql_using="gin"
+        ),
+        Index(
+            "ix_memory_nodes_scope_search",
+            "tenant_id", "team_id", "search_vector",
+            postgresql_using="gin",
+        ),
     )
 
 
@@ -214,11 +280,14 @@ class MemoryRelationshipModel(Base):
 
     __tablename__ = "memory_relationships"
 
+    # Partitioned by LIST (tenant_id) alongside memory_nodes (app.db.partitions)
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tenant_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("tenants.id"), primary_key=True, nullable=False
+    )
 
-    source_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("memory_nodes.id"), nullable=False)
-    target_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("memory_nodes.id"), nullable=False)
+    source_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    target_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     relation_type: Mapped[str] = mapped_column(String(50), nullable=False)
 
     weight: Mapped[float] = mapped_column(Float, default=1.0)
@@ -228,20 +297,53 @@ class MemoryRelationshipModel(Base):
     # Relationships
     source_node: Mapped["MemoryNodeModel"] = relationship(
         back_populates="outgoing_relations",
-        foreign_keys=[source_id],
+        foreign_keys=[tenant_id, source_id],
+        overlaps="incoming_relations,target_node",
     )
     target_node: Mapped["MemoryNodeModel"] = relationship(
         back_populates="incoming_relations",
-        foreign_keys=[target_id],
+        foreign_keys=[tenant_id, target_id],
+        overlaps="outgoing_relations,source_node",
     )
 
     __table_args__ = (
+        ForeignKeyConstraint(
+            ["tenant_id", "source_id"], ["memory_nodes.tenant_id", "memory_nodes.id"],
+            name="fk_memory_relationships_source",
+        ),
+        ForeignKeyConstraint(
+            ["tenant_id", "target_id"], ["memory_nodes.tenant_id", "memory_nodes.id"],
+            name="fk_memory_relationships_target",
+        ),
         UniqueConstraint(
-            "source_id", "target_id", "relation_type",
+            "tenant_id", "source_id", "target_id", "relation_type",
             name="uq_memory_relationships_source_target_type"
         ),
         Index("ix_memory_relationships_tenant_id", "tenant_id"),
-        Index("ix_memory_relationships_source_id", "source_id"),
-        Index("ix_memory_relationships_target_id", "target_id"),
+        Index("ix_memory_relationships_source_id", "tenant_id", "source_id"),
+        Index("ix_memory_relationships_target_id", "tenant_id", "target_id"),
         Index("ix_memory_relationships_relation_type", "relation_type"),
     )
+
+
+class MemoryOutboxModel(Base):
+    """Pending vector index change, written in the same transaction as the node change.
+
+    Drained by app.memory.outbox.OutboxRelay; rows are deleted once applied.
+    """
+
+    __tablename__ = "memory_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    team_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    node_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)  # upsert | delete
+
+    # Retry state: failed events wait until available_at (exponential backoff)
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    available_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_memory_outbox_available", "available_at", "id"),)
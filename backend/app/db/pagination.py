@@ -0,0 +1,130 @@
+"""Keyset pagination helpers: opaque cursors, planner estimates and plans."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque token."""
+    payload = json.dumps([_dump(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, *types: type) -> tuple[Any, ...]:
+    """Decode a cursor into values of the given types."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(raw, list) or len(raw) != len(types):
+            raise ValueError("cursor shape mismatch")
+        return tuple(_load(value, t) for value, t in zip(raw, types, strict=True))
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def keyset_after(
+    columns: list[ColumnElement[Any]],
+    values: tuple[Any, ...],
+) -> ColumnElement[bool]:
+    """Predicate for rows after the cursor under an all-descending ORDER BY.
+
+    A row-value comparison lets PostgreSQL seek a matching composite index
+    instead of scanning and discarding OFFSET rows.
+    """
+    return tuple_(*columns) < tuple_(*values)
+
+
+async def approximate_count(session: AsyncSession, stmt: Select) -> int:
+    """Row estimate for a query from the planner (EXPLAIN), without running it."""
+    return _plan_rows(await explain(session, _count_stmt(stmt)))
+
+
+async def exact_count(session: AsyncSession, stmt: Select) -> int:
+    """Exact row count for a query."""
+    return await session.scalar(_count_stmt(stmt)) or 0
+
+
+async def explain(session: AsyncSession, stmt: Select) -> list[dict[str, Any]]:
+    """The planner's plan for a query as EXPLAIN (FORMAT JSON) output."""
+    plan = (await session.execute(_Explain(stmt))).scalar()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def plan_indexes(plan: list[dict[str, Any]]) -> set[str]:
+    """Names of every index a plan scans."""
+    return {node["Index Name"] for node in _plan_nodes(plan) if "Index Name" in node}
+
+
+def plan_relations(plan: list[dict[str, Any]]) -> set[str]:
+    """Tables (or partitions) a plan reads, after partition pruning."""
+    return {node["Relation Name"] for node in _plan_nodes(plan) if "Relation Name" in node}
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _count_stmt(stmt: Select) -> Select:
+    unpaged = stmt.order_by(None).limit(None).offset(None)
+    return select(func.count()).select_from(unpaged.subquery())
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper for a select."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _plan_nodes(plan: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+def _plan_rows(plan: list[dict[str, Any]]) -> int:
+    node = plan[0]["Plan"]
+    # count(*) plans aggregate to one row; the estimate sits on the scan below
+    while node.get("Node Type") == "Aggregate" and node.get("Plans"):
+        node = node["Plans"][0]
+    return int(node.get("Plan Rows", 0))
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _load(value: Any, target: type) -> Any:
+    if target is datetime:
+        return datetime.fromisoformat(value)
+    if target is UUID:
+        return UUID(value)
+    return target(value)
@@ -0,0 +1,149 @@
+"""Per-tenant partitions of the memory tables.
+
+``memory_nodes`` and ``memory_relationships`` are partitioned by
+``LIST (tenant_id)``: each tenant gets its own partition of both tables, and a
+DEFAULT partition catches rows for tenants that have none yet. Every
+MemoryStorage statement filters on tenant_id, so the planner prunes to the
+tenant's partition and per-tenant maintenance (vacuum, archive, export)
+touches only that tenant's rows.
+
+Partitions are created when a tenant row is inserted (see the listener at the
+bottom of this module) and by migration 006 for tenants that already exist.
+"""
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import TenantModel
+
+# Referenced table first: relationships carry foreign keys into memory_nodes
+PARTITIONED_TABLES = ("memory_nodes", "memory_relationships")
+
+
+def partition_name(table: str, tenant_id: UUID) -> str:
+    """Name of a tenant's partition of a table."""
+    return f"{table}_{tenant_id.hex}"
+
+
+def create_partition_sql(table: str, tenant_id: UUID) -> str:
+    """DDL for a tenant's partition; a no-op if it already exists."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, tenant_id)} "
+        f"PARTITION OF {table} FOR VALUES IN ('{tenant_id}')"
+    )
+
+
+async def ensure_tenant_partitions(session: AsyncSession, tenant_id: UUID) -> None:
+    """Create a tenant's partitions of every memory table.
+
+    PostgreSQL refuses if the DEFAULT partition already holds rows for the
+    tenant; move them with ``move_from_default`` first.
+    """
+    for table in PARTITIONED_TABLES:
+        await session.execute(text(create_partition_sql(table, tenant_id)))
+
+
+async def move_from_default(session: AsyncSession, tenant_id: UUID) -> dict[str, int]:
+    """Move a tenant's rows out of the DEFAULT partitions into its own.
+
+    Rows are staged in temporary tables, deleted from DEFAULT (relationships
+    first, for their foreign keys), then reinserted once the tenant's
+    partitions exist, all in the caller's transaction. Generated columns
+    (``memory_nodes.search_vector``) are left out and recomputed on insert.
+
+    Returns:
+        Rows moved per table
+    """
+    moved: dict[str, int] = {}
+    columns = {table: await _insertable_columns(session, table) for table in PARTITIONED_TABLES}
+    for table in PARTITIONED_TABLES:
+        await session.execute(
+            text(
+                f"CREATE TEMP TABLE _move_{table} ON COMMIT DROP AS "
+                f"SELECT {columns[table]} FROM {table}_default WHERE tenant_id = :tenant_id"
+            ),
+            {"tenant_id": tenant_id},
+        )
+    for table in reversed(PARTITIONED_TABLES):
+        result = await session.execute(
+            text(f"DELETE FROM {table}_default WHERE tenant_id = :tenant_id"),
+            {"tenant_id": tenant_id},
+        )
+        moved[table] = result.rowcount
+
+    await ensure_tenant_partitions(session, tenant_id)
+    for table in PARTITIONED_TABLES:
+        names = columns[table]
+        await session.execute(
+            text(f"INSERT INTO {table} ({names}) SELECT {names} FROM _move_{table}")
+        )
+    return moved
+
+
+async def _insertable_columns(session: AsyncSession, table: str) -> str:
+    """Comma-separated, quoted columns of a table that are not generated."""
+    result = await session.execute(
+        text(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :table
+              AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+            """
+        ),
+        {"table": table},
+    )
+    return ", ".join(f'"{name}"' for name in result.scalars())
+
+
+async def detach_tenant_partitions(session: AsyncSession, tenant_id: UUID) -> list[str]:
+    """Detach a tenant's partitions, e.g. to archive or drop a tenant.
+
+    The detached tables keep their data and can be dumped or dropped on their
+    own. Relationships are detached first, for their foreign keys.
+
+    Returns:
+        Names of the detached tables
+    """
+    detached = []
+    for table in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, tenant_id)
+        await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        detached.append(name)
+    return detached
+
+
+async def list_partitions(session: AsyncSession) -> dict[str, list[dict[str, Any]]]:
+    """Partitions of each memory table with their bounds and estimated rows."""
+    result = await session.execute(
+        text(
+            """
+            SELECT parent.relname AS parent, child.relname AS name,
+                   pg_get_expr(child.relpartbound, child.oid) AS bound,
+                   child.reltuples::bigint AS estimated_rows
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = ANY(:tables)
+            ORDER BY parent.relname, child.relname
+            """
+        ),
+        {"tables": list(PARTITIONED_TABLES)},
+    )
+    partitions: dict[str, list[dict[str, Any]]] = {table: [] for table in PARTITIONED_TABLES}
+    for row in result.mappings():
+        partitions[row["parent"]].append(
+            {"name": row["name"], "bound": row["bound"], "estimated_rows": row["estimated_rows"]}
+        )
+    return partitions
+
+
+@event.listens_for(TenantModel, "after_insert")
+def _create_tenant_partitions(_mapper: Any, connection: Connection, target: TenantModel) -> None:
+    """Give every new tenant its partitions in the same transaction."""
+    for table in PARTITIONED_TABLES:
+        connection.execute(text(create_partition_sql(table, target.id)))
@@ -1,14 +1,37 @@
 """Quandura API entry point."""
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import memory_router, missions_router
+from app.core.config import get_settings
+from app.memory.outbox import relay_from_settings
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the vector outbox relay alongside the API unless it runs separately."""
+    if not get_settings().outbox_relay_in_process:
+        yield
+        return
+    stop = asyncio.Event()
+    relay = asyncio.create_task(relay_from_settings().run(stop))
+    try:
+        yield
+    finally:
+        stop.set()
+        await relay
+
 
 app = FastAPI(
     title="Quandura",
     description="Enterprise AI agent platform for local government operations",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -1,7 +1,22 @@
 """Memory storage and retrieval system."""
 
+from app.memory.cache import RetrievalCache
 from app.memory.embeddings import EmbeddingStore
+from app.memory.export import MemoryExporter
+from app.memory.importer import MemoryImporter
+from app.memory.precedents import PrecedentEngine
 from app.memory.queries import MemoryQueryBuilder
-from app.memory.storage import MemoryStorage
+from app.memory.retrieval import HybridRetriever
+from app.memory.storage import MemoryStorage, NodeFilter
 
-__all__ = ["MemoryStorage", "EmbeddingStore", "MemoryQueryBuilder"]
+__all__ = [
+    "MemoryStorage",
+    "EmbeddingStore",
+    "HybridRetriever",
+    "MemoryExporter",
+    "MemoryImporter",
+    "MemoryQueryBuilder",
+    "NodeFilter",
+    "PrecedentEngine",
+    "RetrievalCache",
+]
@@ -0,0 +1,254 @@
+"""Redis cache of ranked semantic-search candidates, invalidated by memory writes.
+
+Semantic queries recur (the same equipment types, the same mission
+categories), and each one costs an embedding, a vector search and a
+Postgres hydrate. The cache keeps the ranked node ids a vector search
+returned, keyed on tenant, team, normalised query text and the filters
+pushed into the search; a hit costs one Redis round trip plus the usual
+batched hydrate, which still applies every filter.
+
+Every key embeds the team's generation counter. MemoryStorage writes (once
+their transaction commits, see bump_after_commit) and the outbox relay
+(once the vector index has changed) increment it, so
+earlier entries are never read again and simply expire. Entries also carry
+a TTL, and a per-team index trims the least recently stored entries beyond
+``max_entries``, bounding memory. Hits and misses are counted per team in
+Redis (see stats()). Redis errors never fail a query: the cache is skipped.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "memory:rc"
+
+_PENDING_BUMPS = "retrieval_cache_bumps"  # Session.info key: (tenant_id, team_id) to bump
+_bump_tasks: set[asyncio.Task[None]] = set()
+
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a query."""
+    return " ".join(text.casefold().split())
+
+
+@dataclass
+class RetrievalCacheStats:
+    """Hit/miss counters and current size of one team's cache."""
+
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    hit_rate: float = 0.0
+
+
+@dataclass
+class RetrievalCache:
+    """Ranked candidate ids of semantic queries for one team.
+
+    Args:
+        tenant_id: Tenant of the cached queries
+        team_id: Team of the cached queries
+        ttl_s: Lifetime of an entry
+        max_entries: Entries kept per team before the oldest are evicted
+        enabled: When False every lookup misses and nothing is stored
+    """
+
+    tenant_id: UUID
+    team_id: str
+    ttl_s: int = 900
+    max_entries: int = 1000
+    enabled: bool = True
+
+    @classmethod
+    def from_settings(cls, tenant_id: UUID, team_id: str) -> "RetrievalCache":
+        """Cache configured by the RETRIEVAL_CACHE_* settings."""
+        settings = get_settings()
+        return cls(
+            tenant_id,
+            team_id,
+            ttl_s=settings.retrieval_cache_ttl_s,
+            max_entries=settings.retrieval_cache_max_entries,
+            enabled=settings.retrieval_cache_enabled,
+        )
+
+    @property
+    def _scope(self) -> str:
+        return f"{self.tenant_id}:{self.team_id}"
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    async def generation(self) -> int | None:
+        """Current write generation of the team.
+
+        None when the cache is disabled or Redis is unreachable: writes are
+        then not being counted, so callers must not cache on the generation.
+        """
+        if not self.enabled:
+            return None
+        try:
+            client = await get_redis()
+            return int(await client.get(f"{PREFIX}:gen:{self._scope}") or 0)
+        except RedisError as e:
+            logger.warning("Retrieval cache unavailable: %s", e)
+            return None
+
+    async def get_many(
+        self, queries: list[str], filters: dict[str, Any]
+    ) -> tuple[int | None, list[list[str] | None]]:
+        """Cached ranked ids per query (None on a miss), and the generation read.
+
+        Pass the generation to put_many, so results computed while a write
+        happened are stored under the old generation and never served. The
+        generation is None when the cache is disabled or unreachable: then
+        nothing should be stored.
+        """
+        misses: list[list[str] | None] = [None] * len(queries)
+        if not self.enabled or not queries:
+            return None, misses
+        try:
+            client = await get_redis()
+            generation = int(await client.get(f"{PREFIX}:gen:{self._scope}") or 0)
+            values = await client.mget(
+                [self._key(generation, query, filters) for query in queries]
+            )
+            found = [json.loads(value) if value is not None else None for value in values]
+            hits = sum(ids is not None for ids in found)
+            stats = client.pipeline(transaction=False)
+            stats.hincrby(f"{PREFIX}:stats:{self._scope}", "hits", hits)
+            stats.hincrby(f"{PREFIX}:stats:{self._scope}", "misses", len(found) - hits)
+            await stats.execute()
+            return generation, found
+        except RedisError as e:
+            logger.warning("Retrieval cache unavailable: %s", e)
+            return None, misses
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    async def put_many(
+        self,
+        generation: int,
+        queries: list[str],
+        filters: dict[str, Any],
+        ranked: list[list[str]],
+    ) -> None:
+        """Store ranked ids per query under the generation they were computed at."""
+        if not self.enabled or not queries:
+            return
+        index = f"{PREFIX}:index:{self._scope}"
+        now = time.time()
+        try:
+            client = await get_redis()
+            pipe = client.pipeline(transaction=False)
+            for query, ids in zip(queries, ranked, strict=True):
+                key = self._key(generation, query, filters)
+                pipe.set(key, json.dumps(ids), ex=self.ttl_s)
+                pipe.zadd(index, {key: now})
+            pipe.expire(index, self.ttl_s)
+            pipe.zcard(index)
+            size = (await pipe.execute())[-1]
+
+            if size > self.max_entries:
+                evicted = await client.zpopmin(index, size - self.max_entries)
+                if evicted:
+                    await client.delete(*(key for key, _ in evicted))
+        except RedisError as e:
+            logger.warning("Retrieval cache unavailable: %s", e)
+
+    async def bump(self) -> None:
+        """Invalidate every entry of the team by advancing its generation."""
+        if not self.enabled:
+            return
+        try:
+            client = await get_redis()
+            await client.incr(f"{PREFIX}:gen:{self._scope}")
+        except RedisError as e:
+            logger.warning("Retrieval cache generation not bumped for %s: %s", self._scope, e)
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    async def stats(self) -> RetrievalCacheStats:
+        """Hit/miss counters since the cache was first used, and live entries."""
+        try:
+            client = await get_redis()
+            counters = await client.hgetall(f"{PREFIX}:stats:{self._scope}")
+            entries = await client.zcard(f"{PREFIX}:index:{self._scope}")
+        except RedisError as e:
+            logger.warning("Retrieval cache unavailable: %s", e)
+            return RetrievalCacheStats()
+        hits = int(counters.get(b"hits", 0))
+        misses = int(counters.get(b"misses", 0))
+        lookups = hits + misses
+        return RetrievalCacheStats(
+            hits=hits,
+            misses=misses,
+            entries=entries,
+            hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+        )
+
+    def _key(self, generation: int, query: str, filters: dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"query": normalize_query(query), **filters}, sort_keys=True, default=str
+        )
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        return f"{PREFIX}:{self._scope}:{generation}:{digest}"
+
+
+# =============================================================================
+# Invalidation on commit
+# =============================================================================
+
+
+def bump_after_commit(session: AsyncSession, tenant_id: UUID, team_ids: set[str]) -> None:
+    """Bump the teams' generations once the session's transaction commits.
+
+    Bumping inside the transaction would hold it open on Redis round trips and
+    let a concurrent query re-cache the pre-write state under the new
+    generation. Teams are collected per transaction and bumped in background
+    tasks after the commit; a rollback discards them.
+    """
+    sync_session = session.sync_session
+    pending = sync_session.info.get(_PENDING_BUMPS)
+    if pending is None:
+        pending = sync_session.info[_PENDING_BUMPS] = set()
+        event.listen(sync_session, "after_commit", _bump_pending)
+        event.listen(sync_session, "after_rollback", _discard_pending)
+    pending.update((tenant_id, team_id) for team_id in team_ids)
+
+
+def _bump_pending(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # Released savepoint: wait for the outer commit
+    pending = session.info[_PENDING_BUMPS]
+    if not pending:
+        return
+    loop = asyncio.get_running_loop()
+    for tenant_id, team_id in pending:
+        task = loop.create_task(RetrievalCache.from_settings(tenant_id, team_id).bump())
+        _bump_tasks.add(task)
+        task.add_done_callback(_bump_tasks.discard)
+    pending.clear()
+
+
+def _discard_pending(session: Session) -> None:
+    session.info[_PENDING_BUMPS].clear()
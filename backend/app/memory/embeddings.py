@@ -1,49 +1,77 @@
-"""ChromaDB integration for semantic search over memory nodes."""
+"""Embedding storage and semantic search over memory nodes.
+
+Text is embedded in-process by the configured ``EmbeddingProvider`` and the
+vectors are stored in the backend chosen by ``settings.vector_backend``: a
+ChromaDB server, or the in-process index in ``app.memory.vectors.local``.
+Each record's metadata names the model that produced it and hashes the text
+it was embedded from: writes whose text is unchanged only update metadata,
+and a model change can be rolled out with ``python -m app.memory.reembed``.
+
+Every tag is stored as its own boolean metadata key (``tag:status:open``), so
+tag filters are exact and run inside the nearest-neighbour search.
+"""
 
 import logging
+from collections.abc import Iterator
 from typing import Any
 from uuid import UUID
 
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-
-from app.core.config import get_settings
+from app.memory.vectors import (
+    EmbeddingProvider,
+    VectorBackend,
+    VectorRecord,
+    content_hash,
+    get_embedding_provider,
+    get_vector_backend,
+)
 from app.models.memory import MemoryLayer, MemoryNode
 
 logger = logging.getLogger(__name__)
 
+TAG_KEY_PREFIX = "tag:"
+
+# Bumped when the metadata layout changes; older records are stale (see stale_ids).
+# Ship a migration that enqueues every node for the relay with it (see 009).
+METADATA_VERSION = 2
+
+
+def tag_key(tag: str) -> str:
+    """Metadata key marking a tag ("status:open" -> "tag:status:open")."""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def embedding_text(node: MemoryNode) -> str:
+    """Text a node is embedded from."""
+    # Use summary for embedding (good balance of context)
+    return f"{node.micro}\n{node.summary}"
+
 
 class EmbeddingStore:
-    """ChromaDB-based embedding store for semantic memory search."""
+    """Embedding store for semantic memory search over one tenant/team collection."""
 
     def __init__(
         self,
         tenant_id: UUID,
         team_id: str,
         collection_prefix: str = "memory",
+        backend: VectorBackend | None = None,
+        provider: EmbeddingProvider | None = None,
     ):
         self.tenant_id = tenant_id
         self.team_id = team_id
         self.collection_prefix = collection_prefix
-
-        settings = get_settings()
-        self._client = chromadb.HttpClient(
-            host=settings.chroma_host,
-            port=settings.chroma_port,
-            settings=ChromaSettings(anonymized_telemetry=False),
+        self.provider = provider or get_embedding_provider()
+        self._backend = backend or get_vector_backend(
+            self.collection_name,
+            metadata={"tenant_id": str(self.tenant_id), "team_id": self.team_id},
         )
-        self._collection = self._get_or_create_collection()
 
-    def _get_or_create_collection(self) -> chromadb.Collection:
-        """Get or create the collection for this tenant/team."""
+    @property
+    def collection_name(self) -> str:
+        """Collection name for this tenant/team."""
         collection_name = f"{self.collection_prefix}_{self.tenant_id}_{self.team_id}"
         # Sanitize collection name (ChromaDB has restrictions)
-        collection_name = collection_name.replace("-", "_")[:63]
-
-        return self._client.get_or_create_collection(
-            name=collection_name,
-            metadata={"tenant_id": str(self.tenant_id), "team_id": self.team_id},
-        )
+        return collection_name.replace("-", "_")[:63]
 
     # -------------------------------------------------------------------------
     # Storage Operations
@@ -51,45 +79,109 @@ class EmbeddingStore:
 
     def add(self, node: MemoryNode) -> None:
         """Add a memory node to the embedding store."""
-        # Use summary for embedding (good balance of context)
-        text = f"{node.micro}\n{node.summary}"
-
-        self._collection.add(
-            ids=[str(node.id)],
-            documents=[text],
-            metadatas=[self._node_metadata(node)],
-        )
+        self.upsert_many([node])
 
     def add_many(self, nodes: list[MemoryNode]) -> None:
         """Add multiple nodes in a batch."""
+        self.upsert_many(nodes)
+
+    def upsert_many(self, nodes: list[MemoryNode]) -> None:
+        """Add or replace multiple nodes in a batch (safe to repeat).
+
+        Nodes whose stored content hash and model match are not re-embedded;
+        if only their metadata (tags, salience, ...) changed, that alone is
+        written.
+        """
         if not nodes:
             return
 
-        ids = [str(n.id) for n in nodes]
-        documents = [f"{n.micro}\n{n.summary}" for n in nodes]
-        metadatas = [self._node_metadata(n) for n in nodes]
-
-        self._collection.add(ids=ids, documents=documents, metadatas=metadatas)
+        stored = {
+            record.id: record
+            for record in self._backend.get(ids=[str(n.id) for n in nodes], include_embeddings=True)
+        }
+        changed: list[tuple[MemoryNode, dict[str, Any]]] = []
+        retagged: list[tuple[str, dict[str, Any]]] = []
+        for node in nodes:
+            metadata = self._node_metadata(node)
+            record = stored.get(str(node.id))
+            if record is None or not _same_embedding(record.metadata, metadata):
+                changed.append((node, _drop_removed_tags(record, metadata)))
+                continue
+            node.embedding = record.embedding
+            if record.metadata != metadata:
+                retagged.append((str(node.id), _drop_removed_tags(record, metadata)))
+
+        if changed:
+            changed_nodes = [node for node, _ in changed]
+            self._backend.upsert(
+                ids=[str(n.id) for n in changed_nodes],
+                embeddings=self.embed(changed_nodes),
+                metadatas=[metadata for _, metadata in changed],
+            )
+        if retagged:
+            ids, metadatas = zip(*retagged, strict=True)
+            self._backend.update(ids=list(ids), metadatas=list(metadatas))
 
     def update(self, node: MemoryNode) -> None:
-        """Update a node's embedding."""
-        text = f"{node.micro}\n{node.summary}"
+        """Update a node's embedding, or only its metadata if the text is unchanged."""
+        self.upsert_many([node])
 
-        self._collection.update(
-            ids=[str(node.id)],
-            documents=[text],
-            metadatas=[self._node_metadata(node)],
+    def update_metadata(self, nodes: list[MemoryNode]) -> None:
+        """Write metadata only, keeping stored vectors (e.g. after salience changes)."""
+        if not nodes:
+            return
+        ids = [str(n.id) for n in nodes]
+        stored = {record.id: record for record in self._backend.get(ids=ids)}
+        self._backend.update(
+            ids=ids,
+            metadatas=[
+                _drop_removed_tags(stored.get(str(n.id)), self._node_metadata(n)) for n in nodes
+            ],
         )
 
     def delete(self, node_id: UUID) -> None:
         """Delete a node from the embedding store."""
-        self._collection.delete(ids=[str(node_id)])
+        self._backend.delete([str(node_id)])
 
     def delete_many(self, node_ids: list[UUID]) -> None:
         """Delete multiple nodes."""
         if not node_ids:
             return
-        self._collection.delete(ids=[str(nid) for nid in node_ids])
+        self._backend.delete([str(nid) for nid in node_ids])
+
+    # -------------------------------------------------------------------------
+    # Embedding
+    # -------------------------------------------------------------------------
+
+    def embed(self, nodes: list[MemoryNode]) -> list[list[float]]:
+        """Embed nodes in batches and fill each ``MemoryNode.embedding``."""
+        vectors = self.provider.embed([embedding_text(n) for n in nodes])
+        for node, vector in zip(nodes, vectors, strict=True):
+            node.embedding = vector
+        return vectors
+
+    def attach_embeddings(self, nodes: list[MemoryNode]) -> list[MemoryNode]:
+        """Fill ``MemoryNode.embedding`` from the store where it is missing."""
+        missing = {str(n.id): n for n in nodes if n.embedding is None}
+        if missing:
+            for record in self._backend.get(ids=list(missing), include_embeddings=True):
+                missing[record.id].embedding = record.embedding
+        return nodes
+
+    def stale_ids(self, node_ids: list[str]) -> set[str]:
+        """Ids that are missing, embedded by a different model or in an older layout."""
+        current = {
+            record.id
+            for record in self._backend.get(ids=node_ids)
+            if record.metadata.get("embedding_model") == self.provider.name
+            and record.metadata.get("metadata_version") == METADATA_VERSION
+        }
+        return set(node_ids) - current
+
+    def stored_dimensions(self) -> int | None:
+        """Dimensions of the stored vectors, or None when the collection is empty."""
+        sample = self._backend.get(limit=1, include_embeddings=True)
+        return len(sample[0].embedding or []) if sample else None
 
     # -------------------------------------------------------------------------
     # Search Operations
@@ -102,42 +194,84 @@ class EmbeddingStore:
         layer: MemoryLayer | None = None,
         node_type: str | None = None,
         min_score: float = 0.0,
+        symbols: list[str] | None = None,
+        tags: list[str] | None = None,
     ) -> list[tuple[str, float, dict[str, Any]]]:
         """Find nodes semantically similar to the query.
 
+        Every filter runs inside the nearest-neighbour search, so ``limit``
+        matches come back whenever that many nodes pass the filters.
+
         Args:
             query: Text to search for
             limit: Max results to return
             layer: Filter by memory layer
             node_type: Filter by node type
             min_score: Minimum similarity score (0-1)
+            symbols: Restrict candidates to these symbols
+            tags: Tags every match must carry ("facility:dayton-fleet")
 
         Returns:
             List of (node_id, score, metadata) tuples
         """
-        where_filter = self._build_where_filter(layer, node_type)
-
-        results = self._collection.query(
-            query_texts=[query],
-            n_results=limit,
-            where=where_filter if where_filter else None,
-            include=["metadatas", "distances"],
+        return self.find_similar_to_vector(
+            self.provider.embed_one(query), limit, layer, node_type, min_score, symbols, tags
         )
 
-        # Convert results to list of tuples
-        output: list[tuple[str, float, dict[str, Any]]] = []
+    def find_similar_many(
+        self,
+        queries: list[str],
+        limit: int = 10,
+        layer: MemoryLayer | None = None,
+        node_type: str | None = None,
+        min_score: float = 0.0,
+        symbols: list[str] | None = None,
+        tags: list[str] | None = None,
+    ) -> list[list[tuple[str, float, dict[str, Any]]]]:
+        """Find similar nodes for several queries with one batched vector search.
 
-        if results["ids"] and results["ids"][0]:
-            ids = results["ids"][0]
-            distances = results["distances"][0] if results["distances"] else [0] * len(ids)
-            metadatas = results["metadatas"][0] if results["metadatas"] else [{}] * len(ids)
+        Queries are embedded as one batch and share the same filters.
 
-            for node_id, distance, metadata in zip(ids, distances, metadatas, strict=False):
-                # ChromaDB returns L2 distance, convert to similarity score
-                score = 1 / (1 + distance)
-                if score >= min_score:
-                    output.append((node_id, score, metadata))
+        Returns:
+            One list of (node_id, score, metadata) tuples per query, in query order
+        """
+        if not queries:
+            return []
+        vectors = self.provider.embed(queries)
+        return self._search(vectors, limit, layer, node_type, min_score, symbols, tags)
+
+    def find_similar_to_vector(
+        self,
+        vector: list[float],
+        limit: int = 10,
+        layer: MemoryLayer | None = None,
+        node_type: str | None = None,
+        min_score: float = 0.0,
+        symbols: list[str] | None = None,
+        tags: list[str] | None = None,
+    ) -> list[tuple[str, float, dict[str, Any]]]:
+        """Like find_similar, for an already-embedded query."""
+        return self._search([vector], limit, layer, node_type, min_score, symbols, tags)[0]
 
+    def _search(
+        self,
+        vectors: list[list[float]],
+        limit: int,
+        layer: MemoryLayer | None,
+        node_type: str | None,
+        min_score: float,
+        symbols: list[str] | None,
+        tags: list[str] | None = None,
+    ) -> list[list[tuple[str, float, dict[str, Any]]]]:
+        where_filter = self._build_where_filter(layer, node_type, symbols, tags)
+
+        # Backends return squared L2 distance, convert to similarity score
+        output: list[list[tuple[str, float, dict[str, Any]]]] = []
+        for matches in self._backend.query(vectors, limit, where_filter):
+            scored = [
+                (node_id, 1 / (1 + distance), metadata) for node_id, distance, metadata in matches
+            ]
+            output.append([match for match in scored if match[1] >= min_score])
         return output
 
     def find_similar_to_node(
@@ -148,10 +282,10 @@ class EmbeddingStore:
         exclude_self: bool = True,
     ) -> list[tuple[str, float, dict[str, Any]]]:
         """Find nodes similar to an existing node."""
-        query = f"{node.micro}\n{node.summary}"
+        vector = node.embedding or self.embed([node])[0]
         layer = node.layer if same_layer_only else None
 
-        results = self.find_similar(query, limit=limit + 1, layer=layer)
+        results = self.find_similar_to_vector(vector, limit=limit + 1, layer=layer)
 
         # Filter out the node itself if requested
         if exclude_self:
@@ -164,72 +298,100 @@ class EmbeddingStore:
         tags: list[str],
         limit: int = 20,
     ) -> list[tuple[str, dict[str, Any]]]:
-        """Find nodes that have all specified tags."""
-        # Build tag filter
-        tag_filters = [{"tags": {"$contains": tag}} for tag in tags]
-
-        if len(tag_filters) == 1:
-            where_filter = tag_filters[0]
-        else:
-            where_filter = {"$and": tag_filters}
-
-        results = self._collection.get(
-            where=where_filter,
-            limit=limit,
-            include=["metadatas"],
-        )
-
-        output: list[tuple[str, dict[str, Any]]] = []
-        if results["ids"]:
-            ids = results["ids"]
-            metadatas = results["metadatas"] if results["metadatas"] else [{}] * len(ids)
-            for node_id, metadata in zip(ids, metadatas, strict=False):
-                output.append((node_id, metadata))
-
-        return output
+        """Find nodes that have all specified tags (exact matches)."""
+        records = self._backend.get(where=self._build_where_filter(tags=tags), limit=limit)
+        return [(record.id, record.metadata) for record in records]
 
     # -------------------------------------------------------------------------
     # Collection Management
     # -------------------------------------------------------------------------
 
+    def iter_records(self, batch_size: int = 1000) -> Iterator[list[VectorRecord]]:
+        """Page through every stored record, with its embedding."""
+        offset = 0
+        while page := self._backend.get(
+            limit=batch_size, offset=offset, include_embeddings=True
+        ):
+            yield page
+            offset += len(page)
+
+    def iter_embeddings(
+        self, batch_size: int = 1000
+    ) -> Iterator[tuple[list[str], list[list[float]]]]:
+        """Page through every stored (node id, embedding) pair."""
+        for page in self.iter_records(batch_size):
+            yield [r.id for r in page], [r.embedding or [] for r in page]
+
+    def preload(
+        self, ids: list[str], embeddings: list[list[float]], content_hashes: list[str]
+    ) -> None:
+        """Store vectors this store's model computed elsewhere (e.g. in a snapshot).
+
+        Records carry only the model and content hash until their node is
+        upserted; upsert_many then keeps the vector when the node's text
+        still hashes the same, and writes the full metadata.
+        """
+        if not ids:
+            return
+        self._backend.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            metadatas=[
+                {"embedding_model": self.provider.name, "content_hash": content_hash}
+                for content_hash in content_hashes
+            ],
+        )
+
     def count(self) -> int:
         """Get the number of embeddings in the collection."""
-        return self._collection.count()
+        return self._backend.count()
 
     def clear(self) -> None:
         """Clear all embeddings from the collection."""
-        # ChromaDB doesn't have a clear method, so we delete and recreate
-        collection_name = self._collection.name
-        self._client.delete_collection(collection_name)
-        self._collection = self._get_or_create_collection()
+        self._backend.clear()
 
     # -------------------------------------------------------------------------
     # Helpers
     # -------------------------------------------------------------------------
 
     def _node_metadata(self, node: MemoryNode) -> dict[str, Any]:
-        """Extract metadata for ChromaDB storage."""
+        """Extract metadata for vector storage."""
         return {
             "symbol": node.symbol,
             "layer": node.layer.value,
             "node_type": node.node_type,
             "salience": node.salience,
-            "tags": ",".join(node.tags),  # ChromaDB doesn't support list values well
+            "tags": ",".join(node.tags),  # For display; filters use the tag keys
             "created_at": node.timestamp.isoformat(),
+            "embedding_model": self.provider.name,
+            "content_hash": content_hash(embedding_text(node)),
+            "metadata_version": METADATA_VERSION,
+            **{tag_key(tag): True for tag in node.tags},
         }
 
     def _build_where_filter(
         self,
         layer: MemoryLayer | None = None,
         node_type: str | None = None,
+        symbols: list[str] | None = None,
+        tags: list[str] | None = None,
     ) -> dict[str, Any] | None:
-        """Build ChromaDB where filter."""
+        """Build a where filter (ChromaDB dialect, understood by every backend).
+
+        Salience changes in PostgreSQL without re-indexing, so it is filtered
+        when candidates are hydrated. Tags are pushed down but re-checked there
+        too, since the outbox relay applies tag changes asynchronously.
+        """
         filters: list[dict[str, Any]] = []
 
         if layer:
             filters.append({"layer": layer.value})
         if node_type:
             filters.append({"node_type": node_type})
+        if symbols:
+            filters.append({"symbol": {"$in": symbols}})
+        for tag in tags or []:
+            filters.append({tag_key(tag): True})
 
         if not filters:
             return None
@@ -238,6 +400,26 @@ class EmbeddingStore:
         return {"$and": filters}
 
 
+def _drop_removed_tags(record: VectorRecord | None, metadata: dict[str, Any]) -> dict[str, Any]:
+    """Add None for tag keys the record has but the node lost (backends merge metadata)."""
+    if record is None:
+        return metadata
+    removed = {
+        key: None
+        for key in record.metadata
+        if key.startswith(TAG_KEY_PREFIX) and key not in metadata
+    }
+    return {**metadata, **removed}
+
+
+def _same_embedding(stored: dict[str, Any], metadata: dict[str, Any]) -> bool:
+    """Whether a stored vector was embedded from the same text by the same model."""
+    return (
+        stored.get("content_hash") == metadata["content_hash"]
+        and stored.get("embedding_model") == metadata["embedding_model"]
+    )
+
+
 class EmbeddingStoreFactory:
     """Factory for creating EmbeddingStore instances per tenant/team."""
 
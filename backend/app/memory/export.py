@@ -0,0 +1,311 @@
+"""Columnar snapshots of a team's memory (Parquet or Arrow IPC).
+
+Nodes and relationships are read through server-side cursors and written
+one record batch at a time, so memory use stays flat however large the team.
+Embeddings can be included from the vector index, with the model and text
+hash they were computed from. The columns match what ``app.memory.importer``
+reads, so a snapshot directory is also an import source for moving a team
+between environments (vectors of the importing model are reused rather than
+recomputed):
+
+    python -m app.memory.export TENANT_ID TEAM_ID snapshot/ --format parquet --embeddings
+    python -m app.memory.importer TENANT_ID TEAM_ID snapshot/nodes.parquet \\
+        --edges snapshot/relationships.parquet --embeddings snapshot/embeddings.parquet
+
+Requires the optional ``pyarrow`` dependency (``uv sync --extra export``).
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from app.db import MemoryNodeModel, MemoryRelationshipModel, async_session_maker
+from app.memory.embeddings import EmbeddingStoreFactory
+from app.memory.vectors import VectorRecord
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+BATCH_SIZE = 5000
+
+
+class SnapshotFormat(str, Enum):
+    """File format of a snapshot."""
+
+    PARQUET = "parquet"
+    ARROW = "arrow"  # Arrow IPC file; streamable as the IPC stream format
+
+
+class SnapshotTable(str, Enum):
+    """Tables in a snapshot."""
+
+    NODES = "nodes"
+    RELATIONSHIPS = "relationships"
+    EMBEDDINGS = "embeddings"
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError("Memory export needs pyarrow: uv sync --extra export") from e
+    return pyarrow
+
+
+def table_schema(table: SnapshotTable) -> "pa.Schema":
+    """Arrow schema of a snapshot table."""
+    pa = _pyarrow()
+    if table == SnapshotTable.NODES:
+        return pa.schema(
+            [
+                ("id", pa.string()),
+                ("symbol", pa.string()),
+                ("team_id", pa.string()),
+                ("micro", pa.string()),
+                ("summary", pa.string()),
+                ("full", pa.string()),
+                ("tags", pa.list_(pa.string())),
+                ("salience", pa.float64()),
+                ("confidence", pa.float64()),
+                ("timestamp", pa.timestamp("us")),
+                ("updated_at", pa.timestamp("us")),
+            ]
+        )
+    if table == SnapshotTable.RELATIONSHIPS:
+        return pa.schema(
+            [
+                ("source_symbol", pa.string()),
+                ("target_symbol", pa.string()),
+                ("relation_type", pa.string()),
+                ("weight", pa.float64()),
+                ("metadata", pa.string()),  # JSON
+                ("created_at", pa.timestamp("us")),
+            ]
+        )
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("team_id", pa.string()),
+            ("embedding_model", pa.string()),
+            ("content_hash", pa.string()),
+            ("embedding", pa.list_(pa.float32())),
+        ]
+    )
+
+
+@dataclass
+class MemoryExporter:
+    """Streams one team's memory as Arrow record batches.
+
+    Args:
+        tenant_id: Tenant to export
+        team_id: Team to export
+        batch_size: Rows per cursor fetch and record batch
+    """
+
+    tenant_id: UUID
+    team_id: str
+    batch_size: int = BATCH_SIZE
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker
+
+    async def batches(self, table: SnapshotTable) -> AsyncIterator["pa.RecordBatch"]:
+        """Record batches of a snapshot table, fetched with a server-side cursor."""
+        pa = _pyarrow()
+        schema = table_schema(table)
+
+        if table == SnapshotTable.EMBEDDINGS:
+            store = EmbeddingStoreFactory.get_store(self.tenant_id, self.team_id)
+            pages: Iterator[list[VectorRecord]] = store.iter_records(self.batch_size)
+            while page := await asyncio.to_thread(next, pages, None):
+                rows = [_embedding_row(self.team_id, record) for record in page]
+                yield pa.RecordBatch.from_pylist(rows, schema=schema)
+            return
+
+        stmt = self._nodes_stmt() if table == SnapshotTable.NODES else self._relationships_stmt()
+        to_row = _node_row if table == SnapshotTable.NODES else _relationship_row
+        async with self.session_factory() as session:
+            result = await session.stream(stmt.execution_options(yield_per=self.batch_size))
+            async for rows in result.partitions():
+                yield pa.RecordBatch.from_pylist([to_row(row) for row in rows], schema=schema)
+
+    async def write(
+        self,
+        directory: Path,
+        format: SnapshotFormat = SnapshotFormat.PARQUET,
+        include_embeddings: bool = False,
+    ) -> dict[str, int]:
+        """Write every snapshot table to ``directory``.
+
+        Returns:
+            Rows written per table
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        tables = [SnapshotTable.NODES, SnapshotTable.RELATIONSHIPS]
+        if include_embeddings:
+            tables.append(SnapshotTable.EMBEDDINGS)
+
+        counts = {}
+        for table in tables:
+            path = directory / f"{table.value}.{format.value}"
+            counts[table.value] = await self._write_table(table, path, format)
+        return counts
+
+    async def stream(self, table: SnapshotTable) -> AsyncIterator[bytes]:
+        """A snapshot table as Arrow IPC stream bytes, one chunk per batch."""
+        pa = _pyarrow()
+        buffer = io.BytesIO()
+        with pa.ipc.new_stream(buffer, table_schema(table)) as writer:
+            async for batch in self.batches(table):
+                writer.write_batch(batch)
+                yield _drain(buffer)
+        yield _drain(buffer)  # End-of-stream marker
+
+    async def _write_table(self, table: SnapshotTable, path: Path, format: SnapshotFormat) -> int:
+        pa = _pyarrow()
+        schema = table_schema(table)
+        if format == SnapshotFormat.PARQUET:
+            import pyarrow.parquet as pq
+
+            writer = pq.ParquetWriter(path, schema)
+        else:
+            writer = pa.ipc.new_file(path, schema)
+
+        rows = 0
+        with writer:
+            async for batch in self.batches(table):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    def _nodes_stmt(self) -> Select:
+        node = MemoryNodeModel
+        return (
+            select(
+                node.id,
+                node.symbol,
+                node.team_id,
+                node.micro,
+                node.summary,
+                node.full_content,
+                node.tags,
+                node.salience,
+                node.confidence,
+                node.created_at,
+                node.updated_at,
+            )
+            .where(node.tenant_id == self.tenant_id, node.team_id == self.team_id)
+            .order_by(node.symbol)
+        )
+
+    def _relationships_stmt(self) -> Select:
+        """Edges whose source node is in the team, addressed by symbol."""
+        source = aliased(MemoryNodeModel)
+        target = aliased(MemoryNodeModel)
+        rel = MemoryRelationshipModel
+        return (
+            select(
+                source.symbol.label("source_symbol"),
+                target.symbol.label("target_symbol"),
+                rel.relation_type,
+                rel.weight,
+                rel.relation_metadata,
+                rel.created_at,
+            )
+            .join(source, (source.tenant_id == rel.tenant_id) & (source.id == rel.source_id))
+            .join(target, (target.tenant_id == rel.tenant_id) & (target.id == rel.target_id))
+            .where(rel.tenant_id == self.tenant_id, source.team_id == self.team_id)
+            .order_by(source.symbol)
+        )
+
+
+def read_snapshot(path: Path, batch_size: int = BATCH_SIZE) -> Iterator[dict[str, Any]]:
+    """Stream rows of a Parquet or Arrow IPC snapshot file as dicts."""
+    pa = _pyarrow()
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+        return
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield from reader.get_batch(i).to_pylist()
+
+
+def _node_row(row: Any) -> dict[str, Any]:
+    return {
+        "id": str(row.id),
+        "symbol": row.symbol,
+        "team_id": row.team_id,
+        "micro": row.micro,
+        "summary": row.summary,
+        "full": (row.full_content or {}).get("full", ""),
+        "tags": row.tags or [],
+        "salience": row.salience,
+        "confidence": row.confidence,
+        "timestamp": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def _embedding_row(team_id: str, record: VectorRecord) -> dict[str, Any]:
+    return {
+        "id": record.id,
+        "team_id": team_id,
+        "embedding_model": record.metadata.get("embedding_model"),
+        "content_hash": record.metadata.get("content_hash"),
+        "embedding": record.embedding,
+    }
+
+
+def _relationship_row(row: Any) -> dict[str, Any]:
+    return {
+        "source_symbol": row.source_symbol,
+        "target_symbol": row.target_symbol,
+        "relation_type": row.relation_type,
+        "weight": row.weight,
+        "metadata": json.dumps(row.relation_metadata or {}),
+        "created_at": row.created_at,
+    }
+
+
+def _drain(buffer: io.BytesIO) -> bytes:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Export a team's memory snapshot.")
+    parser.add_argument("tenant_id", type=UUID)
+    parser.add_argument("team_id")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument(
+        "--format", type=SnapshotFormat, choices=list(SnapshotFormat), default="parquet"
+    )
+    parser.add_argument("--embeddings", action="store_true", help="Include embeddings")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    exporter = MemoryExporter(args.tenant_id, args.team_id, batch_size=args.batch_size)
+    counts = asyncio.run(exporter.write(args.directory, args.format, args.embeddings))
+    sys.stdout.write(json.dumps(counts) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,549 @@
+"""Bulk import of memory nodes and edges from NDJSON, CSV or snapshots.
+
+The importer streams records in chunks. Each chunk is validated against the
+Pydantic models, COPYed into a session-local staging table and merged into
+``memory_nodes`` with ``INSERT ... ON CONFLICT (tenant_id, symbol)``, so a
+re-run updates rather than duplicates. Edges are loaded after all nodes, from
+the nodes' inline ``relationships`` and an optional edges file, resolving
+symbols to ids in SQL; edges whose endpoints do not exist are skipped.
+
+ChromaDB upserts run in worker threads, chunked and concurrent, overlapping
+the next chunk's database work. With an embeddings table from a snapshot,
+vectors of the configured model are stored first, so nodes whose text is
+unchanged are not re-embedded. After each chunk is both merged and embedded
+the offset is checkpointed, so an interrupted import resumes where it left off.
+When the run finishes, the retrieval cache of every imported team is invalidated.
+
+    python -m app.memory.importer TENANT_ID TEAM_ID nodes.ndjson \\
+        --edges edges.csv --checkpoint import.ckpt.json
+    python -m app.memory.importer TENANT_ID TEAM_ID snapshot/nodes.parquet \\
+        --edges snapshot/relationships.parquet --embeddings snapshot/embeddings.parquet
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import async_session_maker
+from app.memory.cache import RetrievalCache
+from app.memory.embeddings import EmbeddingStoreFactory
+from app.memory.export import read_snapshot
+from app.models.memory import MemoryNode, Relationship
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 100
+
+NODE_COLUMNS = (
+    "id",
+    "tenant_id",
+    "team_id",
+    "symbol",
+    "layer",
+    "node_type",
+    "micro",
+    "summary",
+    "full_content",
+    "tags",
+    "salience",
+    "confidence",
+    "created_at",
+    "updated_at",
+)
+EDGE_COLUMNS = (
+    "source_symbol",
+    "target_symbol",
+    "relation_type",
+    "weight",
+    "relation_metadata",
+    "created_at",
+)
+
+_CREATE_NODE_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS import_nodes
+    (LIKE memory_nodes INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+"""
+_CREATE_EDGE_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS import_edges (
+    source_symbol varchar(500) NOT NULL,
+    target_symbol varchar(500) NOT NULL,
+    relation_type varchar(50) NOT NULL,
+    weight double precision NOT NULL,
+    relation_metadata jsonb NOT NULL,
+    created_at timestamp NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+_MERGE_NODES = f"""
+INSERT INTO memory_nodes AS n ({", ".join(NODE_COLUMNS)})
+SELECT {", ".join(NODE_COLUMNS)} FROM import_nodes
+ON CONFLICT (tenant_id, symbol) DO UPDATE SET
+    team_id = EXCLUDED.team_id,
+    micro = EXCLUDED.micro,
+    summary = EXCLUDED.summary,
+    full_content = EXCLUDED.full_content,
+    tags = EXCLUDED.tags,
+    salience = EXCLUDED.salience,
+    confidence = EXCLUDED.confidence,
+    updated_at = EXCLUDED.updated_at
+RETURNING n.id, n.symbol
+"""
+_MERGE_EDGES = """
+INSERT INTO memory_relationships AS r
+    (id, tenant_id, source_id, target_id, relation_type, weight, relation_metadata, created_at)
+SELECT DISTINCT ON (s.id, t.id, e.relation_type)
+    gen_random_uuid(), CAST(:tenant_id AS uuid), s.id, t.id,
+    e.relation_type, e.weight, e.relation_metadata, e.created_at
+FROM import_edges e
+JOIN memory_nodes s ON s.tenant_id = :tenant_id AND s.symbol = e.source_symbol
+JOIN memory_nodes t ON t.tenant_id = :tenant_id AND t.symbol = e.target_symbol
+ON CONFLICT (tenant_id, source_id, target_id, relation_type) DO UPDATE SET
+    weight = EXCLUDED.weight,
+    relation_metadata = EXCLUDED.relation_metadata
+"""
+
+
+@dataclass
+class ImportStats:
+    """Counts and throughput of an import run."""
+
+    nodes: int = 0
+    edges: int = 0
+    embeddings: int = 0  # Snapshot vectors stored instead of recomputed
+    skipped_edges: int = 0  # Endpoint symbol not found
+    invalid: int = 0
+    elapsed_s: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.nodes + self.edges) / self.elapsed_s if self.elapsed_s else 0.0
+
+
+@dataclass
+class ImportCheckpoint:
+    """Resume point of an import: the phase and records already done in it."""
+
+    phase: str = "embeddings"  # embeddings -> nodes -> edges -> done
+    offset: int = 0
+    stats: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path | None) -> "ImportCheckpoint":
+        if path is None or not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path | None) -> None:
+        if path is None:
+            return
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)), encoding="utf-8")
+        tmp.replace(path)
+
+
+def read_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream records from an NDJSON, CSV or snapshot (Parquet/Arrow) file.
+
+    CSV ``tags`` are ``;``-separated and ``metadata``/``relationships`` hold
+    JSON; empty cells are omitted so model defaults apply. Snapshot files are
+    the ones app.memory.export writes.
+    """
+    if path.suffix.lower() in (".parquet", ".arrow"):
+        for record in read_snapshot(path):
+            if isinstance(record.get("metadata"), str):
+                record["metadata"] = json.loads(record["metadata"])
+            yield record
+        return
+
+    with path.open(encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                record: dict[str, Any] = {k: v for k, v in row.items() if v not in ("", None)}
+                if "tags" in record:
+                    record["tags"] = [t for t in record["tags"].split(";") if t]
+                for key in ("metadata", "relationships"):
+                    if key in record:
+                        record[key] = json.loads(record[key])
+                yield record
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _chunks(records: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+@dataclass
+class MemoryImporter:
+    """Streaming bulk loader for one tenant's memory.
+
+    Args:
+        tenant_id: Tenant the records are imported into
+        team_id: Team for records that do not name one
+        chunk_size: Records per COPY/merge transaction
+        embed_batch_size: Nodes per ChromaDB upsert
+        embed_concurrency: Embedding upserts in flight at once
+        checkpoint_path: Where to keep the resume point (None disables resuming)
+        embed: Whether to upsert embeddings at all
+    """
+
+    tenant_id: UUID
+    team_id: str
+    chunk_size: int = 1000
+    embed_batch_size: int = 256
+    embed_concurrency: int = 4
+    checkpoint_path: Path | None = None
+    embed: bool = True
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker
+    _teams: set[str] = field(default_factory=set, init=False, repr=False)
+
+    async def run(
+        self,
+        nodes_path: Path,
+        edges_path: Path | None = None,
+        embeddings_path: Path | None = None,
+    ) -> ImportStats:
+        """Import snapshot embeddings, nodes, then edges, resuming from the checkpoint."""
+        checkpoint = ImportCheckpoint.load(self.checkpoint_path)
+        stats = ImportStats(**checkpoint.stats)
+        start = time.perf_counter() - stats.elapsed_s
+
+        if checkpoint.phase == "embeddings":
+            if embeddings_path is not None and self.embed:
+                await self._import_embeddings(embeddings_path, checkpoint, stats, start)
+            checkpoint.phase, checkpoint.offset = "nodes", 0
+            checkpoint.save(self.checkpoint_path)
+        if checkpoint.phase == "nodes":
+            await self._import_nodes(nodes_path, checkpoint, stats, start)
+            checkpoint.phase, checkpoint.offset = "edges", 0
+            checkpoint.save(self.checkpoint_path)
+        if checkpoint.phase == "edges":
+            await self._import_edges(nodes_path, edges_path, checkpoint, stats, start)
+            checkpoint.phase, checkpoint.offset = "done", 0
+        await self._invalidate_caches()
+
+        stats.elapsed_s = time.perf_counter() - start
+        checkpoint.stats = asdict(stats)
+        checkpoint.save(self.checkpoint_path)
+        logger.info(
+            "Import done: %d nodes (%d snapshot embeddings), %d edges (%d skipped), "
+            "%d invalid in %.1fs (%.0f rows/s)",
+            stats.nodes, stats.embeddings, stats.edges, stats.skipped_edges, stats.invalid,
+            stats.elapsed_s, stats.rows_per_second,
+        )
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Snapshot Embeddings
+    # -------------------------------------------------------------------------
+
+    async def _import_embeddings(
+        self,
+        path: Path,
+        checkpoint: ImportCheckpoint,
+        stats: ImportStats,
+        start: float,
+    ) -> None:
+        """Store snapshot vectors computed by the configured model, per team collection.
+
+        Vectors of any other model are skipped; their nodes are embedded as usual.
+        """
+        offset = checkpoint.offset
+        records = islice(read_snapshot(path, self.embed_batch_size), offset, None)
+        for chunk in _chunks(records, self.embed_batch_size):
+            offset += len(chunk)
+            by_team: dict[str, list[dict[str, Any]]] = {}
+            for record in chunk:
+                by_team.setdefault(record.get("team_id") or self.team_id, []).append(record)
+            for team_id, team_records in by_team.items():
+                store = EmbeddingStoreFactory.get_store(self.tenant_id, team_id)
+                usable = [
+                    r for r in team_records
+                    if r.get("embedding_model") == store.provider.name
+                    and r.get("content_hash") and r.get("embedding")
+                ]
+                await asyncio.to_thread(
+                    store.preload,
+                    [r["id"] for r in usable],
+                    [r["embedding"] for r in usable],
+                    [r["content_hash"] for r in usable],
+                )
+                stats.embeddings += len(usable)
+            self._advance(checkpoint, offset, stats, start)
+
+    # -------------------------------------------------------------------------
+    # Nodes
+    # -------------------------------------------------------------------------
+
+    async def _import_nodes(
+        self,
+        path: Path,
+        checkpoint: ImportCheckpoint,
+        stats: ImportStats,
+        start: float,
+    ) -> None:
+        records = islice(read_records(path), checkpoint.offset, None)
+        offset = checkpoint.offset
+        # (end offset, embedding task) in chunk order; the checkpoint only
+        # advances past chunks that are both merged and embedded
+        pending: deque[tuple[int, asyncio.Task[None]]] = deque()
+
+        for chunk in _chunks(records, self.chunk_size):
+            nodes = self._validate_nodes(chunk, offset, stats)
+            offset += len(chunk)
+            merged = await self._merge_nodes(nodes) if nodes else []
+            stats.nodes += len(merged)
+            self._teams.update(node.team_id for node in merged)
+            # Records whose symbol already existed under another id: drop any
+            # snapshot vector stored under the record's id
+            kept = {node.id for node in merged}
+            superseded = [node for node in nodes if node.id not in kept]
+
+            task = asyncio.create_task(self._embed(merged, superseded))
+            pending.append((offset, task))
+            while pending and (pending[0][1].done() or len(pending) > self.embed_concurrency):
+                done_offset, done = pending.popleft()
+                await done
+                self._advance(checkpoint, done_offset, stats, start)
+
+        while pending:
+            done_offset, done = pending.popleft()
+            await done
+            self._advance(checkpoint, done_offset, stats, start)
+
+    def _validate_nodes(
+        self,
+        chunk: list[dict[str, Any]],
+        offset: int,
+        stats: ImportStats,
+    ) -> list[MemoryNode]:
+        by_symbol: dict[str, MemoryNode] = {}  # Last record wins within a chunk
+        for i, record in enumerate(chunk):
+            record = {"team_id": self.team_id, **record, "tenant_id": str(self.tenant_id)}
+            try:
+                node = MemoryNode.model_validate(record)
+            except ValidationError as e:
+                self._reject(stats, "nodes", offset + i, e)
+                continue
+            by_symbol[node.symbol] = node
+        return list(by_symbol.values())
+
+    async def _merge_nodes(self, nodes: list[MemoryNode]) -> list[MemoryNode]:
+        """COPY a chunk into staging and merge it; returns nodes with stored ids.
+
+        A symbol that already exists keeps its id, so embeddings are upserted
+        under the stored id rather than the one generated for the record.
+        """
+        rows = [
+            (
+                node.id,
+                self.tenant_id,
+                node.team_id,
+                node.symbol,
+                node.layer.value,
+                node.node_type,
+                node.micro,
+                node.summary,
+                json.dumps({"full": node.full}),
+                node.tags,
+                node.salience,
+                node.confidence,
+                node.timestamp,
+                node.updated_at,
+            )
+            for node in nodes
+        ]
+        async with self.session_factory() as session, session.begin():
+            await session.execute(text(_CREATE_NODE_STAGING))
+            await _copy(session, "import_nodes", NODE_COLUMNS, rows)
+            result = await session.execute(text(_MERGE_NODES))
+            stored_ids = {symbol: node_id for node_id, symbol in result.all()}
+
+        return [
+            node.model_copy(update={"id": stored_ids[node.symbol]})
+            for node in nodes
+            if node.symbol in stored_ids
+        ]
+
+    async def _embed(
+        self, nodes: list[MemoryNode], superseded: list[MemoryNode] | None = None
+    ) -> None:
+        """Upsert embeddings in batches, per team collection, in worker threads."""
+        if not self.embed:
+            return
+        by_team: dict[str, list[MemoryNode]] = {}
+        for node in nodes:
+            by_team.setdefault(node.team_id, []).append(node)
+        stale: dict[str, list[UUID]] = {}
+        for node in superseded or []:
+            stale.setdefault(node.team_id, []).append(node.id)
+
+        batches = [
+            (EmbeddingStoreFactory.get_store(self.tenant_id, team_id), batch)
+            for team_id, team_nodes in by_team.items()
+            for batch in _chunks(team_nodes, self.embed_batch_size)
+        ]
+        await asyncio.gather(
+            *(asyncio.to_thread(store.upsert_many, batch) for store, batch in batches),
+            *(
+                asyncio.to_thread(
+                    EmbeddingStoreFactory.get_store(self.tenant_id, team_id).delete_many, ids
+                )
+                for team_id, ids in stale.items()
+            ),
+        )
+
+    async def _invalidate_caches(self) -> None:
+        """Bump the retrieval cache generation of every team this import wrote.
+
+        The default team is always included: a resumed run does not know which
+        teams the interrupted one wrote.
+        """
+        for team_id in sorted(self._teams | {self.team_id}):
+            await RetrievalCache.from_settings(self.tenant_id, team_id).bump()
+
+    # -------------------------------------------------------------------------
+    # Edges
+    # -------------------------------------------------------------------------
+
+    async def _import_edges(
+        self,
+        nodes_path: Path,
+        edges_path: Path | None,
+        checkpoint: ImportCheckpoint,
+        stats: ImportStats,
+        start: float,
+    ) -> None:
+        records = islice(self._edge_records(nodes_path, edges_path), checkpoint.offset, None)
+        offset = checkpoint.offset
+
+        for chunk in _chunks(records, self.chunk_size):
+            edges = []
+            for i, record in enumerate(chunk):
+                try:
+                    edges.append(Relationship.model_validate(record))
+                except ValidationError as e:
+                    self._reject(stats, "edges", offset + i, e)
+            offset += len(chunk)
+
+            if edges:
+                merged = await self._merge_edges(edges)
+                stats.edges += merged
+                stats.skipped_edges += len(edges) - merged
+            self._advance(checkpoint, offset, stats, start)
+
+    def _edge_records(self, nodes_path: Path, edges_path: Path | None) -> Iterator[dict[str, Any]]:
+        """Inline relationships of the node records, then the edges file."""
+        for record in read_records(nodes_path):
+            for rel in record.get("relationships") or []:
+                yield {"source_symbol": record.get("symbol"), **rel}
+        if edges_path is not None:
+            yield from read_records(edges_path)
+
+    async def _merge_edges(self, edges: list[Relationship]) -> int:
+        """COPY a chunk of edges into staging and merge; returns rows written."""
+        rows = [
+            (
+                edge.source_symbol,
+                edge.target_symbol,
+                edge.relation_type.value,
+                edge.weight,
+                json.dumps(edge.metadata),
+                edge.created_at,
+            )
+            for edge in edges
+        ]
+        async with self.session_factory() as session, session.begin():
+            await session.execute(text(_CREATE_EDGE_STAGING))
+            await _copy(session, "import_edges", EDGE_COLUMNS, rows)
+            result = await session.execute(text(_MERGE_EDGES), {"tenant_id": self.tenant_id})
+            return result.rowcount
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def _advance(
+        self,
+        checkpoint: ImportCheckpoint,
+        offset: int,
+        stats: ImportStats,
+        start: float,
+    ) -> None:
+        stats.elapsed_s = time.perf_counter() - start
+        checkpoint.offset = offset
+        checkpoint.stats = asdict(stats)
+        checkpoint.save(self.checkpoint_path)
+        logger.info(
+            "Imported %s to offset %d: %d nodes, %d edges (%.0f rows/s)",
+            checkpoint.phase, offset, stats.nodes, stats.edges, stats.rows_per_second,
+        )
+
+    @staticmethod
+    def _reject(stats: ImportStats, phase: str, offset: int, error: ValidationError) -> None:
+        stats.invalid += 1
+        if len(stats.errors) < MAX_REPORTED_ERRORS:
+            stats.errors.append(f"{phase}[{offset}]: {error.errors()[0]['msg']}")
+
+
+async def _copy(
+    session: AsyncSession,
+    table: str,
+    columns: tuple[str, ...],
+    rows: list[tuple[Any, ...]],
+) -> None:
+    """COPY rows into a table over the session's own asyncpg connection."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(table, records=rows, columns=columns)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import memory nodes and edges.")
+    parser.add_argument("tenant_id", type=UUID)
+    parser.add_argument("team_id", help="Team for records that do not name one")
+    parser.add_argument("nodes", type=Path, help="Nodes file (.ndjson or .csv)")
+    parser.add_argument("--edges", type=Path, help="Edges file (.ndjson or .csv)")
+    parser.add_argument(
+        "--embeddings", type=Path, help="Snapshot embeddings table to reuse instead of re-embedding"
+    )
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file for resuming")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--embed-concurrency", type=int, default=4)
+    parser.add_argument("--no-embed", action="store_true", help="Skip ChromaDB upserts")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    importer = MemoryImporter(
+        tenant_id=args.tenant_id,
+        team_id=args.team_id,
+        chunk_size=args.chunk_size,
+        embed_concurrency=args.embed_concurrency,
+        checkpoint_path=args.checkpoint,
+        embed=not args.no_embed,
+    )
+    stats = asyncio.run(importer.run(args.nodes, args.edges, args.embeddings))
+    for error in stats.errors:
+        logger.warning(error)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""Apply memory outbox events to the vector index, and reconcile the two stores.
+
+MemoryStorage records an ``upsert`` or ``delete`` event in ``memory_outbox``
+in the same transaction as every node change, so the vector index only ever
+hears about committed changes. The relay claims events in id order with
+``FOR UPDATE SKIP LOCKED`` (several relays can run side by side), groups them
+per team collection and applies each group, in its own savepoint, as one
+batched upsert plus one delete. Upserts embed the node as it is in Postgres at apply time and turn
+into deletes when the node is gone, so replays and out-of-order events
+converge on the current state. A failed group is retried with exponential
+backoff; after ``max_attempts`` its events stay in the table for inspection
+and the reconciler repairs the drift.
+
+    python -m app.memory.outbox relay
+    python -m app.memory.outbox reconcile TENANT_ID TEAM_ID --repair
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db import MemoryNodeModel, MemoryOutboxModel, async_session_maker
+from app.memory.cache import RetrievalCache
+from app.memory.embeddings import EmbeddingStore, EmbeddingStoreFactory
+from app.memory.storage import MemoryStorage, NodeFilter
+from app.models.memory import MemoryResolution
+
+logger = logging.getLogger(__name__)
+
+# Retry delay is backoff_s * 2**attempts, capped
+MAX_BACKOFF_S = 600.0
+
+
+@dataclass
+class RelayStats:
+    """Counts of one relay pass."""
+
+    claimed: int = 0
+    upserted: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
+@dataclass
+class OutboxRelay:
+    """Drains memory_outbox into the vector index.
+
+    Args:
+        batch_size: Events claimed per transaction
+        max_attempts: Failures after which an event is no longer retried
+        backoff_s: Base retry delay
+        poll_interval_s: Sleep between passes when the outbox is drained
+    """
+
+    batch_size: int = 256
+    max_attempts: int = 10
+    backoff_s: float = 1.0
+    poll_interval_s: float = 1.0
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Relay until ``stop`` is set; passes run back to back while events remain."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                stats = await self.run_once()
+            except Exception:
+                logger.exception("Outbox relay pass failed")
+                stats = RelayStats()
+            if stats.claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval_s)
+                except TimeoutError:
+                    pass
+
+    async def run_once(self) -> RelayStats:
+        """Claim one batch of due events, apply it and commit."""
+        stats = RelayStats()
+        async with self.session_factory() as session:
+            events = await self._claim(session)
+            stats.claimed = len(events)
+
+            groups: dict[tuple[UUID, str], list[MemoryOutboxModel]] = defaultdict(list)
+            for event in events:
+                groups[(event.tenant_id, event.team_id)].append(event)
+
+            done: list[int] = []
+            for (tenant_id, team_id), group in groups.items():
+                try:
+                    # A failed statement must not abort the claim or the other groups
+                    async with session.begin_nested():
+                        upserted, deleted = await self._apply(session, tenant_id, team_id, group)
+                except Exception as e:
+                    logger.warning(
+                        "Vector sync failed for %s/%s (%d events): %s",
+                        tenant_id, team_id, len(group), e,
+                    )
+                    await self._retry_later(session, group, e)
+                    stats.failed += len(group)
+                    continue
+                done.extend(event.id for event in group)
+                stats.upserted += upserted
+                stats.deleted += deleted
+
+            if done:
+                await session.execute(
+                    delete(MemoryOutboxModel).where(MemoryOutboxModel.id.in_(done))
+                )
+            await session.commit()
+        return stats
+
+    async def _claim(self, session: AsyncSession) -> list[MemoryOutboxModel]:
+        stmt = (
+            select(MemoryOutboxModel)
+            .where(
+                MemoryOutboxModel.available_at <= datetime.utcnow(),
+                MemoryOutboxModel.attempts < self.max_attempts,
+            )
+            .order_by(MemoryOutboxModel.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return list((await session.scalars(stmt)).all())
+
+    async def _apply(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        team_id: str,
+        events: list[MemoryOutboxModel],
+    ) -> tuple[int, int]:
+        """Bring one team collection in line with Postgres for the events' nodes."""
+        node_ids = list(dict.fromkeys(event.node_id for event in events))
+        nodes = await MemoryStorage(session, tenant_id).find(
+            NodeFilter(team_id=team_id, ids=node_ids),
+            resolution=MemoryResolution.SUMMARY,
+            limit=None,
+        )
+        present = {node.id for node in nodes}
+        gone = [node_id for node_id in node_ids if node_id not in present]
+
+        store = EmbeddingStoreFactory.get_store(tenant_id, team_id)
+        await asyncio.to_thread(store.upsert_many, nodes)
+        await asyncio.to_thread(store.delete_many, gone)
+        # Rankings cached before the index changed are now stale
+        await RetrievalCache.from_settings(tenant_id, team_id).bump()
+        return len(nodes), len(gone)
+
+    async def _retry_later(
+        self, session: AsyncSession, events: list[MemoryOutboxModel], error: Exception
+    ) -> None:
+        attempts = max(event.attempts for event in events) + 1
+        delay = min(self.backoff_s * 2**attempts, MAX_BACKOFF_S)
+        if attempts >= self.max_attempts:
+            logger.error("Giving up on %d outbox events after %d attempts", len(events), attempts)
+        await session.execute(
+            update(MemoryOutboxModel)
+            .where(MemoryOutboxModel.id.in_([event.id for event in events]))
+            .values(
+                attempts=MemoryOutboxModel.attempts + 1,
+                last_error=repr(error)[:2000],
+                available_at=datetime.utcnow() + timedelta(seconds=delay),
+            )
+        )
+
+
+def relay_from_settings() -> OutboxRelay:
+    """Relay configured by the OUTBOX_* settings."""
+    settings = get_settings()
+    return OutboxRelay(
+        batch_size=settings.outbox_batch_size,
+        max_attempts=settings.outbox_max_attempts,
+        poll_interval_s=settings.outbox_poll_interval_s,
+    )
+
+
+# =============================================================================
+# Reconciliation
+# =============================================================================
+
+
+@dataclass
+class ReconcileStats:
+    """Id diff between Postgres and the vector index for one team."""
+
+    nodes: int = 0
+    vectors: int = 0
+    missing: int = 0  # In Postgres, no vector
+    orphaned: int = 0  # Vector without a node
+    repaired: bool = False
+    elapsed_s: float = 0.0
+
+
+@dataclass
+class Reconciler:
+    """Diffs a team's node ids against its vector collection.
+
+    With ``repair``, missing and orphaned ids are written to the outbox, so
+    the relay fixes them with its usual batching and retries.
+
+    Args:
+        tenant_id: Tenant to check
+        team_id: Team to check
+        batch_size: Ids read per page from either store
+    """
+
+    tenant_id: UUID
+    team_id: str
+    batch_size: int = 5000
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker
+
+    async def run(self, repair: bool = False) -> ReconcileStats:
+        start = time.perf_counter()
+        store = EmbeddingStoreFactory.get_store(self.tenant_id, self.team_id)
+        vector_ids = await asyncio.to_thread(self._vector_ids, store)
+        node_ids = await self._node_ids()
+
+        missing = node_ids - vector_ids
+        orphaned = vector_ids - node_ids
+        stats = ReconcileStats(
+            nodes=len(node_ids),
+            vectors=len(vector_ids),
+            missing=len(missing),
+            orphaned=len(orphaned),
+        )
+
+        if repair and (missing or orphaned):
+            async with self.session_factory() as session:
+                storage = MemoryStorage(session, self.tenant_id)
+                await storage.enqueue_vector_sync(self.team_id, _uuids(missing), "upsert")
+                await storage.enqueue_vector_sync(self.team_id, _uuids(orphaned), "delete")
+                await session.commit()
+            stats.repaired = True
+
+        stats.elapsed_s = time.perf_counter() - start
+        return stats
+
+    def _vector_ids(self, store: EmbeddingStore) -> set[str]:
+        return {node_id for ids, _ in store.iter_embeddings(self.batch_size) for node_id in ids}
+
+    async def _node_ids(self) -> set[str]:
+        node = MemoryNodeModel
+        stmt = select(node.id).where(
+            node.tenant_id == self.tenant_id, node.team_id == self.team_id
+        )
+        async with self.session_factory() as session:
+            result = await session.stream_scalars(
+                stmt.execution_options(yield_per=self.batch_size)
+            )
+            return {str(node_id) async for node_id in result}
+
+
+def _uuids(node_ids: set[str]) -> list[UUID]:
+    return [UUID(node_id) for node_id in sorted(node_ids)]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Vector index outbox relay and reconciliation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("relay", help="Apply outbox events until interrupted")
+    reconcile = commands.add_parser("reconcile", help="Diff node ids against vector ids")
+    reconcile.add_argument("tenant_id", type=UUID)
+    reconcile.add_argument("team_id")
+    reconcile.add_argument("--repair", action="store_true", help="Enqueue fixes for the relay")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "relay":
+        asyncio.run(relay_from_settings().run())
+        return
+    stats = asyncio.run(Reconciler(args.tenant_id, args.team_id).run(repair=args.repair))
+    sys.stdout.write(json.dumps(asdict(stats)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Precedent matching: similar past events with their outcomes, in one call.
+
+Similar events come from the vector index (filters applied inside the
+search). One batched hop along their outgoing edges then loads what each
+case led to (``CAUSED``/``RESOLVED``), the policies applied (``APPLIES``)
+and the entities involved (``INVOLVES``). Outcomes and factors are read from
+structured tags (``outcome:denied``, ``factor:prior_violation``) on the case
+and its outcome nodes, and aggregated into a ``PrecedentContext``.
+
+Results are cached in process per team and query-embedding bucket: queries
+whose normalised embeddings round to the same grid point share an entry, so
+rephrasings that embed identically skip both searches. Keys include the
+team's retrieval cache generation, so memory writes invalidate them; when the
+generation is unknown (cache disabled, Redis unreachable) nothing is cached.
+"""
+
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.memory.cache import RetrievalCache
+from app.memory.embeddings import EmbeddingStoreFactory
+from app.memory.storage import MemoryStorage, NodeFilter
+from app.models.memory import (
+    MemoryLayer,
+    MemoryNode,
+    MemoryResolution,
+    PrecedentContext,
+    RelationType,
+    SimilarCase,
+)
+
+OUTCOME_RELATIONS = (RelationType.CAUSED, RelationType.RESOLVED)
+HOP_RELATIONS = [*OUTCOME_RELATIONS, RelationType.APPLIES, RelationType.INVOLVES]
+
+# Grid step of the normalised query embedding for cache keys (1 / BUCKET_SCALE)
+BUCKET_SCALE = 50
+
+
+def embedding_bucket(vector: list[float]) -> bytes:
+    """Cache key of a query embedding: the normalised vector rounded to a grid."""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array)) or 1.0
+    return np.round(array / norm * BUCKET_SCALE).astype(np.int8).tobytes()
+
+
+class PrecedentCache:
+    """Bounded LRU of precedent contexts with a time-to-live."""
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[Hashable, tuple[float, PrecedentContext]] = OrderedDict()
+
+    def get(self, key: Hashable) -> PrecedentContext | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, context = entry
+        if time.monotonic() - stored_at > self.ttl_s:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return context.model_copy(deep=True)
+
+    def put(self, key: Hashable, context: PrecedentContext) -> None:
+        self._entries[key] = (time.monotonic(), context.model_copy(deep=True))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache = PrecedentCache()
+
+
+@dataclass
+class PrecedentEngine:
+    """Builds decision-ready precedent context for one team.
+
+    Args:
+        session: Database session
+        tenant_id: Tenant to search
+        team_id: Team to search
+        candidates: Similar events fetched before hydration filters
+        cache: Result cache (process-wide by default)
+    """
+
+    session: AsyncSession
+    tenant_id: UUID
+    team_id: str
+    candidates: int = 20
+    cache: PrecedentCache = _cache
+
+    def __post_init__(self) -> None:
+        self._storage = MemoryStorage(self.session, self.tenant_id)
+        self._embeddings = EmbeddingStoreFactory.get_store(self.tenant_id, self.team_id)
+
+    async def build(
+        self,
+        description: str,
+        node_type: str | None = None,
+        tags: list[str] | None = None,
+        limit: int = 5,
+    ) -> PrecedentContext:
+        """Similar past events with outcomes, policies and entities.
+
+        Args:
+            description: Description of the current case
+            node_type: Event type to match (e.g., "finding", "decision")
+            tags: Scope tags every case must carry, e.g. ["facility:dayton-fleet"]
+            limit: Max similar cases
+
+        Returns:
+            PrecedentContext with cases in similarity order
+        """
+        tags = sorted(tags or [])
+        vector = await asyncio.to_thread(self._embeddings.provider.embed_one, description)
+        generation = await RetrievalCache.from_settings(self.tenant_id, self.team_id).generation()
+        # Without a known generation, writes cannot invalidate entries: skip the cache
+        key: Hashable | None = None
+        if generation is not None:
+            key = (
+                self.tenant_id,
+                self.team_id,
+                generation,
+                node_type,
+                tuple(tags),
+                limit,
+                embedding_bucket(vector),
+            )
+            if (cached := self.cache.get(key)) is not None:
+                return cached
+
+        matches = await asyncio.to_thread(
+            self._embeddings.find_similar_to_vector,
+            vector,
+            limit=self.candidates,
+            layer=MemoryLayer.EVENT,
+            node_type=node_type,
+            tags=tags,
+        )
+        scores = {UUID(node_id): score for node_id, score, _ in matches}
+        cases: list[MemoryNode] = []
+        if scores:
+            filters = NodeFilter(
+                team_id=self.team_id, ids=list(scores), layer=MemoryLayer.EVENT, tags=tags
+            )
+            found = await self._storage.find(
+                filters, resolution=MemoryResolution.SUMMARY, limit=None
+            )
+            cases = sorted(found, key=lambda n: scores[n.id], reverse=True)[:limit]
+
+        edges = await self._storage.get_related_many([n.id for n in cases], HOP_RELATIONS)
+        context = summarize(cases, scores, edges)
+        if key is not None:
+            self.cache.put(key, context)
+        return context
+
+
+def summarize(
+    cases: list[MemoryNode],
+    scores: dict[UUID, float],
+    edges: list[tuple[UUID, RelationType, MemoryNode]],
+) -> PrecedentContext:
+    """Aggregate cases and their one-hop neighbours into a PrecedentContext."""
+    outcomes: dict[UUID, list[MemoryNode]] = {}
+    policies: Counter[str] = Counter()
+    entities: Counter[str] = Counter()
+    for source_id, relation, target in edges:
+        if relation in OUTCOME_RELATIONS:
+            outcomes.setdefault(source_id, []).append(target)
+        elif relation == RelationType.APPLIES:
+            policies[target.symbol] += 1
+        else:
+            entities[target.symbol] += 1
+
+    similar: list[SimilarCase] = []
+    distribution: Counter[str] = Counter()
+    factors: Counter[str] = Counter()
+    for case in cases:
+        results = outcomes.get(case.id, [])
+        outcome = next(
+            (o for n in [*results, case] if (o := n.get_tag("outcome"))),
+            results[0].node_type if results else "unknown",
+        )
+        case_factors = list(
+            dict.fromkeys(
+                tag.split(":", 1)[1]
+                for n in [case, *results]
+                for tag in n.tags
+                if tag.startswith("factor:")
+            )
+        )
+        similar.append(
+            SimilarCase(
+                symbol=case.symbol,
+                similarity_score=round(scores[case.id], 4),
+                outcome=outcome,
+                reason=(results[0].summary or results[0].micro) if results else case.micro,
+                key_factors=case_factors,
+            )
+        )
+        distribution[outcome] += scores[case.id]
+        factors.update(case_factors)
+
+    total = sum(distribution.values()) or 1.0
+    shares = {outcome: round(weight / total, 3) for outcome, weight in distribution.most_common()}
+    key_factors = [factor for factor, _ in factors.most_common(10)]
+    return PrecedentContext(
+        similar_cases=similar,
+        applicable_policies=[symbol for symbol, _ in policies.most_common()],
+        entity_history=[symbol for symbol, _ in entities.most_common()],
+        pattern_summary=_pattern_summary(len(similar), shares, key_factors),
+        outcome_distribution=shares,
+        key_factors=key_factors,
+    )
+
+
+def _pattern_summary(count: int, shares: dict[str, float], factors: list[str]) -> str:
+    if not count:
+        return "No similar cases found."
+    outcomes = ", ".join(f"{outcome} {share:.0%}" for outcome, share in shares.items())
+    summary = f"{count} similar case{'s' if count != 1 else ''}: {outcomes}."
+    if factors:
+        summary += f" Common factors: {', '.join(factors[:5])}."
+    return summary
@@ -1,21 +1,32 @@
 """Query patterns for memory retrieval combining PostgreSQL and ChromaDB."""
 
+import asyncio
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.memory.embeddings import EmbeddingStore
-from app.memory.storage import MemoryStorage
+from app.db.pagination import decode_cursor, encode_cursor
+from app.memory.cache import RetrievalCache
+from app.memory.embeddings import EmbeddingStore, EmbeddingStoreFactory
+from app.memory.storage import MemoryStorage, NodeFilter, Prefetch
 from app.models.memory import (
+    RESOLUTION_BY_INTENT,
     MemoryLayer,
     MemoryNode,
     MemoryQueryResult,
     MemoryResolution,
+    PrefetchRule,
+    QueryIntent,
     RelationType,
 )
+from app.uniq import condition_tags
+
+# Candidate multiplier for semantic queries that are filtered again in Postgres
+SEMANTIC_OVERFETCH = 4
 
 
 @dataclass
@@ -29,6 +40,8 @@ class MemoryQueryBuilder:
     # Query parameters
     _pattern: str | None = None
     _text_query: str | None = None
+    _text_queries: list[str] | None = None
+    _text_search: str | None = None
     _symbols: list[str] | None = None
     _layer: MemoryLayer | None = None
     _node_type: str | None = None
@@ -39,8 +52,14 @@ class MemoryQueryBuilder:
     _relation_types: list[RelationType] | None = None
     _max_depth: int = 1
     _resolution: MemoryResolution = MemoryResolution.SUMMARY
+    _intent: QueryIntent | None = None
+    _prefetch: list[PrefetchRule] = field(default_factory=list)
     _limit: int = 10
     _offset: int = 0
+    _with_total: bool = False
+    _approximate_total: bool = False
+    _cursor: str | None = None
+    _newest_first: bool = False
 
     # Internal
     _storage: MemoryStorage | None = None
@@ -49,7 +68,7 @@ class MemoryQueryBuilder:
     def __post_init__(self) -> None:
         self._storage = MemoryStorage(self.session, self.tenant_id)
         if self.team_id:
-            self._embeddings = EmbeddingStore(self.tenant_id, self.team_id)
+            self._embeddings = EmbeddingStoreFactory.get_store(self.tenant_id, self.team_id)
 
     # -------------------------------------------------------------------------
     # Fluent API
@@ -65,6 +84,16 @@ class MemoryQueryBuilder:
         self._text_query = query
         return self
 
+    def semantic_many(self, *queries: str) -> "MemoryQueryBuilder":
+        """Set several semantic queries sharing the other filters (see execute_many)."""
+        self._text_queries = list(queries)
+        return self
+
+    def text(self, query: str) -> "MemoryQueryBuilder":
+        """Filter by keyword match ("phrases", prefix*, -excluded); see text_tsquery."""
+        self._text_search = query
+        return self
+
     def symbols(self, *symbols: str) -> "MemoryQueryBuilder":
         """Set exact symbols to retrieve."""
         self._symbols = list(symbols)
@@ -117,6 +146,24 @@ class MemoryQueryBuilder:
         self._resolution = res
         return self
 
+    def intent(self, intent: QueryIntent) -> "MemoryQueryBuilder":
+        """Set the query intent, which picks the base resolution (route -> micro)."""
+        self._intent = QueryIntent(intent)
+        self._resolution = RESOLUTION_BY_INTENT[self._intent]
+        return self
+
+    def prefetch(
+        self,
+        condition: str,
+        resolution: MemoryResolution = MemoryResolution.SUMMARY,
+    ) -> "MemoryQueryBuilder":
+        """Load nodes matching condition at a higher resolution in the same query.
+
+        Condition is a UNI-Q symbol ("⊘" blocked, "⚑" flagged) or a literal tag.
+        """
+        self._prefetch.append(PrefetchRule(condition=condition, resolution=resolution))
+        return self
+
     def limit(self, n: int) -> "MemoryQueryBuilder":
         """Set result limit."""
         self._limit = n
@@ -127,38 +174,130 @@ class MemoryQueryBuilder:
         self._offset = n
         return self
 
+    def newest_first(self) -> "MemoryQueryBuilder":
+        """Order filter-only results by creation time, newest first.
+
+        Pages ordered this way carry a next_cursor (see after()). Salience
+        changes on every read, so salience-ordered pages cannot be keyed.
+        """
+        self._newest_first = True
+        return self
+
+    def after(self, cursor: str | None) -> "MemoryQueryBuilder":
+        """Continue from a next_cursor returned by a previous page (keyset).
+
+        Cursors key on (created_at, id), so continued pages are newest first.
+        """
+        self._cursor = cursor
+        if cursor:
+            self._newest_first = True
+        return self
+
+    def with_total(self, enabled: bool = True, approximate: bool = False) -> "MemoryQueryBuilder":
+        """Report the unpaged match count in total_count.
+
+        Exact totals ride along the page as count(*) OVER(); approximate ones
+        come from the planner's row estimate and skip counting entirely.
+        """
+        self._with_total = enabled
+        self._approximate_total = approximate
+        return self
+
     # -------------------------------------------------------------------------
     # Execution
     # -------------------------------------------------------------------------
 
     async def execute(self) -> MemoryQueryResult:
-        """Execute the query and return results."""
+        """Execute the query and return results.
+
+        Every filter that is set applies. Traversal and semantic search find
+        candidates first; all other filters then run as one SQL statement
+        over those candidates. Newest-first filter-only queries page by keyset
+        cursor (see after()); everything else pages by offset.
+        """
         start_time = time.time()
-        nodes: list[MemoryNode] = []
+        total: int | None = None
+        next_cursor: str | None = None
 
-        # Route to appropriate query method
-        if self._symbols:
-            nodes = await self._execute_symbol_lookup()
-        elif self._traverse_from:
-            nodes = await self._execute_traversal()
+        if self._cursor and (self._traverse_from or self._text_query):
+            raise ValueError("Cursor pagination is not supported for traversal or semantic queries")
+
+        if self._traverse_from:
+            nodes, total = await self._execute_traversal()
         elif self._text_query:
-            nodes = await self._execute_semantic_search()
-        elif self._pattern:
-            nodes = await self._execute_pattern_search()
-        elif self._tags:
-            nodes = await self._execute_tag_search()
-        elif self._layer:
-            nodes = await self._execute_layer_search()
+            nodes, total = await self._execute_semantic_search()
+        else:
+            nodes, total = await self._execute_filter_query()
+            if self._newest_first and len(nodes) == self._limit:
+                next_cursor = encode_cursor(nodes[-1].timestamp, nodes[-1].id)
 
+        highlights = await self._highlights(nodes)
         elapsed_ms = int((time.time() - start_time) * 1000)
 
         return MemoryQueryResult(
             nodes=nodes,
-            total_count=len(nodes),
+            total_count=total if self._with_total and total is not None else len(nodes),
+            total_is_estimate=self._with_total and self._approximate_total,
+            next_cursor=next_cursor,
             query_time_ms=elapsed_ms,
             resolution_used=self._resolution,
+            intent=self._intent,
+            prefetched=self._prefetched_symbols(nodes),
+            highlights=highlights,
         )
 
+    async def execute_many(self) -> list[MemoryQueryResult]:
+        """Execute a semantic_many query, one result per query in query order.
+
+        All queries go to the vector index as one batch and the candidates of
+        every query are filtered and hydrated by one Postgres query, so cost
+        grows with the number of distinct candidates rather than queries.
+        Each result is paged by limit/offset as in execute().
+        """
+        if self._text_queries is None:
+            raise ValueError("execute_many requires semantic_many()")
+        if self._traverse_from or self._cursor:
+            raise ValueError("Batched semantic queries do not support traversal or cursors")
+
+        start_time = time.time()
+        ranked_lists = await self._semantic_candidates_many(self._text_queries)
+        candidates = list(dict.fromkeys(nid for ranked in ranked_lists for nid in ranked))
+
+        by_id: dict[str, MemoryNode] = {}
+        if candidates:
+            filters = self._filters()
+            filters.ids = [UUID(nid) for nid in candidates]
+            nodes = await self._storage.find(
+                filters,
+                resolution=self._resolution,
+                prefetch=self._prefetch_rules(),
+                limit=None,
+            )
+            by_id = {str(n.id): n for n in nodes}
+
+        pages: list[tuple[list[MemoryNode], int]] = []
+        for ranked in ranked_lists:
+            survivors = [by_id[nid] for nid in ranked if nid in by_id]
+            pages.append((survivors[self._offset:self._offset + self._limit], len(survivors)))
+
+        # Boost salience once for every node returned to any query
+        returned = {n.symbol for page, _ in pages for n in page}
+        if returned:
+            await self._storage.boost_salience_many(sorted(returned))
+
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        return [
+            MemoryQueryResult(
+                nodes=page,
+                total_count=total if self._with_total else len(page),
+                query_time_ms=elapsed_ms,
+                resolution_used=self._resolution,
+                intent=self._intent,
+                prefetched=self._prefetched_symbols(page),
+            )
+            for page, total in pages
+        ]
+
     async def first(self) -> MemoryNode | None:
         """Execute and return the first result."""
         self._limit = 1
@@ -171,85 +310,238 @@ class MemoryQueryBuilder:
         return result.nodes
 
     async def count(self) -> int:
-        """Execute and return count only."""
-        result = await self.execute()
-        return result.total_count
+        """Count every match with SELECT count(*), ignoring limit and offset.
+
+        No node payloads are loaded. A similarity search has no fixed match
+        set, so for semantic queries the count is a lower bound: the
+        survivors among the (offset + limit) nearest candidates, times
+        SEMANTIC_OVERFETCH when filters apply after the vector search. It
+        never exceeds that window. Traversal and filter counts are exact.
+        """
+        filters = await self._candidate_filters()
+        if filters is None:
+            return 0
+        return await self._storage.count(filters)
+
+    async def exists(self) -> bool:
+        """Check for any match with SELECT EXISTS (semantic: within the count() window)."""
+        filters = await self._candidate_filters()
+        if filters is None:
+            return False
+        return await self._storage.exists(filters)
 
     # -------------------------------------------------------------------------
-    # Query Execution Methods
+    # Prefetch
     # -------------------------------------------------------------------------
 
-    async def _execute_symbol_lookup(self) -> list[MemoryNode]:
-        """Look up nodes by exact symbols."""
-        return await self._storage.get_many_by_symbols(
-            self._symbols, resolution=self._resolution
-        )
+    def _prefetch_rules(self) -> Prefetch | None:
+        """Resolve prefetch conditions to the tags storage matches on."""
+        if not self._prefetch:
+            return None
+        return [(condition_tags(rule.condition), rule.resolution) for rule in self._prefetch]
 
-    async def _execute_traversal(self) -> list[MemoryNode]:
-        """Execute graph traversal."""
-        return await self._storage.traverse(
-            self._traverse_from,
-            self._relation_types or list(RelationType),
-            max_depth=self._max_depth,
-            resolution=self._resolution,
-        )
-
-    async def _execute_semantic_search(self) -> list[MemoryNode]:
-        """Execute semantic similarity search."""
-        if not self._embeddings:
+    def _prefetched_symbols(self, nodes: list[MemoryNode]) -> list[str]:
+        """Symbols that came back above the base resolution."""
+        if not self._prefetch:
             return []
+        if self._resolution == MemoryResolution.MICRO:
+            return [n.symbol for n in nodes if n.summary or n.full]
+        if self._resolution == MemoryResolution.SUMMARY:
+            return [n.symbol for n in nodes if n.full]
+        return []
 
-        # Search ChromaDB for similar embeddings
-        results = self._embeddings.find_similar(
-            query=self._text_query,
-            limit=self._limit,
+    # -------------------------------------------------------------------------
+    # Query Planning
+    # -------------------------------------------------------------------------
+
+    def _filters(self) -> NodeFilter:
+        """Compile the builder's filters for MemoryStorage.find."""
+        return NodeFilter(
+            team_id=self.team_id,
+            symbols=self._symbols,
+            pattern=self._pattern,
             layer=self._layer,
             node_type=self._node_type,
+            tags=list(self._tags),
+            time_range=self._time_range,
+            min_salience=self._min_salience,
+            text=self._text_search,
         )
 
-        if not results:
-            return []
+    def _needs_post_filter(self) -> bool:
+        """Whether candidates from Chroma can still be rejected by Postgres.
 
-        # Get full nodes from PostgreSQL
-        node_ids = [UUID(nid) for nid, _, _ in results]
-        nodes = []
-        for node_id in node_ids:
-            node = await self._storage.get_by_id(node_id)
-            if node:
-                # Boost salience since node was accessed
-                await self._storage.boost_salience(node.symbol)
-                nodes.append(node)
-
-        return nodes
-
-    async def _execute_pattern_search(self) -> list[MemoryNode]:
-        """Execute symbol pattern search."""
-        return await self._storage.find_by_pattern(
-            self._pattern,
-            team_id=self.team_id,
-            limit=self._limit,
-            resolution=self._resolution,
+        Tags are filtered inside the vector search, so they need no over-fetch.
+        """
+        return bool(
+            self._pattern
+            or self._time_range
+            or self._min_salience is not None
+            or self._text_search
         )
 
-    async def _execute_tag_search(self) -> list[MemoryNode]:
-        """Execute tag-based search."""
-        return await self._storage.find_by_tags(
-            self._tags,
-            team_id=self.team_id,
-            layer=self._layer,
-            limit=self._limit,
+    async def _highlights(self, nodes: list[MemoryNode]) -> dict[str, str]:
+        """Headlines of a text() query for the returned page (not at MICRO)."""
+        if not self._text_search or not nodes or self._resolution == MemoryResolution.MICRO:
+            return {}
+        headlines = await self._storage.headlines(self._text_search, [n.id for n in nodes])
+        return {n.symbol: headlines[n.id] for n in nodes if headlines.get(n.id)}
+
+    async def _candidate_filters(self) -> NodeFilter | None:
+        """Filters narrowed to traversal or semantic candidates (None if none)."""
+        filters = self._filters()
+        if self._traverse_from:
+            symbols = await self._traversal_candidates()
+            if not symbols:
+                return None
+            filters.symbols = symbols
+        elif self._text_query:
+            ids = await self._semantic_candidates()
+            if not ids:
+                return None
+            filters.ids = [UUID(nid) for nid in ids]
+        return filters
+
+    async def _hydrate(
+        self,
+        filters: NodeFilter,
+        ranked: list[str],
+        rank_key: Callable[[MemoryNode], str],
+    ) -> tuple[list[MemoryNode], int]:
+        """Load and filter candidates in one query, keeping candidate order.
+
+        Args:
+            filters: Builder filters narrowed to the candidates
+            ranked: Candidate keys in rank order
+            rank_key: Key of a loaded node within ranked
+
+        Returns:
+            The requested page of surviving candidates, and how many survived
+        """
+        nodes = await self._storage.find(
+            filters,
             resolution=self._resolution,
+            prefetch=self._prefetch_rules(),
+            limit=None,
         )
+        rank = {key: i for i, key in enumerate(ranked)}
+        nodes.sort(key=lambda n: rank[rank_key(n)])
+        return nodes[self._offset:self._offset + self._limit], len(nodes)
 
-    async def _execute_layer_search(self) -> list[MemoryNode]:
-        """Execute layer-based search."""
-        return await self._storage.find_by_layer(
-            self._layer,
-            team_id=self.team_id,
+    # -------------------------------------------------------------------------
+    # Query Execution Methods
+    # -------------------------------------------------------------------------
+
+    async def _execute_filter_query(self) -> tuple[list[MemoryNode], int | None]:
+        """Run the compiled filters as one statement, by keyset or offset."""
+        filters = self._filters()
+        after = decode_cursor(self._cursor, datetime, UUID) if self._cursor else None
+        kwargs = {
+            "resolution": self._resolution,
+            "prefetch": self._prefetch_rules(),
+            "limit": self._limit,
+            "offset": 0 if after else self._offset,
+            "after": after,
+            "newest_first": self._newest_first,
+        }
+
+        if self._with_total and not self._approximate_total:
+            return await self._storage.find_with_total(filters, **kwargs)
+
+        nodes = await self._storage.find(filters, **kwargs)
+        total = await self._storage.estimate_count(filters) if self._with_total else None
+        return nodes, total
+
+    async def _traversal_candidates(self) -> list[str]:
+        """Symbols reached by the graph walk, in walk order."""
+        walked = await self._storage.traverse(
+            self._traverse_from,
+            self._relation_types or list(RelationType),
+            max_depth=self._max_depth,
+            resolution=MemoryResolution.MICRO,
+        )
+        symbols = [n.symbol for n in walked]
+        if self._symbols is not None:
+            wanted = set(self._symbols)
+            symbols = [s for s in symbols if s in wanted]
+        return symbols
+
+    async def _semantic_candidates(self) -> list[str]:
+        """Node ids from the vector index in similarity order.
+
+        Layer, type, symbol and tag filters are pushed into the index's where
+        clause. When other filters remain, the index is over-fetched so enough
+        candidates survive filtering in Postgres.
+        """
+        return (await self._semantic_candidates_many([self._text_query]))[0]
+
+    async def _semantic_candidates_many(self, queries: list[str]) -> list[list[str]]:
+        """Node ids per query, from the retrieval cache or one batched vector search.
+
+        Only the ids are cached; hydration re-applies every filter, so the
+        resolution is not part of the key.
+        """
+        if not self._embeddings:
+            return [[] for _ in queries]
+
+        fetch = self._offset + self._limit
+        if self._needs_post_filter():
+            fetch *= SEMANTIC_OVERFETCH
+
+        cache = RetrievalCache.from_settings(self.tenant_id, self.team_id)
+        search = {
+            "fetch": fetch,
+            "layer": self._layer,
+            "node_type": self._node_type,
+            "symbols": sorted(self._symbols) if self._symbols is not None else None,
+            "tags": sorted(self._tags),
+        }
+        generation, cached = await cache.get_many(queries, search)
+        misses = [query for query, ids in zip(queries, cached, strict=True) if ids is None]
+        if not misses:
+            return [ids for ids in cached if ids is not None]
+
+        results = await asyncio.to_thread(
+            self._embeddings.find_similar_many,
+            misses,
+            limit=fetch,
+            layer=self._layer,
             node_type=self._node_type,
-            limit=self._limit,
-            resolution=self._resolution,
+            symbols=self._symbols,
+            tags=self._tags,
         )
+        fresh = [[nid for nid, _, _ in matches] for matches in results]
+        if generation is not None:
+            await cache.put_many(generation, misses, search, fresh)
+        computed = iter(fresh)
+        return [ids if ids is not None else next(computed) for ids in cached]
+
+    async def _execute_traversal(self) -> tuple[list[MemoryNode], int]:
+        """Walk the graph, then apply the remaining filters to the walked nodes."""
+        symbols = await self._traversal_candidates()
+        if not symbols:
+            return [], 0
+
+        filters = self._filters()
+        filters.symbols = symbols
+        return await self._hydrate(filters, symbols, lambda n: n.symbol)
+
+    async def _execute_semantic_search(self) -> tuple[list[MemoryNode], int]:
+        """Execute semantic similarity search.
+
+        Candidates are filtered and hydrated by a single Postgres query.
+        """
+        ranked = await self._semantic_candidates()
+        if not ranked:
+            return [], 0
+
+        filters = self._filters()
+        filters.ids = [UUID(nid) for nid in ranked]
+        nodes, total = await self._hydrate(filters, ranked, lambda n: str(n.id))
+
+        # Boost salience since nodes were accessed
+        await self._storage.boost_salience_many([n.symbol for n in nodes])
+        return nodes, total
 
 
 # =============================================================================
@@ -263,24 +555,57 @@ async def find_precedents(
     team_id: str,
     finding_description: str,
     limit: int = 5,
+    facility: str | None = None,
 ) -> list[MemoryNode]:
     """Find similar past findings for precedent matching.
 
-    Used by Inspector Assistant to suggest relevant past cases.
+    Used by Inspector Assistant to suggest relevant past cases. With
+    ``facility`` ("dayton-fleet"), only findings tagged with that facility
+    are searched.
     """
     query = MemoryQueryBuilder(session, tenant_id, team_id)
-    result = await (
+    query = (
         query
         .semantic(finding_description)
         .layer(MemoryLayer.EVENT)
         .type("finding")
         .resolution(MemoryResolution.SUMMARY)
         .limit(limit)
-        .execute()
     )
+    if facility:
+        query = query.tag("facility", facility)
+    result = await query.execute()
     return result.nodes
 
 
+async def find_precedents_many(
+    session: AsyncSession,
+    tenant_id: UUID,
+    team_id: str,
+    finding_descriptions: list[str],
+    limit: int = 5,
+    facility: str | None = None,
+) -> list[list[MemoryNode]]:
+    """Find precedents for several findings at once, in finding order.
+
+    One vector search and one hydration for the whole inspection, instead of
+    one find_precedents call per finding.
+    """
+    query = MemoryQueryBuilder(session, tenant_id, team_id)
+    query = (
+        query
+        .semantic_many(*finding_descriptions)
+        .layer(MemoryLayer.EVENT)
+        .type("finding")
+        .resolution(MemoryResolution.SUMMARY)
+        .limit(limit)
+    )
+    if facility:
+        query = query.tag("facility", facility)
+    results = await query.execute_many()
+    return [result.nodes for result in results]
+
+
 async def get_facility_context(
     session: AsyncSession,
     tenant_id: UUID,
@@ -0,0 +1,146 @@
+"""Re-embed a team's memory after the embedding model changes.
+
+Nodes are read from PostgreSQL in id order and re-embedded in batches with
+the configured provider. Every vector's metadata names the model that
+produced it, so nodes already embedded by the current model are skipped and
+an interrupted run simply picks up where it stopped when started again.
+Records written with an older metadata layout (e.g. before per-tag keys)
+only have their metadata rewritten. A model with different dimensions
+cannot share a collection with the old vectors; the collection is cleared
+first in that case.
+
+    EMBEDDING_MODEL=minilm python -m app.memory.reembed TENANT_ID TEAM_ID
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import MemoryNodeModel, async_session_maker
+from app.memory.embeddings import EmbeddingStore, EmbeddingStoreFactory
+from app.models.memory import MemoryNode
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReembedStats:
+    """Counts and throughput of a re-embed run."""
+
+    scanned: int = 0
+    embedded: int = 0
+    cleared: bool = False
+    elapsed_s: float = 0.0
+
+
+@dataclass
+class Reembedder:
+    """Brings one team's vectors up to the configured embedding model.
+
+    Args:
+        tenant_id: Tenant to re-embed
+        team_id: Team to re-embed
+        batch_size: Nodes read and embedded per batch
+    """
+
+    tenant_id: UUID
+    team_id: str
+    batch_size: int = 256
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker
+
+    async def run(self) -> ReembedStats:
+        store = EmbeddingStoreFactory.get_store(self.tenant_id, self.team_id)
+        stats = ReembedStats()
+        start = time.perf_counter()
+
+        dimensions = await asyncio.to_thread(store.stored_dimensions)
+        if dimensions is not None and dimensions != store.provider.dimensions:
+            logger.info(
+                "Clearing %s: %d-dimension vectors, %s produces %d",
+                store.collection_name, dimensions, store.provider.name, store.provider.dimensions,
+            )
+            await asyncio.to_thread(store.clear)
+            stats.cleared = True
+
+        after: UUID | None = None
+        while nodes := await self._next_batch(after):
+            after = nodes[-1].id
+            stats.scanned += len(nodes)
+            embedded = await asyncio.to_thread(self._reembed, store, nodes)
+            stats.embedded += embedded
+            logger.info("Scanned %d nodes, re-embedded %d", stats.scanned, stats.embedded)
+
+        stats.elapsed_s = time.perf_counter() - start
+        return stats
+
+    def _reembed(self, store: EmbeddingStore, nodes: list[MemoryNode]) -> int:
+        stale = store.stale_ids([str(n.id) for n in nodes])
+        pending = [n for n in nodes if str(n.id) in stale]
+        store.upsert_many(pending)
+        return len(pending)
+
+    async def _next_batch(self, after: UUID | None) -> list[MemoryNode]:
+        node = MemoryNodeModel
+        stmt = (
+            select(
+                node.id,
+                node.symbol,
+                node.micro,
+                node.summary,
+                node.tags,
+                node.salience,
+                node.confidence,
+                node.created_at,
+                node.updated_at,
+            )
+            .where(node.tenant_id == self.tenant_id, node.team_id == self.team_id)
+            .order_by(node.id)
+            .limit(self.batch_size)
+        )
+        if after is not None:
+            stmt = stmt.where(node.id > after)
+
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+        return [
+            MemoryNode(
+                id=row.id,
+                symbol=row.symbol,
+                tenant_id=str(self.tenant_id),
+                team_id=self.team_id,
+                micro=row.micro,
+                summary=row.summary,
+                full="",
+                tags=row.tags or [],
+                salience=row.salience,
+                confidence=row.confidence,
+                timestamp=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-embed a team's memory with the current model.")
+    parser.add_argument("tenant_id", type=UUID)
+    parser.add_argument("team_id")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    reembedder = Reembedder(args.tenant_id, args.team_id, batch_size=args.batch_size)
+    stats = asyncio.run(reembedder.run())
+    sys.stdout.write(json.dumps(asdict(stats)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
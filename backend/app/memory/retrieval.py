@@ -0,0 +1,157 @@
+"""Hybrid retrieval: full-text and vector candidates, fused and re-scored.
+
+Embeddings miss exact identifiers ("§ 9-101", permit numbers) and full-text
+search misses paraphrases, so both candidate sets are computed concurrently:
+Postgres ranks matches of the node's ``search_vector`` while the vector index
+runs in a worker thread. The two rankings are combined with reciprocal rank
+fusion and the fused score is blended with salience, confidence and recency
+according to the team's ``RankingWeights``.
+"""
+
+import asyncio
+import math
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.memory.embeddings import EmbeddingStoreFactory
+from app.memory.storage import MemoryStorage, NodeFilter
+from app.models.memory import (
+    MemoryLayer,
+    MemoryNode,
+    MemoryResolution,
+    RankingWeights,
+    RetrievalHit,
+)
+
+# Candidates fetched from each source before fusion
+CANDIDATES = 50
+
+
+def reciprocal_rank_fusion(
+    rankings: list[tuple[list[Hashable], float]],
+    k: int = 60,
+) -> dict[Hashable, float]:
+    """Fuse ranked lists: each contributes ``weight / (k + rank)`` per key (rank from 1)."""
+    scores: dict[Hashable, float] = {}
+    for ranked, weight in rankings:
+        for rank, key in enumerate(ranked, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return scores
+
+
+@dataclass
+class HybridRetriever:
+    """Fused lexical + vector search over one team's memory.
+
+    Args:
+        session: Database session
+        tenant_id: Tenant to search
+        team_id: Team to search
+        weights: Fusion and re-scoring weights (per team)
+        candidates: Candidates fetched from each source
+    """
+
+    session: AsyncSession
+    tenant_id: UUID
+    team_id: str
+    weights: RankingWeights = field(default_factory=RankingWeights)
+    candidates: int = CANDIDATES
+
+    def __post_init__(self) -> None:
+        self._storage = MemoryStorage(self.session, self.tenant_id)
+        self._embeddings = EmbeddingStoreFactory.get_store(self.tenant_id, self.team_id)
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        layer: MemoryLayer | None = None,
+        node_type: str | None = None,
+        tags: list[str] | None = None,
+        resolution: MemoryResolution = MemoryResolution.SUMMARY,
+    ) -> list[RetrievalHit]:
+        """Search with both retrievers and return the best ``limit`` hits.
+
+        Args:
+            query: Search text; "phrases", prefix* and -exclusions apply lexically
+            limit: Max hits to return
+            layer: Filter by memory layer
+            node_type: Filter by node type
+            tags: Tags every hit must carry
+            resolution: Content resolution of the returned nodes
+
+        Returns:
+            Hits ordered by final score, highest first
+        """
+        filters = NodeFilter(
+            team_id=self.team_id, layer=layer, node_type=node_type, tags=list(tags or [])
+        )
+        lexical, vector = await asyncio.gather(
+            self._lexical_candidates(query, filters),
+            asyncio.to_thread(self._vector_candidates, query, filters),
+        )
+
+        weights = self.weights
+        fused = reciprocal_rank_fusion(
+            [(lexical, weights.lexical), (vector, weights.vector)], k=weights.rrf_k
+        )
+        if not fused:
+            return []
+
+        # Hydration re-applies every filter (tag changes reach the index asynchronously)
+        filters.ids = [UUID(str(key)) for key in fused]
+        nodes = await self._storage.find(filters, resolution=resolution, limit=None)
+
+        best = (weights.lexical + weights.vector) / (weights.rrf_k + 1) or 1.0
+        lexical_rank = {key: rank for rank, key in enumerate(lexical, start=1)}
+        vector_rank = {key: rank for rank, key in enumerate(vector, start=1)}
+        now = datetime.utcnow()
+        hits = [
+            RetrievalHit(
+                node=node,
+                score=self._score(node, fused[str(node.id)] / best, now),
+                lexical_rank=lexical_rank.get(str(node.id)),
+                vector_rank=vector_rank.get(str(node.id)),
+            )
+            for node in nodes
+        ]
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        hits = hits[:limit]
+
+        # Boost salience since nodes were accessed
+        await self._storage.boost_salience_many([hit.node.symbol for hit in hits])
+        return hits
+
+    def _score(self, node: MemoryNode, relevance: float, now: datetime) -> float:
+        """Blend normalised fused relevance (0-1) with the node's quality signals."""
+        w = self.weights
+        age_days = max((now - node.timestamp).total_seconds(), 0.0) / 86400
+        recency = math.pow(0.5, age_days / w.recency_half_life_days)
+        return (
+            w.relevance * relevance
+            + w.salience * node.salience
+            + w.confidence * node.confidence
+            + w.recency * recency
+        )
+
+    async def _lexical_candidates(self, query: str, filters: NodeFilter) -> list[str]:
+        if not self.weights.lexical:
+            return []
+        ranked = await self._storage.rank_text(query, filters, limit=self.candidates)
+        return [str(node_id) for node_id, _ in ranked]
+
+    def _vector_candidates(self, query: str, filters: NodeFilter) -> list[str]:
+        if not self.weights.vector:
+            return []
+        matches = self._embeddings.find_similar(
+            query,
+            limit=self.candidates,
+            layer=filters.layer,
+            node_type=filters.node_type,
+            tags=filters.tags,
+        )
+        return [node_id for node_id, _, _ in matches]
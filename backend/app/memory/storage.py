@@ -1,13 +1,31 @@
 """PostgreSQL storage for memory nodes."""
 
+import re
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import MemoryNodeModel, MemoryRelationshipModel
+from app.db.models import MemoryNodeModel, MemoryOutboxModel, MemoryRelationshipModel
+from app.db.pagination import approximate_count, keyset_after
+from app.memory.cache import bump_after_commit
 from app.models.memory import (
     MemoryLayer,
     MemoryNode,
@@ -16,9 +34,145 @@ from app.models.memory import (
     RelationType,
 )
 
+# Prefetch rules as (tags, resolution): rows carrying any of the tags are
+# projected at that resolution instead of the query's base resolution.
+Prefetch = list[tuple[list[str], MemoryResolution]]
+
+_RESOLUTION_RANK = {
+    MemoryResolution.MICRO: 0,
+    MemoryResolution.SUMMARY: 1,
+    MemoryResolution.FULL: 2,
+}
+
+# Columns every projected read returns; summary and full are added per query
+_NODE_COLUMNS = (
+    MemoryNodeModel.id,
+    MemoryNodeModel.symbol,
+    MemoryNodeModel.tenant_id,
+    MemoryNodeModel.team_id,
+    MemoryNodeModel.micro,
+    MemoryNodeModel.tags,
+    MemoryNodeModel.salience,
+    MemoryNodeModel.confidence,
+    MemoryNodeModel.created_at,
+    MemoryNodeModel.updated_at,
+)
+
+
+def glob_to_like(pattern: str) -> str:
+    """Translate a symbol glob to a LIKE pattern.
+
+    Literal ``%``, ``_`` and ``\\`` are escaped (backslash is PostgreSQL's
+    default LIKE escape) so the fixed prefix before the first wildcard stays
+    intact for the symbol prefix index.
+    """
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+def symbol_pattern_clauses(pattern: str) -> list[ColumnElement[bool]]:
+    """Index-backed WHERE clauses for a symbol glob.
+
+    Patterns with a literal prefix (``event.finding.*``) use the
+    text_pattern_ops prefix index; leading or middle wildcards
+    (``*.finding.*``, ``event.*.dayton*``) use the trigram index, which needs
+    a literal run of three or more characters. A literal first segment is
+    the node's layer, so it is also matched against the layer column to
+    narrow short patterns like ``event.*.a*`` through the layer index.
+    """
+    clauses = [MemoryNodeModel.symbol.like(glob_to_like(pattern))]
+    head, dot, _ = pattern.partition(".")
+    if dot and head in {layer.value for layer in MemoryLayer}:
+        clauses.append(MemoryNodeModel.layer == head)
+    return clauses
+
+
+# "quoted phrase" | word (each optionally negated with a leading -)
+_TEXT_TERM = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+_PREFIX_LEXEME = re.compile(r"[^\w.-]")
+
+# ts_headline over the indexed text; only the returned page is highlighted
+_HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=25, MinWords=8, FragmentDelimiter=\" … \""
+# Every string in full_content, as jsonb_to_tsvector(..., '["string"]') indexes them (007)
+_JSON_STRINGS = """'strict $.** ? (@.type() == "string")'::jsonpath"""
+
+
+def text_tsquery(query: str) -> ColumnElement | None:
+    """Compile a keyword query against search_vector to a tsquery.
+
+    Terms are AND-ed. ``"quoted phrases"`` must match in order, ``word*``
+    matches by prefix (``BP-2024*``) and a leading ``-`` excludes a term.
+    Returns None for a query without terms.
+    """
+    terms: list[ColumnElement] = []
+    for match in _TEXT_TERM.finditer(query):
+        if match.group(2) is not None:
+            negate, term = match.group(1), func.phraseto_tsquery("english", match.group(2))
+        else:
+            negate, word = match.group(3), match.group(4)
+            lexeme = _PREFIX_LEXEME.sub("", word[:-1]) if word.endswith("*") else ""
+            if lexeme:
+                term = func.to_tsquery("english", f"'{lexeme}':*")
+            else:
+                term = func.plainto_tsquery("english", word)
+        terms.append(func.tsquery_not(term) if negate else term)
+
+    if not terms:
+        return None
+    tsquery = terms[0]
+    for term in terms[1:]:
+        tsquery = func.tsquery_and(tsquery, term)
+    return tsquery
+
+
+@dataclass
+class NodeFilter:
+    """Node filters compiled into a single WHERE clause by MemoryStorage.find."""
+
+    team_id: str | None = None
+    ids: list[UUID] | None = None
+    symbols: list[str] | None = None
+    pattern: str | None = None  # Glob-style: event.finding.*
+    layer: MemoryLayer | None = None
+    node_type: str | None = None
+    tags: list[str] = field(default_factory=list)  # All must match
+    time_range: tuple[datetime, datetime] | None = None
+    min_salience: float | None = None
+    text: str | None = None  # Keyword query, see text_tsquery
+
+    def clauses(self) -> list[ColumnElement[bool]]:
+        """WHERE clauses for every filter that is set."""
+        clauses: list[ColumnElement[bool]] = []
+        if self.team_id:
+            clauses.append(MemoryNodeModel.team_id == self.team_id)
+        if self.ids is not None:
+            clauses.append(MemoryNodeModel.id.in_(self.ids))
+        if self.symbols is not None:
+            clauses.append(MemoryNodeModel.symbol.in_(self.symbols))
+        if self.pattern:
+            clauses.extend(symbol_pattern_clauses(self.pattern))
+        if self.layer:
+            clauses.append(MemoryNodeModel.layer == MemoryLayer(self.layer).value)
+        if self.node_type:
+            clauses.append(MemoryNodeModel.node_type == self.node_type)
+        if self.tags:
+            clauses.append(MemoryNodeModel.tags.contains(self.tags))
+        if self.time_range:
+            start, end = self.time_range
+            clauses.append(MemoryNodeModel.created_at.between(start, end))
+        if self.min_salience is not None:
+            clauses.append(MemoryNodeModel.salience >= self.min_salience)
+        if self.text and (tsquery := text_tsquery(self.text)) is not None:
+            clauses.append(MemoryNodeModel.search_vector.op("@@")(tsquery))
+        return clauses
+
 
 class MemoryStorage:
-    """Async PostgreSQL storage for memory nodes."""
+    """Async PostgreSQL storage for memory nodes.
+
+    Node writes also record outbox events in the same transaction; the
+    vector index follows once app.memory.outbox.OutboxRelay applies them.
+    """
 
     def __init__(self, session: AsyncSession, tenant_id: UUID):
         self.session = session
@@ -53,6 +207,7 @@ class MemoryStorage:
         for rel in node.relationships:
             await self._create_relationship(node.id, rel)
 
+        await self._enqueue_vector_sync("upsert", [node])
         return node
 
     async def get_by_symbol(self, symbol: str, team_id: str | None = None) -> MemoryNode | None:
@@ -103,6 +258,7 @@ class MemoryStorage:
             )
         )
         await self.session.execute(stmt)
+        await self._enqueue_vector_sync("upsert", [node])
         return node
 
     async def delete(self, symbol: str) -> bool:
@@ -115,10 +271,11 @@ class MemoryStorage:
         # Delete relationships
         await self.session.execute(
             delete(MemoryRelationshipModel).where(
+                MemoryRelationshipModel.tenant_id == self.tenant_id,
                 or_(
                     MemoryRelationshipModel.source_id == node.id,
                     MemoryRelationshipModel.target_id == node.id,
-                )
+                ),
             )
         )
 
@@ -130,7 +287,10 @@ class MemoryStorage:
             )
         )
         result = await self.session.execute(stmt)
-        return result.rowcount > 0
+        if result.rowcount == 0:
+            return False
+        await self._enqueue_vector_sync("delete", [node])
+        return True
 
     # -------------------------------------------------------------------------
     # Bulk Operations
@@ -165,28 +325,148 @@ class MemoryStorage:
             for rel in node.relationships:
                 await self._create_relationship(node.id, rel)
 
+        await self._enqueue_vector_sync("upsert", nodes)
         return nodes
 
     async def get_many_by_symbols(
         self,
         symbols: list[str],
         resolution: MemoryResolution = MemoryResolution.SUMMARY,
+        prefetch: Prefetch | None = None,
     ) -> list[MemoryNode]:
         """Get multiple nodes by symbols."""
-        stmt = select(MemoryNodeModel).where(
-            and_(
-                MemoryNodeModel.tenant_id == self.tenant_id,
-                MemoryNodeModel.symbol.in_(symbols),
-            )
+        return await self.find(
+            NodeFilter(symbols=symbols), resolution=resolution, prefetch=prefetch, limit=None
         )
-        result = await self.session.execute(stmt)
-        db_nodes = result.scalars().all()
-        return [self._to_pydantic(n, resolution) for n in db_nodes]
 
     # -------------------------------------------------------------------------
     # Query Methods
     # -------------------------------------------------------------------------
 
+    async def find(
+        self,
+        filters: NodeFilter,
+        resolution: MemoryResolution = MemoryResolution.SUMMARY,
+        prefetch: Prefetch | None = None,
+        limit: int | None = 20,
+        offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
+        newest_first: bool = False,
+    ) -> list[MemoryNode]:
+        """Find nodes matching every set filter in one statement.
+
+        Results are ordered by (salience, id) descending, or by (created_at,
+        id) descending with ``newest_first``. ``after`` is the (created_at, id)
+        of the last row of the previous page (keyset pagination) and implies
+        ``newest_first``: salience changes on every read, so it cannot key a
+        cursor. A limit of None returns every match, for hydrating known
+        ids/symbols.
+        """
+        stmt = self._find_stmt(
+            filters, resolution, prefetch, limit, offset, after, newest_first
+        )
+        result = await self.session.execute(stmt)
+        return [self._row_to_pydantic(row) for row in result.all()]
+
+    async def find_with_total(
+        self,
+        filters: NodeFilter,
+        resolution: MemoryResolution = MemoryResolution.SUMMARY,
+        prefetch: Prefetch | None = None,
+        limit: int | None = 20,
+        offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
+        newest_first: bool = False,
+    ) -> tuple[list[MemoryNode], int]:
+        """Like find, plus the unpaged match count from count(*) OVER().
+
+        The count covers every filter match, ignoring offset and ``after``.
+        """
+        if after is not None:
+            nodes = await self.find(filters, resolution, prefetch, limit, offset, after)
+            return nodes, await self.count(filters)
+
+        stmt = self._find_stmt(
+            filters, resolution, prefetch, limit, offset, newest_first=newest_first
+        ).add_columns(
+            func.count().over().label("total_count")
+        )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        if rows:
+            return [self._row_to_pydantic(row) for row in rows], rows[0].total_count
+        # Page past the end: no row carries the window count
+        return [], await self.count(filters) if offset else 0
+
+    async def count(self, filters: NodeFilter) -> int:
+        """Count matching nodes without loading them."""
+        stmt = (
+            select(func.count())
+            .select_from(MemoryNodeModel)
+            .where(MemoryNodeModel.tenant_id == self.tenant_id, *filters.clauses())
+        )
+        return await self.session.scalar(stmt) or 0
+
+    async def estimate_count(self, filters: NodeFilter) -> int:
+        """Planner row estimate for the filters; cheap on very large tenants."""
+        stmt = select(MemoryNodeModel.id).where(
+            MemoryNodeModel.tenant_id == self.tenant_id, *filters.clauses()
+        )
+        return await approximate_count(self.session, stmt)
+
+    async def exists(self, filters: NodeFilter) -> bool:
+        """Check whether any node matches."""
+        stmt = select(
+            select(MemoryNodeModel.id)
+            .where(MemoryNodeModel.tenant_id == self.tenant_id, *filters.clauses())
+            .exists()
+        )
+        return bool(await self.session.scalar(stmt))
+
+    async def rank_text(
+        self,
+        query: str,
+        filters: NodeFilter,
+        limit: int = 50,
+    ) -> list[tuple[UUID, float]]:
+        """Full-text matches of a keyword query (see text_tsquery), best first.
+
+        Served by the GIN index on search_vector. Returns (id, ts_rank_cd)
+        pairs; ties break on id so ranks are stable.
+        """
+        if text_tsquery(query) is None:
+            return []
+        result = await self.session.execute(self._rank_text_stmt(query, filters, limit))
+        return [(row.id, row.rank) for row in result.all()]
+
+    async def headlines(self, query: str, ids: list[UUID]) -> dict[UUID, str]:
+        """ts_headline snippets for keyword matches, over the text search_vector indexes.
+
+        The document is micro, summary and every string in full_content, so a
+        match anywhere in the indexed text shows up in the snippet. Headlines
+        re-parse the documents, so only call this for the page being returned.
+        """
+        tsquery = text_tsquery(query)
+        if tsquery is None or not ids:
+            return {}
+        strings = (
+            func.jsonb_path_query(MemoryNodeModel.full_content, literal_column(_JSON_STRINGS))
+            .table_valued("value")
+            .render_derived(name="strings")
+        )
+        full_text = select(
+            func.string_agg(strings.c.value.op("#>>")(literal_column("'{}'")), " … ")
+        ).scalar_subquery()
+        document = func.concat_ws(
+            " … ", MemoryNodeModel.micro, MemoryNodeModel.summary, full_text
+        )
+        headline = func.ts_headline("english", document, tsquery, _HEADLINE_OPTIONS)
+        stmt = select(MemoryNodeModel.id, headline.label("headline")).where(
+            MemoryNodeModel.tenant_id == self.tenant_id, MemoryNodeModel.id.in_(ids)
+        )
+        result = await self.session.execute(stmt)
+        return {row.id: row.headline for row in result.all()}
+
     async def find_by_tags(
         self,
         tags: list[str],
@@ -194,26 +474,16 @@ class MemoryStorage:
         layer: MemoryLayer | None = None,
         limit: int = 20,
         resolution: MemoryResolution = MemoryResolution.SUMMARY,
+        prefetch: Prefetch | None = None,
     ) -> list[MemoryNode]:
         """Find nodes matching all specified tags."""
-        stmt = select(MemoryNodeModel).where(
-            and_(
-                MemoryNodeModel.tenant_id == self.tenant_id,
-                MemoryNodeModel.tags.contains(tags),
-            )
+        return await self.find(
+            NodeFilter(team_id=team_id, tags=tags, layer=layer),
+            resolution=resolution,
+            prefetch=prefetch,
+            limit=limit,
         )
 
-        if team_id:
-            stmt = stmt.where(MemoryNodeModel.team_id == team_id)
-        if layer:
-            stmt = stmt.where(MemoryNodeModel.layer == layer.value)
-
-        stmt = stmt.order_by(MemoryNodeModel.salience.desc()).limit(limit)
-
-        result = await self.session.execute(stmt)
-        db_nodes = result.scalars().all()
-        return [self._to_pydantic(n, resolution) for n in db_nodes]
-
     async def find_by_layer(
         self,
         layer: MemoryLayer,
@@ -221,53 +491,32 @@ class MemoryStorage:
         node_type: str | None = None,
         limit: int = 50,
         resolution: MemoryResolution = MemoryResolution.MICRO,
+        prefetch: Prefetch | None = None,
     ) -> list[MemoryNode]:
         """Find all nodes in a layer."""
-        stmt = select(MemoryNodeModel).where(
-            and_(
-                MemoryNodeModel.tenant_id == self.tenant_id,
-                MemoryNodeModel.layer == layer.value,
-            )
+        return await self.find(
+            NodeFilter(team_id=team_id, layer=layer, node_type=node_type),
+            resolution=resolution,
+            prefetch=prefetch,
+            limit=limit,
         )
 
-        if team_id:
-            stmt = stmt.where(MemoryNodeModel.team_id == team_id)
-        if node_type:
-            stmt = stmt.where(MemoryNodeModel.node_type == node_type)
-
-        stmt = stmt.order_by(MemoryNodeModel.salience.desc()).limit(limit)
-
-        result = await self.session.execute(stmt)
-        db_nodes = result.scalars().all()
-        return [self._to_pydantic(n, resolution) for n in db_nodes]
-
     async def find_by_pattern(
         self,
         pattern: str,
         team_id: str | None = None,
         limit: int = 20,
         resolution: MemoryResolution = MemoryResolution.SUMMARY,
+        prefetch: Prefetch | None = None,
     ) -> list[MemoryNode]:
         """Find nodes matching a symbol pattern (glob-style: event.finding.*)."""
-        # Convert glob to SQL LIKE pattern
-        sql_pattern = pattern.replace("*", "%").replace("?", "_")
-
-        stmt = select(MemoryNodeModel).where(
-            and_(
-                MemoryNodeModel.tenant_id == self.tenant_id,
-                MemoryNodeModel.symbol.like(sql_pattern),
-            )
+        return await self.find(
+            NodeFilter(team_id=team_id, pattern=pattern),
+            resolution=resolution,
+            prefetch=prefetch,
+            limit=limit,
         )
 
-        if team_id:
-            stmt = stmt.where(MemoryNodeModel.team_id == team_id)
-
-        stmt = stmt.order_by(MemoryNodeModel.salience.desc()).limit(limit)
-
-        result = await self.session.execute(stmt)
-        db_nodes = result.scalars().all()
-        return [self._to_pydantic(n, resolution) for n in db_nodes]
-
     async def count_by_layer(self, team_id: str | None = None) -> dict[str, int]:
         """Count nodes per layer."""
         stmt = (
@@ -282,6 +531,47 @@ class MemoryStorage:
         result = await self.session.execute(stmt)
         return {row[0]: row[1] for row in result.all()}
 
+    # -------------------------------------------------------------------------
+    # Vector Outbox
+    # -------------------------------------------------------------------------
+
+    async def enqueue_vector_sync(
+        self, team_id: str, node_ids: list[UUID], operation: str
+    ) -> None:
+        """Record vector index events for a team's nodes in the current transaction.
+
+        Events carry only the node id: the relay embeds the node's state at
+        apply time, so repeated or out-of-order events converge. The team's
+        retrieval cache generation is bumped once the transaction commits.
+
+        Args:
+            team_id: Team collection the nodes belong to
+            node_ids: Nodes to bring in line with Postgres
+            operation: "upsert" or "delete"
+        """
+        if not node_ids:
+            return
+        await self.session.execute(
+            insert(MemoryOutboxModel),
+            [
+                {
+                    "tenant_id": self.tenant_id,
+                    "team_id": team_id,
+                    "node_id": node_id,
+                    "operation": operation,
+                }
+                for node_id in node_ids
+            ],
+        )
+        bump_after_commit(self.session, self.tenant_id, {team_id})
+
+    async def _enqueue_vector_sync(self, operation: str, nodes: list[MemoryNode]) -> None:
+        by_team: dict[str, list[UUID]] = {}
+        for node in nodes:
+            by_team.setdefault(node.team_id, []).append(node.id)
+        for team_id, node_ids in by_team.items():
+            await self.enqueue_vector_sync(team_id, node_ids, operation)
+
     # -------------------------------------------------------------------------
     # Relationship Methods
     # -------------------------------------------------------------------------
@@ -347,6 +637,7 @@ class MemoryStorage:
         direction: str = "outgoing",
         limit: int = 20,
         resolution: MemoryResolution = MemoryResolution.SUMMARY,
+        prefetch: Prefetch | None = None,
     ) -> list[MemoryNode]:
         """Get nodes related to a given symbol."""
         # Get the source node ID
@@ -354,21 +645,22 @@ class MemoryStorage:
         if not source:
             return []
 
-        # Build query based on direction
+        # Build query based on direction; the tenant predicate prunes partitions
+        tenant = MemoryRelationshipModel.tenant_id == self.tenant_id
         if direction == "outgoing":
             rel_stmt = select(MemoryRelationshipModel.target_id).where(
-                MemoryRelationshipModel.source_id == source.id
+                tenant, MemoryRelationshipModel.source_id == source.id
             )
         elif direction == "incoming":
             rel_stmt = select(MemoryRelationshipModel.source_id).where(
-                MemoryRelationshipModel.target_id == source.id
+                tenant, MemoryRelationshipModel.target_id == source.id
             )
         else:  # both
             rel_stmt = select(MemoryRelationshipModel.target_id).where(
-                MemoryRelationshipModel.source_id == source.id
+                tenant, MemoryRelationshipModel.source_id == source.id
             ).union(
                 select(MemoryRelationshipModel.source_id).where(
-                    MemoryRelationshipModel.target_id == source.id
+                    tenant, MemoryRelationshipModel.target_id == source.id
                 )
             )
 
@@ -387,14 +679,49 @@ class MemoryStorage:
 
         # Get the actual nodes
         node_stmt = (
-            select(MemoryNodeModel)
+            self._select_nodes(resolution, prefetch)
             .where(MemoryNodeModel.id.in_(related_ids))
             .limit(limit)
         )
         node_result = await self.session.execute(node_stmt)
-        db_nodes = node_result.scalars().all()
+        return [self._row_to_pydantic(row) for row in node_result.all()]
 
-        return [self._to_pydantic(n, resolution) for n in db_nodes]
+    async def get_related_many(
+        self,
+        source_ids: list[UUID],
+        relation_types: list[RelationType],
+        resolution: MemoryResolution = MemoryResolution.SUMMARY,
+    ) -> list[tuple[UUID, RelationType, MemoryNode]]:
+        """One hop along outgoing edges from many nodes in a single query.
+
+        Returns (source id, relation, target node) per edge, strongest edges
+        of each source first.
+        """
+        if not source_ids or not relation_types:
+            return []
+        rel = MemoryRelationshipModel
+        stmt = (
+            self._select_nodes(resolution)
+            .add_columns(rel.source_id, rel.relation_type)
+            .join(
+                rel,
+                and_(
+                    rel.tenant_id == MemoryNodeModel.tenant_id,
+                    rel.target_id == MemoryNodeModel.id,
+                ),
+            )
+            .where(
+                rel.tenant_id == self.tenant_id,
+                rel.source_id.in_(source_ids),
+                rel.relation_type.in_([rt.value for rt in relation_types]),
+            )
+            .order_by(rel.source_id, rel.weight.desc(), MemoryNodeModel.id)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            (row.source_id, RelationType(row.relation_type), self._row_to_pydantic(row))
+            for row in result.all()
+        ]
 
     async def traverse(
         self,
@@ -447,6 +774,25 @@ class MemoryStorage:
         )
         await self.session.execute(stmt)
 
+    async def boost_salience_many(self, symbols: list[str], boost: float = 0.05) -> None:
+        """Boost salience for several accessed nodes in one statement."""
+        if not symbols:
+            return
+        stmt = (
+            update(MemoryNodeModel)
+            .where(
+                and_(
+                    MemoryNodeModel.tenant_id == self.tenant_id,
+                    MemoryNodeModel.symbol.in_(symbols),
+                )
+            )
+            .values(
+                salience=func.least(1.0, MemoryNodeModel.salience + boost),
+                updated_at=datetime.utcnow(),
+            )
+        )
+        await self.session.execute(stmt)
+
     async def decay_salience(
         self,
         team_id: str,
@@ -471,10 +817,117 @@ class MemoryStorage:
         result = await self.session.execute(stmt)
         return result.rowcount
 
+    # -------------------------------------------------------------------------
+    # Resolution Projection
+    # -------------------------------------------------------------------------
+
+    def _find_stmt(
+        self,
+        filters: NodeFilter,
+        resolution: MemoryResolution,
+        prefetch: Prefetch | None,
+        limit: int | None,
+        offset: int,
+        after: tuple[datetime, UUID] | None = None,
+        newest_first: bool = False,
+    ) -> Select:
+        order: list[ColumnElement[Any]] = (
+            [MemoryNodeModel.created_at, MemoryNodeModel.id]
+            if newest_first or after is not None
+            else [MemoryNodeModel.salience, MemoryNodeModel.id]
+        )
+        stmt = (
+            self._select_nodes(resolution, prefetch)
+            .where(*filters.clauses())
+            .order_by(*(column.desc() for column in order))
+        )
+        if after is not None:
+            stmt = stmt.where(keyset_after(order, after))
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def _rank_text_stmt(self, query: str, filters: NodeFilter, limit: int) -> Select:
+        tsquery = text_tsquery(query)
+        rank = func.ts_rank_cd(MemoryNodeModel.search_vector, tsquery)
+        return (
+            select(MemoryNodeModel.id, rank.label("rank"))
+            .where(
+                MemoryNodeModel.tenant_id == self.tenant_id,
+                *filters.clauses(),
+                MemoryNodeModel.search_vector.op("@@")(tsquery),
+            )
+            .order_by(rank.desc(), MemoryNodeModel.id)
+            .limit(limit)
+        )
+
+    def _select_nodes(
+        self,
+        resolution: MemoryResolution,
+        prefetch: Prefetch | None = None,
+    ) -> Select:
+        """Select node columns with summary/full projected per row.
+
+        Rows load at the base resolution; rows matching a prefetch rule are
+        upgraded by CASE expressions in the same statement, so callers never
+        need a follow-up query to zoom in. Content above the resolved level
+        comes back as an empty string and is never read from disk.
+        """
+        summary_tags: set[str] = set()
+        full_tags: set[str] = set()
+        for tags, level in prefetch or []:
+            if _RESOLUTION_RANK[level] >= _RESOLUTION_RANK[MemoryResolution.SUMMARY]:
+                summary_tags.update(tags)
+            if level == MemoryResolution.FULL:
+                full_tags.update(tags)
+
+        full_text = func.coalesce(MemoryNodeModel.full_content["full"].astext, "")
+        return select(
+            *_NODE_COLUMNS,
+            self._project(
+                MemoryNodeModel.summary, resolution, MemoryResolution.SUMMARY, summary_tags
+            ).label("summary"),
+            self._project(full_text, resolution, MemoryResolution.FULL, full_tags).label("full"),
+        ).where(MemoryNodeModel.tenant_id == self.tenant_id)
+
+    @staticmethod
+    def _project(
+        column: Any,
+        base: MemoryResolution,
+        level: MemoryResolution,
+        tags: set[str],
+    ) -> Any:
+        """Column at ``level``: always, never, or only for rows tagged with ``tags``."""
+        if _RESOLUTION_RANK[base] >= _RESOLUTION_RANK[level]:
+            return column
+        if not tags:
+            return literal("")
+        return case((MemoryNodeModel.tags.overlap(sorted(tags)), column), else_=literal(""))
+
     # -------------------------------------------------------------------------
     # Conversion Helpers
     # -------------------------------------------------------------------------
 
+    def _row_to_pydantic(self, row: Row) -> MemoryNode:
+        """Convert a projected row from _select_nodes to a Pydantic model."""
+        return MemoryNode(
+            id=row.id,
+            symbol=row.symbol,
+            tenant_id=str(row.tenant_id),
+            team_id=row.team_id,
+            micro=row.micro,
+            summary=row.summary,
+            full=row.full,
+            tags=row.tags or [],
+            salience=row.salience,
+            confidence=row.confidence,
+            timestamp=row.created_at,
+            updated_at=row.updated_at,
+            relationships=[],  # Loaded separately if needed
+        )
+
     def _to_pydantic(
         self,
         db_node: MemoryNodeModel,
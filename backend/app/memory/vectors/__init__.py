@@ -0,0 +1,27 @@
+"""Vector storage backends for memory embeddings."""
+
+from app.memory.vectors.base import (
+    VectorBackend,
+    VectorMatch,
+    VectorRecord,
+    get_vector_backend,
+    matches_where,
+    merge_metadata,
+)
+from app.memory.vectors.providers import (
+    EmbeddingProvider,
+    content_hash,
+    get_embedding_provider,
+)
+
+__all__ = [
+    "EmbeddingProvider",
+    "VectorBackend",
+    "VectorMatch",
+    "VectorRecord",
+    "content_hash",
+    "get_embedding_provider",
+    "get_vector_backend",
+    "matches_where",
+    "merge_metadata",
+]
@@ -0,0 +1,163 @@
+"""Vector backend interface behind EmbeddingStore.
+
+Backends store one collection of (id, embedding, metadata) records and answer
+nearest-neighbour queries; embeddings are computed beforehand by an
+``EmbeddingProvider``. Filters use ChromaDB's ``where``
+dialect (equality, ``$eq``/``$ne``/``$gt``/``$gte``/``$lt``/``$lte``,
+``$in``/``$nin``, ``$contains``, ``$and``/``$or``) so EmbeddingStore builds
+the same filter whichever backend is configured. Distances are squared L2,
+ChromaDB's default space. Metadata written for an existing record is merged
+into the stored metadata, and a None value removes the key (ChromaDB's
+semantics).
+"""
+
+import operator
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from app.core.config import get_settings
+
+Where = dict[str, Any]
+
+
+class VectorMatch(NamedTuple):
+    """One nearest-neighbour result."""
+
+    id: str
+    distance: float
+    metadata: dict[str, Any]
+
+
+class VectorRecord(NamedTuple):
+    """One stored record, with its embedding when requested."""
+
+    id: str
+    metadata: dict[str, Any]
+    embedding: list[float] | None = None
+
+
+class VectorBackend(ABC):
+    """Storage and nearest-neighbour search for one collection."""
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        """Add records, or replace the embeddings of existing ones (metadata is merged)."""
+
+    @abstractmethod
+    def update(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Update existing records (metadata is merged); unknown ids are ignored."""
+
+    @abstractmethod
+    def delete(self, ids: list[str]) -> None:
+        """Delete records by id."""
+
+    @abstractmethod
+    def query(
+        self,
+        embeddings: list[list[float]],
+        limit: int,
+        where: Where | None = None,
+    ) -> list[list[VectorMatch]]:
+        """Nearest records for each query vector, closest first."""
+
+    @abstractmethod
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: Where | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        include_embeddings: bool = False,
+    ) -> list[VectorRecord]:
+        """Records by id and/or filter, in storage order."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored records."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete every record."""
+
+
+def merge_metadata(stored: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """Apply a metadata write to stored metadata; None values remove keys."""
+    merged = {**stored, **update}
+    return {key: value for key, value in merged.items() if value is not None}
+
+
+# =============================================================================
+# Filters
+# =============================================================================
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$in": lambda value, options: value in options,
+    "$nin": lambda value, options: value not in options,
+    "$contains": lambda value, item: item in value,
+}
+
+
+def matches_where(metadata: dict[str, Any], where: Where | None) -> bool:
+    """Evaluate a ChromaDB-style ``where`` filter against one record's metadata."""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, c) for c in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, c) for c in condition):
+                return False
+        elif not _matches_value(metadata.get(key), condition):
+            return False
+    return True
+
+
+def _matches_value(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == condition
+    try:
+        return all(_OPERATORS[op](value, arg) for op, arg in condition.items())
+    except TypeError:  # Missing key or mismatched types never match
+        return False
+
+
+# =============================================================================
+# Factory
+# =============================================================================
+
+
+def get_vector_backend(collection: str, metadata: dict[str, Any]) -> VectorBackend:
+    """Get the configured backend for a collection (one per tenant/team)."""
+    settings = get_settings()
+
+    if settings.vector_backend == "local":
+        from app.memory.vectors.local import LocalVectorBackend
+
+        return LocalVectorBackend(
+            path=Path(settings.vector_root) / collection,
+            hnsw_threshold=settings.vector_hnsw_threshold,
+        )
+
+    from app.memory.vectors.chroma import ChromaVectorBackend
+
+    return ChromaVectorBackend.connect(collection, metadata)
+
@@ -0,0 +1,107 @@
+"""ChromaDB HTTP backend."""
+
+from typing import Any
+
+import chromadb
+from chromadb.config import Settings as ChromaSettings
+
+from app.core.config import get_settings
+from app.memory.vectors.base import VectorBackend, VectorMatch, VectorRecord, Where
+
+
+class ChromaVectorBackend(VectorBackend):
+    """Collection on a ChromaDB server, written with precomputed embeddings."""
+
+    def __init__(self, client: Any, name: str, metadata: dict[str, Any]):
+        self._client = client
+        self._name = name
+        self._metadata = metadata
+        self._collection = client.get_or_create_collection(name=name, metadata=metadata)
+
+    @classmethod
+    def connect(cls, name: str, metadata: dict[str, Any]) -> "ChromaVectorBackend":
+        settings = get_settings()
+        client = chromadb.HttpClient(
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+            settings=ChromaSettings(anonymized_telemetry=False),
+        )
+        return cls(client, name, metadata)
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        self._collection.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas)
+
+    def update(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self._collection.update(ids=ids, embeddings=embeddings, metadatas=metadatas)
+
+    def delete(self, ids: list[str]) -> None:
+        self._collection.delete(ids=ids)
+
+    def query(
+        self,
+        embeddings: list[list[float]],
+        limit: int,
+        where: Where | None = None,
+    ) -> list[list[VectorMatch]]:
+        if not embeddings:
+            return []
+        results = self._collection.query(
+            query_embeddings=embeddings,
+            n_results=limit,
+            where=where or None,
+            include=["metadatas", "distances"],
+        )
+        output = []
+        for i, ids in enumerate(results["ids"] or []):
+            distances = results["distances"][i] if results["distances"] else [0.0] * len(ids)
+            metadatas = results["metadatas"][i] if results["metadatas"] else [{}] * len(ids)
+            output.append(
+                [
+                    VectorMatch(node_id, float(distance), dict(metadata or {}))
+                    for node_id, distance, metadata in zip(ids, distances, metadatas, strict=False)
+                ]
+            )
+        return output or [[] for _ in embeddings]
+
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: Where | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        include_embeddings: bool = False,
+    ) -> list[VectorRecord]:
+        include = ["metadatas", "embeddings"] if include_embeddings else ["metadatas"]
+        page = self._collection.get(
+            ids=ids, where=where or None, limit=limit, offset=offset or None, include=include
+        )
+        metadatas = page["metadatas"] or [{}] * len(page["ids"])
+        embeddings = page["embeddings"] if include_embeddings else None
+        return [
+            VectorRecord(
+                node_id,
+                dict(metadatas[i] or {}),
+                list(map(float, embeddings[i])) if embeddings is not None else None,
+            )
+            for i, node_id in enumerate(page["ids"])
+        ]
+
+    def count(self) -> int:
+        return self._collection.count()
+
+    def clear(self) -> None:
+        # ChromaDB doesn't have a clear method, so we delete and recreate
+        self._client.delete_collection(self._name)
+        self._collection = self._client.get_or_create_collection(
+            name=self._name, metadata=self._metadata
+        )
@@ -0,0 +1,440 @@
+"""In-process vector index for single-node deployments and offline tests.
+
+Each collection lives in its own directory:
+
+    {vector_root}/{collection}/vectors.{n}.f32  float32 rows, memory-mapped
+    {vector_root}/{collection}/records.json     ids and metadata by row, dimensions
+                                                and the current vectors file
+
+Writes touch only what changed. New and re-embedded vectors are written to
+fresh rows past the end of the saved ones (a re-embedded record's old row
+becomes a tombstone), metadata-only updates rewrite just ``records.json``, and
+deleted rows become tombstones (empty ids). Once tombstones make up
+``COMPACT_FRACTION`` of the rows, the collection is compacted into a new
+vectors file. Rows that ``records.json`` refers to are never overwritten, and
+new rows are flushed before it is replaced, so a crash at any point leaves the
+previous state plus at most some rows that no record refers to.
+
+The vectors file is grown in place (by doubling) and mapped rather than read,
+so the matrix lives in the page cache instead of process memory.
+
+Small collections are searched by brute force over the matrix. Once a
+collection reaches ``hnsw_threshold`` rows and the optional ``hnswlib``
+dependency is installed (``uv sync --extra vectors``), queries go through an
+HNSW graph built once and then updated in place on writes; filters are applied
+inside the graph search. Filters matching at most ``EXACT_FILTER_FRACTION`` of
+the rows are searched exactly over the matching rows instead, which is both
+faster and complete for them.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.memory.vectors.base import (
+    VectorBackend,
+    VectorMatch,
+    VectorRecord,
+    Where,
+    matches_where,
+    merge_metadata,
+)
+
+logger = logging.getLogger(__name__)
+
+# Deleted rows are compacted away once they are this share of the matrix
+COMPACT_FRACTION = 0.25
+
+# Filters matching at most this share of rows skip the HNSW graph
+EXACT_FILTER_FRACTION = 0.05
+
+# Rows copied at a time when compacting, to bound memory use
+COMPACT_CHUNK_ROWS = 4096
+
+
+class LocalVectorBackend(VectorBackend):
+    """NumPy-backed collection persisted to a directory.
+
+    Args:
+        path: Directory holding this collection's files
+        hnsw_threshold: Row count from which an HNSW index is used
+    """
+
+    def __init__(self, path: Path, hnsw_threshold: int = 50_000):
+        self.path = path
+        self.hnsw_threshold = hnsw_threshold
+
+        self._lock = threading.RLock()
+        self._ids: list[str] = []  # "" marks a deleted row
+        self._metadatas: list[dict[str, Any]] = []
+        self._rows: dict[str, int] = {}
+        self._deleted = 0
+        self._saved_rows = 0  # Rows records.json refers to; never overwritten
+        # Rows [0, len(_ids)) of the vectors file are in use; writable from the first write
+        self._matrix: np.memmap | None = None
+        self._vectors_file = ""
+        self._hnsw: Any = None
+        self._load()
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]],
+    ) -> None:
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            self._check_dimensions(vectors.shape[1])
+            rows = []
+            for i, record_id in enumerate(ids):
+                row = self._rows.get(record_id)
+                previous = {} if row is None else self._metadatas[row]
+                rows.append(self._writable_row(record_id, merge_metadata(previous, metadatas[i])))
+
+            self._write_rows(np.asarray(rows), vectors)
+            self._commit()
+
+    def update(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        with self._lock:
+            known = [i for i, record_id in enumerate(ids) if record_id in self._rows]
+            if not known:
+                return
+            if embeddings is not None:
+                vectors = np.asarray(embeddings, dtype=np.float32)[known]
+                self._check_dimensions(vectors.shape[1])
+                rows = [
+                    self._writable_row(ids[i], self._metadatas[self._rows[ids[i]]]) for i in known
+                ]
+                self._write_rows(np.asarray(rows), vectors)
+            if metadatas is not None:
+                for i in known:
+                    row = self._rows[ids[i]]
+                    self._metadatas[row] = merge_metadata(self._metadatas[row], metadatas[i])
+            self._commit()
+
+    def delete(self, ids: list[str]) -> None:
+        with self._lock:
+            rows = [self._rows.pop(record_id) for record_id in ids if record_id in self._rows]
+            if not rows:
+                return
+            for row in rows:
+                self._tombstone(row)
+            self._commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids, self._metadatas, self._rows = [], [], {}
+            self._deleted = 0
+            self._saved_rows = 0
+            self._matrix = None
+            self._vectors_file = ""
+            self._hnsw = None
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def query(
+        self,
+        embeddings: list[list[float]],
+        limit: int,
+        where: Where | None = None,
+    ) -> list[list[VectorMatch]]:
+        if not embeddings:
+            return []
+        queries = np.asarray(embeddings, dtype=np.float32)
+
+        with self._lock:
+            if not self._rows or limit <= 0:
+                return [[] for _ in embeddings]
+            mask = self._filter_mask(where)
+            if mask is not None and not mask.any():
+                return [[] for _ in embeddings]
+
+            index = self._hnsw_index()
+            selective = mask is not None and mask.sum() <= EXACT_FILTER_FRACTION * len(mask)
+            if index is not None and not selective:
+                try:
+                    return self._query_hnsw(index, queries, limit, mask)
+                except RuntimeError as e:
+                    # The filtered graph walk found fewer than k matches
+                    logger.debug("HNSW query fell back to exact search: %s", e)
+            return self._query_exact(queries, limit, mask)
+
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: Where | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        include_embeddings: bool = False,
+    ) -> list[VectorRecord]:
+        with self._lock:
+            candidates = (
+                sorted(self._rows.values())
+                if ids is None
+                else sorted(self._rows[i] for i in set(ids) if i in self._rows)
+            )
+            rows = [row for row in candidates if matches_where(self._metadatas[row], where)]
+            rows = rows[offset : None if limit is None else offset + limit]
+            vectors = self._vectors
+            return [
+                VectorRecord(
+                    self._ids[row],
+                    dict(self._metadatas[row]),
+                    vectors[row].tolist() if include_embeddings and vectors is not None else None,
+                )
+                for row in rows
+            ]
+
+    def count(self) -> int:
+        return len(self._rows)
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    @property
+    def _vectors(self) -> np.ndarray | None:
+        return None if self._matrix is None else self._matrix[: len(self._ids)]
+
+    def _query_exact(
+        self, queries: np.ndarray, limit: int, mask: np.ndarray | None
+    ) -> list[list[VectorMatch]]:
+        """Brute-force squared L2 over the (filtered) matrix."""
+        vectors = self._vectors
+        assert vectors is not None
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self._ids))
+        candidates = vectors[rows]
+
+        # |q - v|^2 = |q|^2 - 2 q.v + |v|^2, one matrix product for the whole batch
+        distances = (
+            np.einsum("ij,ij->i", queries, queries)[:, None]
+            - 2 * queries @ candidates.T
+            + np.einsum("ij,ij->i", candidates, candidates)[None, :]
+        )
+        np.maximum(distances, 0, out=distances)
+
+        k = min(limit, len(rows))
+        output = []
+        for query_distances in distances:
+            top = np.argpartition(query_distances, k - 1)[:k]
+            top = top[np.argsort(query_distances[top])]
+            output.append([self._match(rows[i], query_distances[i]) for i in top])
+        return output
+
+    def _query_hnsw(
+        self, index: Any, queries: np.ndarray, limit: int, mask: np.ndarray | None
+    ) -> list[list[VectorMatch]]:
+        k = min(limit, len(self._rows) if mask is None else int(mask.sum()))
+        allowed = None if mask is None else (lambda label: bool(mask[label]))
+        index.set_ef(max(k * 2, 64))
+        labels, distances = index.knn_query(queries, k=k, filter=allowed)
+        return [
+            [self._match(int(row), distance) for row, distance in zip(rows, dists, strict=True)]
+            for rows, dists in zip(labels, distances, strict=True)
+        ]
+
+    def _hnsw_index(self) -> Any:
+        """HNSW graph over the live rows, built once and then kept up to date by writes."""
+        if len(self._rows) < self.hnsw_threshold:
+            return None
+        if self._hnsw is not None:
+            return self._hnsw
+        try:
+            import hnswlib
+        except ImportError:
+            return None
+
+        vectors = self._vectors
+        assert vectors is not None
+        live = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        index = hnswlib.Index(space="l2", dim=vectors.shape[1])
+        index.init_index(max_elements=max(len(self._ids), 1), ef_construction=200, M=16)
+        index.add_items(vectors[live], live)
+        self._hnsw = index
+        logger.info("Built HNSW index for %s (%d vectors)", self.path.name, len(live))
+        return index
+
+    def _filter_mask(self, where: Where | None) -> np.ndarray | None:
+        """Rows that are live and match ``where``; None when every row qualifies."""
+        if not where and not self._deleted:
+            return None
+        return np.fromiter(
+            (
+                bool(record_id) and matches_where(metadata, where)
+                for record_id, metadata in zip(self._ids, self._metadatas, strict=True)
+            ),
+            dtype=bool,
+            count=len(self._ids),
+        )
+
+    def _match(self, row: int, distance: float) -> VectorMatch:
+        return VectorMatch(self._ids[row], float(distance), dict(self._metadatas[row]))
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def _check_dimensions(self, dimensions: int) -> None:
+        if self._matrix is not None and self._matrix.shape[1] != dimensions:
+            raise ValueError(
+                f"Embedding has {dimensions} dimensions, "
+                f"collection {self.path.name} has {self._matrix.shape[1]}"
+            )
+
+    def _writable_row(self, record_id: str, metadata: dict[str, Any]) -> int:
+        """Row to write a record's new vector to, with ``metadata`` set on it.
+
+        Saved rows are never overwritten: a saved record moves to a new row at
+        the end and its old row becomes a tombstone.
+        """
+        row = self._rows.get(record_id)
+        if row is not None and row >= self._saved_rows:
+            self._metadatas[row] = metadata
+            return row
+        if row is not None:
+            self._tombstone(row)
+        row = len(self._ids)
+        self._rows[record_id] = row
+        self._ids.append(record_id)
+        self._metadatas.append(metadata)
+        return row
+
+    def _tombstone(self, row: int) -> None:
+        self._ids[row] = ""
+        self._metadatas[row] = {}
+        self._deleted += 1
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(row)
+
+    def _reserve(self, rows: int, dimensions: int) -> np.memmap:
+        """Writable map of the vectors file with room for ``rows``.
+
+        The file is grown in place by doubling; rows past the saved ones are
+        free space until records.json refers to them.
+        """
+        matrix = self._matrix
+        if matrix is not None and matrix.mode == "r+" and len(matrix) >= rows:
+            return matrix
+        if not self._vectors_file:
+            self._vectors_file = self._next_vectors_file()
+        self.path.mkdir(parents=True, exist_ok=True)
+        row_bytes = dimensions * np.dtype(np.float32).itemsize
+        with open(self.path / self._vectors_file, "a+b") as f:
+            capacity = f.seek(0, os.SEEK_END) // row_bytes
+            if capacity < rows:
+                capacity = max(rows, 64, 2 * capacity)
+                f.truncate(capacity * row_bytes)
+        self._matrix = np.memmap(
+            self.path / self._vectors_file,
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, dimensions),
+        )
+        return self._matrix
+
+    def _write_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Set vector rows in the vectors file and in the HNSW graph."""
+        matrix = self._reserve(len(self._ids), vectors.shape[1])
+        matrix[rows] = vectors
+
+        if self._hnsw is not None:
+            if self._hnsw.get_max_elements() < len(self._ids):
+                self._hnsw.resize_index(len(matrix))
+            self._hnsw.add_items(vectors, rows)
+
+    def _next_vectors_file(self) -> str:
+        version = int(self._vectors_file.split(".")[1]) + 1 if self._vectors_file else 1
+        return f"vectors.{version}.f32"
+
+    def _commit(self) -> None:
+        """Save records.json, compacting first once tombstones are common enough."""
+        if self._deleted >= COMPACT_FRACTION * len(self._ids):
+            self._compact()
+        else:
+            self._save_records()
+
+    def _compact(self) -> None:
+        """Copy live rows to a new vectors file; rows are renumbered, so HNSW is rebuilt."""
+        live = sorted(self._rows.values())
+        vectors = self._vectors
+        previous = self._vectors_file
+        self._ids = [self._ids[row] for row in live]
+        self._metadatas = [self._metadatas[row] for row in live]
+        self._rows = {record_id: row for row, record_id in enumerate(self._ids) if record_id}
+        self._deleted = 0
+        self._hnsw = None
+        self._matrix = None
+
+        if live and vectors is not None:
+            self._vectors_file = self._next_vectors_file()
+            matrix = self._reserve(len(live), vectors.shape[1])
+            for start in range(0, len(live), COMPACT_CHUNK_ROWS):
+                chunk = live[start : start + COMPACT_CHUNK_ROWS]
+                matrix[start : start + len(chunk)] = vectors[chunk]
+        else:
+            self._vectors_file = ""
+        self._save_records()
+        if previous and previous != self._vectors_file:
+            (self.path / previous).unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        records_path = self.path / "records.json"
+        if not records_path.exists():
+            return
+        records = json.loads(records_path.read_text())
+        self._ids = records["ids"]
+        self._metadatas = records["metadatas"]
+        self._rows = {record_id: row for row, record_id in enumerate(self._ids) if record_id}
+        self._deleted = len(self._ids) - len(self._rows)
+        self._saved_rows = len(self._ids)
+        self._vectors_file = records["vectors_file"]
+        if not self._ids:
+            return
+        self._matrix = np.memmap(
+            self.path / self._vectors_file,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self._ids), records["dimensions"]),
+        )
+
+    def _save_records(self) -> None:
+        """Replace records.json via temp file and rename so readers never see a partial write.
+
+        Vector rows are flushed first, so records never refer to unwritten rows.
+        """
+        if self._matrix is not None:
+            self._matrix.flush()
+        self.path.mkdir(parents=True, exist_ok=True)
+        records_tmp = self.path / "records.json.tmp"
+        records_tmp.write_text(
+            json.dumps(
+                {
+                    "ids": self._ids,
+                    "metadatas": self._metadatas,
+                    "dimensions": None if self._matrix is None else self._matrix.shape[1],
+                    "vectors_file": self._vectors_file,
+                }
+            )
+        )
+        os.replace(records_tmp, self.path / "records.json")
+        self._saved_rows = len(self._ids)
@@ -0,0 +1,259 @@
+"""Embedding providers: which model turns memory text into vectors.
+
+Embeddings are computed in-process and handed to the vector backend, so the
+model, batch size and cache are ours rather than whatever the Chroma server
+applies. Providers batch texts and look vectors up by content hash before
+calling the model: first in a per-process LRU cache, then in a shared cache
+collection in the vector backend (one per model, keyed by hash, shared by all
+tenants), so boilerplate such as standard policy language is embedded once.
+The shared collection is bounded: past ``shared_cache_size`` entries the
+oldest stored are evicted, down to 90% of the bound. Entries carry their store
+time in metadata, since backends do not return records in insertion order.
+"""
+
+import hashlib
+import heapq
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.memory.vectors.base import VectorBackend, get_vector_backend
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# Shared cache entries read per page when looking for the oldest to evict
+SHARED_SCAN_PAGE = 10_000
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of the text that is embedded."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+@dataclass
+class EmbeddingStats:
+    """Counters for embedding cost and latency."""
+
+    texts: int = 0
+    cache_hits: int = 0
+    shared_cache_hits: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+class EmbeddingProvider(ABC):
+    """Batched, cached text embedding with one fixed model.
+
+    Args:
+        batch_size: Texts per model call
+        cache_size: Embeddings kept in the content-hash LRU cache (0 disables it)
+        shared_cache: Persistent hash -> vector collection for this model
+        shared_cache_size: Entries kept in the shared collection before the oldest are evicted
+    """
+
+    name: str
+    dimensions: int
+
+    def __init__(
+        self,
+        batch_size: int = 64,
+        cache_size: int = 10_000,
+        shared_cache: VectorBackend | None = None,
+        shared_cache_size: int = 1_000_000,
+    ):
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.shared_cache = shared_cache
+        self.shared_cache_size = shared_cache_size
+        self.stats = EmbeddingStats()
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed one batch with the model; returns a (len(texts), dimensions) array."""
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, reusing cached vectors for text seen before."""
+        hashes = [content_hash(t) for t in texts]
+        vectors: dict[str, list[float]] = {}
+        with self._lock:
+            for key in hashes:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    vectors[key] = self._cache[key]
+
+        missing = {
+            key: text for key, text in zip(hashes, texts, strict=True) if key not in vectors
+        }
+        self.stats.texts += len(texts)
+        self.stats.cache_hits += len(texts) - len(missing)
+
+        if missing and self.shared_cache is not None:
+            shared = self._lookup_shared(list(missing))
+            self.stats.shared_cache_hits += len(shared)
+            vectors.update(shared)
+            self._remember(shared)
+            missing = {key: text for key, text in missing.items() if key not in shared}
+
+        if missing:
+            keys, pending = list(missing), list(missing.values())
+            start = time.perf_counter()
+            for i in range(0, len(pending), self.batch_size):
+                batch = self._embed_batch(pending[i : i + self.batch_size])
+                vectors.update(zip(keys[i : i + self.batch_size], batch.tolist(), strict=True))
+                self.stats.batches += 1
+            self.stats.seconds += time.perf_counter() - start
+            computed = {key: vectors[key] for key in keys}
+            self._remember(computed)
+            self._store_shared(computed)
+
+        return [vectors[key] for key in hashes]
+
+    def embed_one(self, text: str) -> list[float]:
+        """Embed a single text (cached)."""
+        return self.embed([text])[0]
+
+    def _lookup_shared(self, keys: list[str]) -> dict[str, list[float]]:
+        assert self.shared_cache is not None
+        try:
+            records = self.shared_cache.get(ids=keys, include_embeddings=True)
+        except Exception:
+            logger.warning("Shared embedding cache unavailable", exc_info=True)
+            return {}
+        return {r.id: r.embedding for r in records if r.embedding is not None}
+
+    def _store_shared(self, vectors: dict[str, list[float]]) -> None:
+        if self.shared_cache is None or not vectors:
+            return
+        try:
+            self.shared_cache.upsert(
+                ids=list(vectors),
+                embeddings=list(vectors.values()),
+                metadatas=[{"model": self.name, "stored_at": time.time()}] * len(vectors),
+            )
+            self._evict_shared()
+        except Exception:
+            logger.warning("Shared embedding cache unavailable", exc_info=True)
+
+    def _evict_shared(self) -> None:
+        """Trim the shared cache to 90% of its bound once it exceeds it, oldest stored first.
+
+        Store times are scanned page by page; trimming 10% at a time keeps the
+        scans rare.
+        """
+        assert self.shared_cache is not None
+        size = self.shared_cache.count()
+        if size <= self.shared_cache_size:
+            return
+        excess = size - int(self.shared_cache_size * 0.9)
+        oldest = heapq.nsmallest(excess, self._shared_store_times())
+        self.shared_cache.delete([record_id for _, record_id in oldest])
+        logger.info("Evicted %d shared embedding cache entries", len(oldest))
+
+    def _shared_store_times(self) -> Iterator[tuple[float, str]]:
+        """(stored_at, id) of every shared cache entry; 0 for entries without one."""
+        assert self.shared_cache is not None
+        offset = 0
+        while True:
+            page = self.shared_cache.get(limit=SHARED_SCAN_PAGE, offset=offset)
+            yield from ((r.metadata.get("stored_at", 0.0), r.id) for r in page)
+            if len(page) < SHARED_SCAN_PAGE:
+                return
+            offset += len(page)
+
+    def _remember(self, vectors: dict[str, list[float]]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache.update(vectors)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+class MiniLMProvider(EmbeddingProvider):
+    """all-MiniLM-L6-v2 through ONNX Runtime on CPU.
+
+    The same model a Chroma server applies by default, so switching to
+    client-side embedding keeps existing collections comparable. The model is
+    downloaded once to ChromaDB's cache directory on first use.
+    """
+
+    name = "all-MiniLM-L6-v2"
+    dimensions = 384
+
+    def __init__(
+        self,
+        batch_size: int = 64,
+        cache_size: int = 10_000,
+        shared_cache: VectorBackend | None = None,
+        shared_cache_size: int = 1_000_000,
+    ):
+        super().__init__(batch_size, cache_size, shared_cache, shared_cache_size)
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        self._model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        return np.asarray(self._model(texts), dtype=np.float32)
+
+
+class HashingProvider(EmbeddingProvider):
+    """Feature-hashed bag of words, L2-normalised.
+
+    Texts sharing words land close together, which is enough for
+    deterministic semantic-search tests without a model download.
+    """
+
+    name = "hashing-384"
+    dimensions = 384
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+_PROVIDERS: dict[str, type[EmbeddingProvider]] = {
+    "minilm": MiniLMProvider,
+    "hashing": HashingProvider,
+}
+
+
+@lru_cache
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get the process-wide provider configured by ``settings.embedding_model``."""
+    settings = get_settings()
+    provider_cls = _PROVIDERS[settings.embedding_model]
+    shared_cache = None
+    if settings.embedding_shared_cache:
+        collection = f"embedding_cache_{provider_cls.name}".replace("-", "_")[:63]
+        try:
+            shared_cache = get_vector_backend(collection, metadata={"model": provider_cls.name})
+        except Exception:
+            logger.warning("Shared embedding cache disabled", exc_info=True)
+
+    provider = provider_cls(
+        batch_size=settings.embedding_batch_size,
+        cache_size=settings.embedding_cache_size,
+        shared_cache=shared_cache,
+        shared_cache_size=settings.embedding_shared_cache_size,
+    )
+    logger.info("Embedding with %s (%d dimensions)", provider.name, provider.dimensions)
+    return provider
@@ -2,6 +2,7 @@
 
 from app.models.passport import (
     ConfidenceVector,
+    ContextRef,
     LedgerEntry,
     Mission,
     Passport,
@@ -10,6 +11,7 @@ from app.models.passport import (
 
 __all__ = [
     "ConfidenceVector",
+    "ContextRef",
     "LedgerEntry",
     "Mission",
     "Passport",
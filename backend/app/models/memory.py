@@ -84,6 +84,38 @@ class MemoryResolution(str, Enum):
     FULL = "full"         # Complete content, loaded on demand
 
 
+class QueryIntent(str, Enum):
+    """Why a query is asked; the question determines the base resolution."""
+
+    ROUTE = "route"       # Where should this go?
+    MONITOR = "monitor"   # Is anything broken?
+    REASON = "reason"     # Why is X blocked?
+    DECIDE = "decide"     # Should we approve?
+    DRAFT = "draft"       # Write the response
+    AUDIT = "audit"       # Investigate this
+
+
+RESOLUTION_BY_INTENT = {
+    QueryIntent.ROUTE: MemoryResolution.MICRO,
+    QueryIntent.MONITOR: MemoryResolution.MICRO,
+    QueryIntent.REASON: MemoryResolution.SUMMARY,
+    QueryIntent.DECIDE: MemoryResolution.SUMMARY,
+    QueryIntent.DRAFT: MemoryResolution.FULL,
+    QueryIntent.AUDIT: MemoryResolution.FULL,
+}
+
+
+class PrefetchRule(BaseModel):
+    """Load matching nodes at a higher resolution in the same query.
+
+    The condition is a UNI-Q status/caveat/priority symbol ("⊘", "⚑", "⁺")
+    or a literal tag ("outcome:denied").
+    """
+
+    condition: str
+    resolution: MemoryResolution = MemoryResolution.SUMMARY
+
+
 # =============================================================================
 # BASE MEMORY NODE
 # =============================================================================
@@ -254,6 +286,25 @@ class RelationshipRule(BaseModel):
     allowed_relations: list[RelationType]
 
 
+class RankingWeights(BaseModel):
+    """How hybrid retrieval ranks candidates for a team.
+
+    Lexical and vector candidate lists are fused with reciprocal rank fusion
+    (each list contributes weight / (rrf_k + rank)); the normalised fusion
+    score is then blended with the node's quality signals.
+    """
+
+    lexical: float = Field(default=1.0, ge=0.0, description="RRF weight of full-text ranks")
+    vector: float = Field(default=1.0, ge=0.0, description="RRF weight of embedding ranks")
+    rrf_k: int = Field(default=60, ge=1, description="RRF rank offset")
+
+    relevance: float = Field(default=1.0, ge=0.0, description="Weight of the fused rank")
+    salience: float = Field(default=0.2, ge=0.0)
+    confidence: float = Field(default=0.1, ge=0.0)
+    recency: float = Field(default=0.1, ge=0.0)
+    recency_half_life_days: float = Field(default=90.0, gt=0.0)
+
+
 class TeamMemorySchema(BaseModel):
     """Pluggable memory schema for a team.
 
@@ -278,6 +329,9 @@ class TeamMemorySchema(BaseModel):
     # Extension types (added at runtime)
     extension_types: dict[str, TypeDefinition] = Field(default_factory=dict)
 
+    # Hybrid retrieval ranking
+    ranking: RankingWeights = Field(default_factory=RankingWeights)
+
     # Schema metadata
     version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -415,6 +469,11 @@ class PrecedentContext(BaseModel):
     applicable_policies: list[str] = Field(default_factory=list)  # symbols
     entity_history: list[str] = Field(default_factory=list)  # symbols
     pattern_summary: str = ""
+    outcome_distribution: dict[str, float] = Field(
+        default_factory=dict,
+        description="Outcome -> share of similar cases, weighted by similarity",
+    )
+    key_factors: list[str] = Field(default_factory=list)  # Most common first
 
 
 # =============================================================================
@@ -444,6 +503,8 @@ class MemoryQuery(BaseModel):
 
     # Output control
     resolution: MemoryResolution = MemoryResolution.SUMMARY
+    intent: QueryIntent | None = None  # Overrides resolution when set
+    prefetch: list[PrefetchRule] = Field(default_factory=list)
     limit: int = 10
     offset: int = 0
 
@@ -453,8 +514,28 @@ class MemoryQueryResult(BaseModel):
 
     nodes: list[MemoryNode]
     total_count: int
+    total_is_estimate: bool = False
+    next_cursor: str | None = None  # Pass to MemoryQueryBuilder.after() for the next page
     query_time_ms: int
     resolution_used: MemoryResolution
+    intent: QueryIntent | None = None
+    prefetched: list[str] = Field(
+        default_factory=list,
+        description="Symbols loaded above resolution_used by prefetch rules",
+    )
+    highlights: dict[str, str] = Field(
+        default_factory=dict,
+        description="Symbol -> ts_headline snippet for text() queries above MICRO resolution",
+    )
+
+
+class RetrievalHit(BaseModel):
+    """A node from hybrid retrieval with its score breakdown."""
+
+    node: MemoryNode
+    score: float
+    lexical_rank: int | None = None  # 1-based; None if not a full-text match
+    vector_rank: int | None = None  # 1-based; None if not an embedding match
 
 
 # =============================================================================
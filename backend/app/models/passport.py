@@ -10,6 +10,10 @@ from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
+# Number of ledger entries kept on the in-memory passport. The complete history
+# lives in the ledger_entries table and is written incrementally by LedgerWriter.
+LEDGER_TAIL_SIZE = 20
+
 
 class ConfidenceVector(BaseModel):
     """Evidence-based confidence with historical calibration."""
@@ -34,6 +38,7 @@ class LedgerEntry(BaseModel):
     """Immutable record of an agent action."""
 
     id: UUID = Field(default_factory=uuid4)
+    sequence: int = Field(default=0, description="Position in the passport's ledger")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     agent_id: str
     action: str
@@ -47,6 +52,43 @@ class LedgerEntry(BaseModel):
     notes: str = ""
 
 
+class ContextRef(BaseModel):
+    """Pointer to a context value held in the artifact store.
+
+    Large context values (retrieved nodes, drafts, analyses) are stored by
+    reference so the passport stays small; only the ref and a short summary
+    travel inline.
+    """
+
+    artifact_ref: str
+    summary: str = ""
+    size_bytes: int = 0
+
+    @classmethod
+    def parse(cls, value: Any) -> "ContextRef | None":
+        """Return the ContextRef if a context value is a reference."""
+        if isinstance(value, dict) and "artifact_ref" in value:
+            return cls.model_validate(value)
+        return None
+
+    @staticmethod
+    def summarize(value: Any, max_chars: int = 200) -> str:
+        """Build a short inline summary for an offloaded value."""
+        if isinstance(value, list):
+            labels = []
+            for item in value[:10]:
+                if isinstance(item, dict):
+                    labels.append(item.get("micro") or item.get("symbol") or "")
+                else:
+                    labels.append(str(item))
+            text = f"{len(value)} items: " + "; ".join(label for label in labels if label)
+        elif isinstance(value, dict):
+            text = "keys: " + ", ".join(str(k) for k in value)
+        else:
+            text = str(value)
+        return text if len(text) <= max_chars else text[: max_chars - 3] + "..."
+
+
 class RoutingInfo(BaseModel):
     """Where the passport should go next."""
 
@@ -97,10 +139,13 @@ class Passport(BaseModel):
     # Routing
     routing: RoutingInfo = Field(default_factory=RoutingInfo)
 
-    # Audit trail (append-only)
+    # Audit trail (append-only). Only the most recent LEDGER_TAIL_SIZE entries are
+    # kept here; ledger_sequence counts every entry ever appended.
     ledger: list[LedgerEntry] = Field(default_factory=list)
+    ledger_sequence: int = 0
 
-    # Working memory (mutable, agent-specific)
+    # Working memory (mutable, agent-specific). Large values are replaced by
+    # ContextRef dicts pointing into the artifact store.
     context: dict[str, Any] = Field(default_factory=dict)
 
     # Artifacts produced
@@ -119,9 +164,15 @@ class Passport(BaseModel):
         duration_ms: int,
         confidence: ConfidenceVector,
         **kwargs: Any,
-    ) -> None:
-        """Append a new entry to the immutable ledger."""
+    ) -> LedgerEntry:
+        """Append a new entry to the immutable ledger.
+
+        Older entries are dropped from the in-memory tail once it exceeds
+        LEDGER_TAIL_SIZE; callers persist the returned entry.
+        """
+        self.ledger_sequence += 1
         entry = LedgerEntry(
+            sequence=self.ledger_sequence,
             agent_id=agent_id,
             action=action,
             inputs_summary=inputs_summary,
@@ -131,4 +182,7 @@ class Passport(BaseModel):
             **kwargs,
         )
         self.ledger.append(entry)
+        if len(self.ledger) > LEDGER_TAIL_SIZE:
+            del self.ledger[:-LEDGER_TAIL_SIZE]
         self.updated_at = datetime.utcnow()
+        return entry
@@ -1,5 +1,6 @@
 """Platform orchestration modules."""
 
+from app.platform.ledger import LedgerWriteError, LedgerWriter
 from app.platform.orchestrator import Orchestrator, TeamConfig
 
-__all__ = ["Orchestrator", "TeamConfig"]
+__all__ = ["LedgerWriteError", "LedgerWriter", "Orchestrator", "TeamConfig"]
@@ -0,0 +1,171 @@
+"""Incremental, ordered persistence of passport ledger entries."""
+
+import asyncio
+import logging
+from types import TracebackType
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import LedgerEntryModel
+from app.models.passport import LedgerEntry
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerWriteError(RuntimeError):
+    """Raised when ledger entries could not be persisted."""
+
+
+class LedgerWriter:
+    """Batched async writer for the append-only audit ledger.
+
+    Agents hand entries to the writer as soon as they are appended to a
+    passport. A single background task drains the queue in FIFO order and
+    commits each batch in its own transaction, so the audit trail survives a
+    crash mid-mission and rows are always written in append order.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 50,
+        flush_interval: float = 0.25,
+        max_retries: int = 3,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        self._queue: asyncio.Queue[tuple[UUID, LedgerEntry] | None] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+        self._failed: list[tuple[UUID, LedgerEntry]] = []
+
+    async def __aenter__(self) -> "LedgerWriter":
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            await self.close()
+            return
+        # Don't mask the exception in flight: log lost entries instead of raising
+        await self._stop()
+        if self._failed:
+            lost = ", ".join(f"{pid}#{entry.sequence}" for pid, entry in self._failed)
+            logger.error("Ledger entries lost while handling %s: %s", exc_type.__name__, lost)
+            self._failed = []
+
+    def start(self) -> None:
+        """Start the background flush task if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def append(self, passport_id: UUID, entry: LedgerEntry) -> None:
+        """Queue an entry for persistence."""
+        self.start()
+        await self._queue.put((passport_id, entry))
+
+    async def flush(self) -> None:
+        """Wait until every queued entry has been written."""
+        if self._task is not None:
+            await self._queue.join()
+        self._raise_if_failed()
+
+    async def close(self) -> None:
+        """Flush remaining entries and stop the background task.
+
+        Raises LedgerWriteError if any entry could not be persisted.
+        """
+        await self._stop()
+        self._raise_if_failed()
+
+    # -------------------------------------------------------------------------
+    # Background Task
+    # -------------------------------------------------------------------------
+
+    async def _stop(self) -> None:
+        """Drain the queue and wait for the background task to finish."""
+        if self._task is not None and not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until the stop sentinel is received."""
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    next_item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if next_item is None:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(next_item)
+
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: list[tuple[UUID, LedgerEntry]]) -> None:
+        """Write one batch, retrying transient failures with backoff."""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.session_factory() as session:
+                    session.add_all([self._to_model(pid, entry) for pid, entry in batch])
+                    await session.commit()
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception("Failed to persist %d ledger entries", len(batch))
+                    self._failed.extend(batch)
+                    return
+                await asyncio.sleep(0.1 * 2**attempt)
+
+    def _raise_if_failed(self) -> None:
+        if self._failed:
+            count = len(self._failed)
+            self._failed = []
+            raise LedgerWriteError(f"{count} ledger entries could not be persisted")
+
+    @staticmethod
+    def _to_model(passport_id: UUID, entry: LedgerEntry) -> LedgerEntryModel:
+        """Convert a Pydantic ledger entry to its database row."""
+        return LedgerEntryModel(
+            id=entry.id,
+            passport_id=passport_id,
+            sequence=entry.sequence,
+            agent_id=entry.agent_id,
+            action=entry.action,
+            inputs_summary=entry.inputs_summary,
+            outputs_summary=entry.outputs_summary,
+            duration_ms=entry.duration_ms,
+            tokens_used=entry.tokens_used,
+            cost_usd=entry.cost_usd,
+            confidence=entry.confidence.model_dump(),
+            tool_calls=entry.tool_calls,
+            notes=entry.notes,
+            timestamp=entry.timestamp,
+        )
@@ -9,6 +9,7 @@ from pydantic import BaseModel
 
 from app.agents.base import Agent
 from app.models.passport import Passport
+from app.platform.ledger import LedgerWriter
 
 
 @dataclass
@@ -37,9 +38,11 @@ class Orchestrator:
         self,
         config: TeamConfig,
         checkpointer: BaseCheckpointSaver | None = None,
+        ledger_writer: LedgerWriter | None = None,
     ):
         self.config = config
         self.checkpointer = checkpointer
+        self.ledger_writer = ledger_writer
         self.graph = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
@@ -81,7 +84,7 @@ class Orchestrator:
         """Create a node function for an agent."""
 
         async def node(state: PassportState) -> PassportState:
-            passport = await agent.execute(state.passport)
+            passport = await agent.execute(state.passport, ledger_writer=self.ledger_writer)
             return PassportState(
                 passport=passport,
                 iteration=state.iteration + 1,
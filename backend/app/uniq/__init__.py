@@ -0,0 +1,55 @@
+"""UNI-Q symbolic encoding for memory nodes, passports and agent messages."""
+
+from app.uniq.adapters import (
+    condition_tags,
+    decode_ledger_entry,
+    decode_node,
+    decode_passport_status,
+    encode_ledger_entry,
+    encode_node,
+    encode_passport_status,
+    node_entity,
+)
+from app.uniq.codec import (
+    Ref,
+    UniqEntity,
+    UniqMessage,
+    UniqParseError,
+    encode,
+    encode_many,
+    iter_entities,
+    iter_entity,
+    parse,
+    parse_many,
+    write_entities,
+)
+from app.uniq.symbols import Caveat, Layer, MessageType, Priority, Relation, Status, Trend
+
+__all__ = [
+    "Caveat",
+    "Layer",
+    "MessageType",
+    "Priority",
+    "Ref",
+    "Relation",
+    "Status",
+    "Trend",
+    "UniqEntity",
+    "UniqMessage",
+    "UniqParseError",
+    "condition_tags",
+    "decode_ledger_entry",
+    "decode_node",
+    "decode_passport_status",
+    "encode",
+    "encode_ledger_entry",
+    "encode_many",
+    "encode_node",
+    "encode_passport_status",
+    "iter_entities",
+    "iter_entity",
+    "node_entity",
+    "parse",
+    "parse_many",
+    "write_entities",
+]
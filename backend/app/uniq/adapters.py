@@ -0,0 +1,283 @@
+"""Map platform models to and from UNI-Q entities.
+
+Memory nodes keep status, priority and caveats as structured tags
+(``status:blocked``, ``priority:high``, ``flag:conditional``); the encoder lifts
+those into symbols and the decoder folds them back into tags. Relationship
+types without a spec operator collapse to ``∼`` (related-to), so the micro
+form is lossy for them by design; storage keeps the typed edge.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from app.models.memory import MemoryLayer, MemoryNode, MemoryResolution, RelationType
+from app.models.passport import LedgerEntry, Passport
+from app.uniq.codec import (
+    Ref,
+    UniqEntity,
+    clean_name,
+    clean_tag,
+    clean_text,
+    encode,
+    parse,
+)
+from app.uniq.symbols import Caveat, Layer, Priority, Relation, Status
+
+STATUS_TAG = "status"
+PRIORITY_TAG = "priority"
+FLAG_TAG = "flag"
+
+LAYER_FOR_MEMORY = {
+    MemoryLayer.STRATEGIC: Layer.STRATEGIC,
+    MemoryLayer.OPERATIONAL: Layer.OPERATIONAL,
+    MemoryLayer.ENTITY: Layer.ENTITY,
+    MemoryLayer.EVENT: Layer.EVENT,
+}
+MEMORY_FOR_LAYER = {v: k for k, v in LAYER_FOR_MEMORY.items()}
+
+RELATION_FOR_TYPE = {
+    RelationType.INVOLVES: Relation.INVOLVES,
+    RelationType.APPLIES: Relation.APPLIES,
+    RelationType.ALIGNED_WITH: Relation.ALIGNED_WITH,
+    RelationType.RELATED_TO: Relation.RELATED_TO,
+    RelationType.BLOCKED_BY: Relation.DEPENDS_ON,
+}
+TYPE_FOR_RELATION = {v: k for k, v in RELATION_FOR_TYPE.items()}
+TYPE_FOR_RELATION[Relation.BLOCKS] = RelationType.BLOCKED_BY  # Reversed on decode
+
+PASSPORT_STATUS = {
+    "pending": Status.PENDING,
+    "in_progress": Status.ACTIVE,
+    "blocked": Status.BLOCKED,
+    "completed": Status.COMPLETE,
+    "failed": Status.ERROR,
+    "escalated": Status.CRITICAL_ACTIVE,
+}
+PASSPORT_STATUS_FOR = {v: k for k, v in PASSPORT_STATUS.items()}
+PASSPORT_STATUS_FOR[Status.CRITICAL_BLOCKED] = "blocked"
+PASSPORT_STATUS_FOR[Status.IDLE] = "pending"
+
+PRIORITY_FOR_ROUTING = {
+    "urgent": Priority.URGENT,
+    "high": Priority.HIGH,
+    "normal": None,
+    "low": Priority.LOW,
+}
+ROUTING_FOR_PRIORITY = {v: k for k, v in PRIORITY_FOR_ROUTING.items()}
+
+
+# =============================================================================
+# Memory nodes
+# =============================================================================
+
+
+def node_entity(
+    node: MemoryNode | Mapping[str, Any],
+    resolution: MemoryResolution = MemoryResolution.MICRO,
+) -> UniqEntity:
+    """Build the UNI-Q entity for a memory node or a dumped node dict.
+
+    The micro or summary text rides along as the entity's free text; FULL is
+    not a UNI-Q resolution and falls back to the summary.
+    """
+    if isinstance(node, MemoryNode):
+        symbol, tags, relationships = node.symbol, node.tags, node.relationships
+        text = node.micro if resolution == MemoryResolution.MICRO else node.summary
+    else:
+        symbol, tags = node["symbol"], node.get("tags") or []
+        relationships = node.get("relationships") or []
+        key = "micro" if resolution == MemoryResolution.MICRO else "summary"
+        text = node.get(key) or node.get("micro", "")
+
+    entity = UniqEntity(ref=symbol_ref(symbol), text=clean_text(text))
+    for tag in tags:
+        key, sep, value = tag.partition(":")
+        if sep and key == STATUS_TAG and value.upper() in Status.__members__:
+            entity.status = Status[value.upper()]
+        elif sep and key == PRIORITY_TAG and PRIORITY_FOR_ROUTING.get(value):
+            entity.priority = PRIORITY_FOR_ROUTING[value]
+        elif sep and key == FLAG_TAG and value.upper() in Caveat.__members__:
+            entity.caveats.append(Caveat[value.upper()])
+        else:
+            entity.tags.append(clean_tag(tag))
+
+    for rel in relationships:
+        if isinstance(rel, Mapping):
+            rel_type, target = RelationType(rel["relation_type"]), rel["target_symbol"]
+        else:
+            rel_type, target = rel.relation_type, rel.target_symbol
+        relation = RELATION_FOR_TYPE.get(rel_type, Relation.RELATED_TO)
+        entity.relations.append((relation, symbol_ref(target)))
+
+    return entity
+
+
+def encode_node(
+    node: MemoryNode | Mapping[str, Any],
+    resolution: MemoryResolution = MemoryResolution.MICRO,
+) -> str:
+    """Encode a memory node at micro or summary resolution."""
+    return encode(node_entity(node, resolution))
+
+
+def decode_node(
+    text: str,
+    resolution: MemoryResolution = MemoryResolution.MICRO,
+) -> dict[str, Any]:
+    """Parse an encoded node back into MemoryNode fields.
+
+    Returns ``symbol``, ``tags``, ``relationships`` (dicts keyed like
+    ``Relationship``) and the micro or summary text.
+    """
+    entity = parse(text)
+    symbol = ref_symbol(entity.ref)
+
+    tags: list[str] = []
+    if entity.status is not None:
+        tags.append(f"{STATUS_TAG}:{entity.status.name.lower()}")
+    if entity.priority is not None:
+        tags.append(f"{PRIORITY_TAG}:{ROUTING_FOR_PRIORITY[entity.priority]}")
+    tags.extend(f"{FLAG_TAG}:{caveat.name.lower()}" for caveat in entity.caveats)
+    tags.extend(entity.tags)
+
+    relationships = [
+        {
+            "source_symbol": symbol,
+            "target_symbol": ref_symbol(target),
+            "relation_type": TYPE_FOR_RELATION.get(relation, RelationType.RELATED_TO),
+        }
+        for relation, target in entity.relations
+    ]
+
+    key = "micro" if resolution == MemoryResolution.MICRO else "summary"
+    return {"symbol": symbol, "tags": tags, "relationships": relationships, key: entity.text}
+
+
+def condition_tags(condition: str) -> list[str]:
+    """Node tags that a UNI-Q condition symbol stands for.
+
+    ``⊘`` -> ``status:blocked``, ``⚑`` -> ``flag:attention``, ``⁺`` ->
+    ``priority:high``; ``⚠`` covers both the error status and the risk flag.
+    Anything that is not a symbol is taken as a literal tag.
+    """
+    tags = []
+    for status in Status:
+        if status.value == condition:
+            tags.append(f"{STATUS_TAG}:{status.name.lower()}")
+    for caveat in Caveat:
+        if caveat.value == condition:
+            tags.append(f"{FLAG_TAG}:{caveat.name.lower()}")
+    for priority in Priority:
+        if priority.value == condition:
+            tags.append(f"{PRIORITY_TAG}:{ROUTING_FOR_PRIORITY[priority]}")
+    return tags or [condition]
+
+
+def symbol_ref(symbol: str) -> Ref:
+    """Convert ``layer.type.id`` to a reference (``event.call.001`` -> ``Ⓥcall·001``)."""
+    layer, _, rest = symbol.partition(".")
+    kind, _, ident = rest.partition(".")
+    try:
+        prefix: Layer | None = LAYER_FOR_MEMORY[MemoryLayer(layer)]
+    except ValueError:
+        prefix, kind, ident = None, layer, rest
+    return Ref(prefix, clean_name(kind), clean_name(ident))
+
+
+def ref_symbol(ref: Ref) -> str:
+    """Convert a reference back to a memory symbol where the layer allows it."""
+    layer = MEMORY_FOR_LAYER.get(ref.layer) if ref.layer else None
+    if layer is None:
+        return str(ref)
+    return ".".join(part for part in (layer.value, ref.kind, ref.ident) if part)
+
+
+# =============================================================================
+# Passports
+# =============================================================================
+
+
+def passport_entity(passport: Passport) -> UniqEntity:
+    """Status line for a passport: ``Ⓣmatter·id◉⁺⟨agent:..·rev:..⟩⚑ reason``."""
+    tags = []
+    if passport.current_agent:
+        tags.append(f"agent:{clean_tag(passport.current_agent)}")
+    if passport.revision_count:
+        tags.append(f"rev:{passport.revision_count}")
+    tags.append(f"conf:{passport.overall_confidence.value:.2f}")
+
+    routing = passport.routing
+    return UniqEntity(
+        ref=Ref(Layer.TASK, clean_name(passport.mission.matter_type), passport.id.hex[:8]),
+        status=PASSPORT_STATUS[passport.status],
+        priority=PRIORITY_FOR_ROUTING[routing.priority],
+        tags=tags,
+        caveats=[Caveat.ATTENTION] if routing.escalation_required else [],
+        text=clean_text(routing.escalation_reason or ""),
+    )
+
+
+def encode_passport_status(passport: Passport) -> str:
+    """Encode a passport's status, priority and escalation state."""
+    return encode(passport_entity(passport))
+
+
+def decode_passport_status(text: str) -> dict[str, Any]:
+    """Parse a passport status line back into passport and routing fields."""
+    entity = parse(text)
+    revision = entity.tag("rev")
+    confidence = entity.tag("conf")
+    return {
+        "matter_type": entity.ref.kind,
+        "id_prefix": entity.ref.ident,
+        "status": PASSPORT_STATUS_FOR.get(entity.status, "pending"),
+        "priority": ROUTING_FOR_PRIORITY[entity.priority],
+        "current_agent": entity.tag("agent"),
+        "revision_count": int(revision) if revision else 0,
+        "confidence": float(confidence) if confidence else None,
+        "escalation_required": Caveat.ATTENTION in entity.caveats,
+        "escalation_reason": entity.text or None,
+    }
+
+
+# =============================================================================
+# Ledger entries
+# =============================================================================
+
+
+def ledger_entity(entry: LedgerEntry) -> UniqEntity:
+    """Ledger line: ``Ⓐagent✓⟨act:..·seq:..·ms:..·tok:..·conf:..⟩ outputs``."""
+    failed = entry.action.endswith("_error")
+    tags = [
+        f"act:{clean_tag(entry.action)}",
+        f"seq:{entry.sequence}",
+        f"ms:{entry.duration_ms}",
+    ]
+    if entry.tokens_used:
+        tags.append(f"tok:{entry.tokens_used}")
+    tags.append(f"conf:{entry.confidence.value:.2f}")
+    return UniqEntity(
+        ref=Ref(Layer.AGENT, clean_name(entry.agent_id)),
+        status=Status.ERROR if failed else Status.COMPLETE,
+        tags=tags,
+        text=clean_text(entry.outputs_summary),
+    )
+
+
+def encode_ledger_entry(entry: LedgerEntry) -> str:
+    """Encode a ledger entry summary."""
+    return encode(ledger_entity(entry))
+
+
+def decode_ledger_entry(text: str) -> dict[str, Any]:
+    """Parse an encoded ledger entry back into LedgerEntry fields."""
+    entity = parse(text)
+    return {
+        "agent_id": entity.ref.kind,
+        "action": entity.tag("act") or "",
+        "sequence": int(entity.tag("seq") or 0),
+        "duration_ms": int(entity.tag("ms") or 0),
+        "tokens_used": int(entity.tag("tok") or 0),
+        "confidence": float(entity.tag("conf") or 0.0),
+        "outputs_summary": entity.text,
+    }
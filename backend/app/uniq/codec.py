@@ -0,0 +1,340 @@
+"""Streaming UNI-Q encoder and single-pass parser.
+
+An entity line has the canonical shape::
+
+    <layer><kind>[·<ident>]<status><priority><progress><trend>⟨tags⟩<caveats><relations> text
+
+e.g. ``Ⓥdecision·ref4721✓⟨amt:450⟩⚑⊂Ⓔmaria-chen Denied, escalated``. Every part
+after the reference is optional. Free text starts at the first space and runs
+to the next ``;`` or the end of the line, so several entities can share a line;
+``;`` and ``\\`` inside the text are escaped with a backslash.
+
+Encoding yields string fragments instead of building intermediate strings,
+so callers can feed a writer directly; ``encode`` joins them once. The parser
+is tolerant of the non-canonical orderings used in the spec examples (tags
+after a relation target, for instance) and never backtracks.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from app.uniq.symbols import (
+    ATTR,
+    ENTITY_SEP,
+    PROGRESS_SYMBOLS,
+    RESERVED,
+    SECTION,
+    TAG_CLOSE,
+    TAG_OPEN,
+    TEXT_ESCAPE,
+    Caveat,
+    Layer,
+    MessageType,
+    Priority,
+    Relation,
+    Status,
+    Trend,
+)
+
+_LAYERS = {m.value: m for m in Layer}
+_STATUSES = {m.value: m for m in Status}
+_TRENDS = {m.value: m for m in Trend}
+_RELATIONS = {m.value: m for m in Relation}
+_CAVEATS = {m.value: m for m in Caveat}
+_MESSAGE_TYPES = {m.value: m for m in MessageType}
+_PROGRESS = {ch: i for i, ch in enumerate(PROGRESS_SYMBOLS)}
+
+_HIGH = Priority.HIGH.value
+_LOW = Priority.LOW.value
+_TAG_RESERVED = str.maketrans({ATTR: "-", TAG_OPEN: "-", TAG_CLOSE: "-", SECTION: "-"})
+_TEXT_ESCAPES = str.maketrans(
+    {TEXT_ESCAPE: TEXT_ESCAPE * 2, ENTITY_SEP: TEXT_ESCAPE + ENTITY_SEP}
+)
+
+
+class UniqParseError(ValueError):
+    """Raised when a string is not valid UNI-Q."""
+
+
+class Ref(NamedTuple):
+    """Entity reference: layer prefix, kind and optional identifier."""
+
+    layer: Layer | None
+    kind: str
+    ident: str = ""
+
+    def __str__(self) -> str:
+        return "".join(_iter_ref(self))
+
+
+@dataclass
+class UniqEntity:
+    """One parsed or to-be-encoded UNI-Q entity."""
+
+    ref: Ref
+    status: Status | None = None
+    priority: Priority | None = None
+    progress: int | None = None  # Tenths, 0-10
+    trend: Trend | None = None
+    tags: list[str] = field(default_factory=list)
+    caveats: list[Caveat] = field(default_factory=list)
+    relations: list[tuple[Relation, Ref]] = field(default_factory=list)
+    text: str = ""
+
+    def tag(self, key: str) -> str | None:
+        """Value of the first ``key:value`` tag, if any."""
+        prefix = f"{key}:"
+        for tag in self.tags:
+            if tag.startswith(prefix):
+                return tag[len(prefix):]
+        return None
+
+
+@dataclass
+class UniqMessage:
+    """Agent message: ``type:context[:flag...]│section│section...``."""
+
+    type: MessageType
+    context_id: str
+    flags: list[str] = field(default_factory=list)
+    sections: list[str] = field(default_factory=list)
+
+    def encode(self) -> str:
+        header = ":".join([self.type.value, self.context_id, *self.flags])
+        return SECTION.join([header, *self.sections])
+
+    @classmethod
+    def parse(cls, text: str) -> "UniqMessage":
+        header, *sections = text.strip().split(SECTION)
+        parts = header.split(":")
+        if len(parts) < 2 or parts[0] not in _MESSAGE_TYPES:
+            raise UniqParseError(f"Invalid message header: {header!r}")
+        return cls(
+            type=_MESSAGE_TYPES[parts[0]],
+            context_id=parts[1],
+            flags=parts[2:],
+            sections=sections,
+        )
+
+    def entities(self, index: int) -> list[UniqEntity]:
+        """Parse the entities in one body section."""
+        return list(parse_many(self.sections[index]))
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+
+def clean_name(value: str) -> str:
+    """Make a string safe to use as a reference kind or identifier."""
+    return "".join("-" if ch in RESERVED or ch.isspace() else ch for ch in value)
+
+
+def clean_tag(value: str) -> str:
+    """Make a string safe to use inside a tag group."""
+    return " ".join(value.translate(_TAG_RESERVED).split())
+
+
+def clean_text(value: str) -> str:
+    """Collapse free text onto a single line."""
+    return " ".join(value.split())
+
+
+def iter_entity(entity: UniqEntity) -> Iterator[str]:
+    """Yield the canonical encoding of an entity fragment by fragment.
+
+    Names, tags and text are assumed clean (see ``clean_name``/``clean_tag``);
+    adapters clean values at the boundary so this stays a plain walk. Text is
+    escaped here, so a ``;`` in it never ends the entity.
+    """
+    yield from _iter_ref(entity.ref)
+    if entity.status is not None:
+        yield entity.status.value
+    if entity.priority is not None:
+        yield entity.priority.value
+    if entity.progress is not None:
+        yield PROGRESS_SYMBOLS[max(0, min(10, entity.progress))]
+    if entity.trend is not None:
+        yield entity.trend.value
+    if entity.tags:
+        yield TAG_OPEN
+        for i, tag in enumerate(entity.tags):
+            if i:
+                yield ATTR
+            yield tag
+        yield TAG_CLOSE
+    elif entity.status is None and Caveat.RISK in entity.caveats:
+        # A bare ⚠ straight after the reference reads as the error status
+        yield TAG_OPEN + TAG_CLOSE
+    for caveat in entity.caveats:
+        yield caveat.value
+    for relation, target in entity.relations:
+        yield relation.value
+        yield from _iter_ref(target)
+    if entity.text:
+        yield " "
+        yield entity.text.translate(_TEXT_ESCAPES)
+
+
+def iter_entities(entities: Iterable[UniqEntity], sep: str = "\n") -> Iterator[str]:
+    """Yield fragments for many entities, one per line by default."""
+    for i, entity in enumerate(entities):
+        if i:
+            yield sep
+        yield from iter_entity(entity)
+
+
+def write_entities(
+    entities: Iterable[UniqEntity],
+    write: Callable[[str], object],
+    sep: str = "\n",
+) -> None:
+    """Stream entities into a writer such as ``io.StringIO.write``."""
+    for fragment in iter_entities(entities, sep):
+        write(fragment)
+
+
+def encode(entity: UniqEntity) -> str:
+    """Encode one entity."""
+    return "".join(iter_entity(entity))
+
+
+def encode_many(entities: Iterable[UniqEntity], sep: str = "\n") -> str:
+    """Encode many entities into one string."""
+    return "".join(iter_entities(entities, sep))
+
+
+def _iter_ref(ref: Ref) -> Iterator[str]:
+    if ref.layer is not None:
+        yield ref.layer.value
+    yield ref.kind
+    if ref.ident:
+        yield ATTR
+        yield ref.ident
+
+
+# =============================================================================
+# Parsing
+# =============================================================================
+
+
+def parse(text: str) -> UniqEntity:
+    """Parse exactly one entity."""
+    entity, pos = _parse_entity(text, 0)
+    if pos != len(text):
+        raise UniqParseError(f"Trailing input at {pos}: {text[pos:]!r}")
+    return entity
+
+
+def parse_many(text: str) -> Iterator[UniqEntity]:
+    """Parse entities separated by newlines or ``;``."""
+    for line in text.splitlines():
+        pos = 0
+        end = len(line)
+        while pos < end:
+            while pos < end and line[pos] in " \t":
+                pos += 1
+            if pos == end:
+                break
+            entity, pos = _parse_entity(line, pos)
+            yield entity
+            if pos < end and line[pos] == ENTITY_SEP:
+                pos += 1
+
+
+def _parse_entity(text: str, pos: int) -> tuple[UniqEntity, int]:
+    ref, pos = _parse_ref(text, pos)
+    entity = UniqEntity(ref=ref)
+    end = len(text)
+    seen_tail = False  # Tags, caveats or relations already parsed
+
+    while pos < end:
+        ch = text[pos]
+
+        if ch == " ":
+            entity.text, pos = _parse_text(text, pos + 1)
+            return entity, pos
+        if ch == ENTITY_SEP:
+            return entity, pos
+
+        if ch in _STATUSES and not (ch == Status.ERROR.value and (seen_tail or entity.status)):
+            entity.status = _STATUSES[ch]
+            pos += 1
+        elif ch == _HIGH:
+            if pos + 1 < end and text[pos + 1] == _HIGH:
+                entity.priority = Priority.URGENT
+                pos += 2
+            else:
+                entity.priority = Priority.HIGH
+                pos += 1
+        elif ch == _LOW:
+            entity.priority = Priority.LOW
+            pos += 1
+        elif ch in _PROGRESS:
+            entity.progress = _PROGRESS[ch]
+            pos += 1
+        elif ch == TAG_OPEN:
+            close = text.find(TAG_CLOSE, pos + 1)
+            if close < 0:
+                raise UniqParseError(f"Unclosed tag group at {pos}: {text!r}")
+            body = text[pos + 1:close]
+            if body:
+                entity.tags.extend(body.split(ATTR))
+            pos = close + 1
+            seen_tail = True
+        elif ch in _CAVEATS:
+            entity.caveats.append(_CAVEATS[ch])
+            pos += 1
+            seen_tail = True
+        elif ch in _RELATIONS and _starts_ref(text, pos + 1):
+            target, pos = _parse_ref(text, pos + 1)
+            entity.relations.append((_RELATIONS[ch], target))
+            seen_tail = True
+        elif ch in _TRENDS:
+            entity.trend = _TRENDS[ch]
+            pos += 1
+        else:
+            raise UniqParseError(f"Unexpected {ch!r} at {pos}: {text!r}")
+
+    return entity, pos
+
+
+def _parse_text(text: str, pos: int) -> tuple[str, int]:
+    """Free text up to the next unescaped ``;`` or the end, unescaped."""
+    end = len(text)
+    chunks: list[str] = []
+    while pos < end:
+        sep = text.find(ENTITY_SEP, pos)
+        esc = text.find(TEXT_ESCAPE, pos, sep if sep >= 0 else end)
+        if esc < 0:
+            stop = sep if sep >= 0 else end
+            chunks.append(text[pos:stop])
+            return "".join(chunks), stop
+        chunks.append(text[pos:esc])
+        chunks.append(text[esc + 1:esc + 2])
+        pos = esc + 2
+    return "".join(chunks), end
+
+
+def _starts_ref(text: str, pos: int) -> bool:
+    if pos >= len(text):
+        return False
+    ch = text[pos]
+    return ch in _LAYERS or not (ch in RESERVED or ch.isspace())
+
+
+def _parse_ref(text: str, pos: int) -> tuple[Ref, int]:
+    layer = _LAYERS.get(text[pos]) if pos < len(text) else None
+    if layer is not None:
+        pos += 1
+    start = pos
+    end = len(text)
+    while pos < end and text[pos] not in RESERVED and not text[pos].isspace():
+        pos += 1
+    name = text[start:pos]
+    kind, _, ident = name.partition(ATTR)
+    if not kind and layer is None:
+        raise UniqParseError(f"Expected an entity reference at {start}: {text!r}")
+    return Ref(layer, kind, ident), pos
@@ -0,0 +1,111 @@
+"""UNI-Q symbol vocabulary (planning/research/UNIQ_SPEC.md, core set)."""
+
+from enum import Enum
+
+
+class Layer(str, Enum):
+    """Layer prefixes for entity references."""
+
+    STRATEGIC = "Ⓢ"
+    OPERATIONAL = "Ⓞ"
+    ENTITY = "Ⓔ"
+    EVENT = "Ⓥ"
+    AGENT = "Ⓐ"
+    TASK = "Ⓣ"
+    DOCUMENT = "Ⓓ"
+
+
+class Status(str, Enum):
+    """Status indicators."""
+
+    ACTIVE = "◉"
+    IDLE = "○"
+    BLOCKED = "⊘"
+    ERROR = "⚠"
+    COMPLETE = "✓"
+    PENDING = "◐"
+    CRITICAL_ACTIVE = "⦿"
+    CRITICAL_BLOCKED = "⊗"
+    REJECTED = "✗"
+
+
+class Priority(str, Enum):
+    """Priority modifiers. Normal priority has no symbol."""
+
+    URGENT = "⁺⁺"
+    HIGH = "⁺"
+    LOW = "⁻"
+
+
+class Trend(str, Enum):
+    """Trend indicators."""
+
+    IMPROVING = "↗"
+    STABLE = "≡"
+    DEGRADING = "↘"
+    VOLATILE = "↯"
+
+
+class Relation(str, Enum):
+    """Relationship operators."""
+
+    DEPENDS_ON = "→"
+    BLOCKS = "←"
+    MUTUAL = "↔"
+    RELATED_TO = "∼"
+    INVOLVES = "⊂"
+    APPLIES = "⊃"
+    ALIGNED_WITH = "∧"
+
+
+class Caveat(str, Enum):
+    """Caveat flags: the micro form hides something worth zooming into."""
+
+    ATTENTION = "⚑"
+    CONDITIONAL = "⚐"
+    RISK = "⚠"
+    DISSENT = "⁑"
+    TIME_SENSITIVE = "⧖"
+
+
+class MessageType(str, Enum):
+    """Agent-to-agent message types."""
+
+    STATUS = "S"
+    QUERY = "Q"
+    DELEGATE = "D"
+    ACKNOWLEDGE = "A"
+    NOTIFY = "N"
+    RESULT = "R"
+    SUBSCRIBE = "⊕"
+    UNSUBSCRIBE = "⊖"
+    ACCEPT = "✓"
+    REJECT = "✗"
+
+
+# Progress in tenths: ⓪ = 0%, ① = 10%, ... ⑩ = 100%
+PROGRESS_SYMBOLS = "⓪①②③④⑤⑥⑦⑧⑨⑩"
+
+# Delimiters
+SECTION = "│"
+ATTR = "·"
+ENTITY_SEP = ";"
+TEXT_ESCAPE = "\\"  # Escapes ";" and itself in free text
+TAG_OPEN = "⟨"
+TAG_CLOSE = "⟩"
+
+# Every character with grammatical meaning. Names and tag text never contain
+# these; encoders replace them with "-".
+RESERVED = frozenset(
+    "".join(m.value for m in Layer)
+    + "".join(m.value for m in Status)
+    + "".join(m.value for m in Priority)
+    + "".join(m.value for m in Trend)
+    + "".join(m.value for m in Relation)
+    + "".join(m.value for m in Caveat)
+    + PROGRESS_SYMBOLS
+    + SECTION
+    + ENTITY_SEP
+    + TAG_OPEN
+    + TAG_CLOSE
+)
@@ -0,0 +1,182 @@
+"""Context-format benchmark: token cost and encode/decode time per format.
+
+Runs fully offline. Synthetic memory graphs are rendered through every
+ContextFormat (plus the raw ``repr`` agents used to interpolate), token counts
+come from the local tokenizer, and the UNI-Q codec is timed on its own.
+With ``--responses`` each prompt is replayed against a recorded-response
+fake LLM.
+
+    python -m benchmarks.context_formats --sizes 10 100 1000 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from app.agents.context import ContextFormat, ContextRenderer, ContextRules
+from app.core.tokens import count_tokens, tokenizer_name
+from app.models.memory import MemoryNode, MemoryResolution
+from app.uniq import decode_node, encode_node
+from benchmarks.factories import GraphSpec, make_graph
+from benchmarks.fake_llm import FakeLLM
+
+SCHEMA_VERSION = 1
+RAW_FORMAT = "raw_repr"
+QUESTION = "Which items are blocked or flagged, and what do they depend on?"
+MODEL = "claude-sonnet-4-20250514"
+
+
+def _time_ms(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """Median wall time of fn over repeat runs, and its last result."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3), result
+
+
+def build_context(nodes: list[MemoryNode]) -> dict[str, Any]:
+    """Context shaped the way the Librarian leaves it for downstream agents."""
+    return {
+        "request": "Review open items for the quarterly compliance report",
+        "retrieved_nodes": [node.model_dump(mode="json") for node in nodes],
+    }
+
+
+def bench_formats(context: dict[str, Any], size: int, repeat: int) -> dict[str, dict[str, Any]]:
+    """Render the context through every format with no token budget."""
+    rules = ContextRules(max_list_items=size + 1)
+    results: dict[str, dict[str, Any]] = {}
+
+    render_ms, raw = _time_ms(lambda: str(context), repeat)
+    results[RAW_FORMAT] = {"tokens": count_tokens(raw), "chars": len(raw), "render_ms": render_ms}
+
+    for fmt in ContextFormat:
+        renderer = ContextRenderer(format=fmt, rules=rules)
+        render_ms, rendered = _time_ms(lambda r=renderer: r.render(context), repeat)
+        results[fmt.value] = {
+            "tokens": rendered.tokens,
+            "chars": len(rendered.text),
+            "render_ms": render_ms,
+            "text": rendered.text,
+        }
+
+    baseline = results[RAW_FORMAT]["tokens"] or 1
+    for entry in results.values():
+        entry["ratio_vs_raw"] = round(entry["tokens"] / baseline, 4)
+    return results
+
+
+def bench_codec(nodes: list[MemoryNode], repeat: int) -> dict[str, Any]:
+    """Time UNI-Q encode and decode of every node at micro and summary."""
+    results: dict[str, Any] = {}
+    for resolution in (MemoryResolution.MICRO, MemoryResolution.SUMMARY):
+        encode_ms, encoded = _time_ms(
+            lambda res=resolution: [encode_node(node, res) for node in nodes], repeat
+        )
+        decode_ms, decoded = _time_ms(
+            lambda enc=encoded, res=resolution: [decode_node(text, res) for text in enc], repeat
+        )
+        round_trips = sum(
+            fields["symbol"] == node.symbol and set(fields["tags"]) == set(node.tags)
+            for node, fields in zip(nodes, decoded, strict=True)
+        )
+        results[resolution.value] = {
+            "encode_ms": encode_ms,
+            "decode_ms": decode_ms,
+            "encode_us_per_node": round(encode_ms * 1000 / max(1, len(nodes)), 3),
+            "decode_us_per_node": round(decode_ms * 1000 / max(1, len(nodes)), 3),
+            "tokens": count_tokens("\n".join(encoded)),
+            "round_trip_ok": round_trips,
+        }
+    return results
+
+
+async def bench_llm(llm: FakeLLM, formats: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Replay one prompt per format against the fake LLM."""
+    results = {}
+    for name, entry in formats.items():
+        if "text" not in entry:
+            continue
+        messages = [
+            {"role": "user", "content": f"Context:\n{entry['text']}\n\nQuestion: {QUESTION}"}
+        ]
+        response = await llm.messages.create(model=MODEL, messages=messages, max_tokens=1024)
+        results[name] = {
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "recorded": response.recorded,
+            "answer": response.content[0].text,
+        }
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    llm = FakeLLM.from_file(args.responses) if args.responses else None
+    runs = []
+
+    for size in args.sizes:
+        nodes = make_graph(GraphSpec(size=size, seed=args.seed))
+        context = build_context(nodes)
+        formats = bench_formats(context, size, args.repeat)
+        result: dict[str, Any] = {
+            "size": size,
+            "formats": formats,
+            "codec": bench_codec(nodes, args.repeat),
+        }
+        if llm is not None:
+            result["llm"] = await bench_llm(llm, formats)
+        if not args.keep_text:
+            for entry in formats.values():
+                entry.pop("text", None)
+        runs.append(result)
+
+    report: dict[str, Any] = {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "tokenizer": tokenizer_name(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "runs": runs,
+    }
+    if llm is not None:
+        report["llm_replay"] = {"hits": llm.hits, "misses": llm.misses}
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (median)")
+    parser.add_argument("--responses", help="Recorded responses JSON for the fake LLM")
+    parser.add_argument("--output", default="-", help="Report path ('-' for stdout)")
+    parser.add_argument(
+        "--keep-text", action="store_true", help="Include rendered text in the report"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        sys.stdout.write(payload + "\n")
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+
+
+if __name__ == "__main__":
+    main()
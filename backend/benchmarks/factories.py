@@ -0,0 +1,127 @@
+"""Synthetic memory graphs built from MemoryNode factories."""
+
+import random
+from dataclasses import dataclass
+
+from app.models.memory import (
+    MemoryLayer,
+    MemoryNode,
+    Relationship,
+    RelationType,
+)
+
+STATUSES = ["active", "idle", "blocked", "complete", "pending"]
+PRIORITIES = ["high", "normal", "normal", "normal", "low"]
+FLAGS = ["attention", "conditional", "risk", "dissent", "time_sensitive"]
+
+# Node types per layer and the relationships events draw toward other layers
+LAYER_TYPES = {
+    MemoryLayer.STRATEGIC: ["goal", "value"],
+    MemoryLayer.OPERATIONAL: ["policy", "procedure"],
+    MemoryLayer.ENTITY: ["customer", "vendor", "facility"],
+    MemoryLayer.EVENT: ["call", "decision", "inspection"],
+}
+EVENT_LINKS = {
+    MemoryLayer.ENTITY: RelationType.INVOLVES,
+    MemoryLayer.OPERATIONAL: RelationType.APPLIES,
+    MemoryLayer.STRATEGIC: RelationType.ALIGNED_WITH,
+}
+
+# Share of nodes per layer; events dominate as they do in real teams
+LAYER_MIX = [
+    (MemoryLayer.STRATEGIC, 0.05),
+    (MemoryLayer.OPERATIONAL, 0.15),
+    (MemoryLayer.ENTITY, 0.3),
+    (MemoryLayer.EVENT, 0.5),
+]
+
+_WORDS = (
+    "refund approved denied review contract vendor customer policy limit escalated "
+    "inspection hazard mitigated retention tier renewal claim pending invoice "
+    "schedule compliance exception budget variance permit"
+).split()
+
+
+@dataclass
+class GraphSpec:
+    """Shape of a synthetic memory graph."""
+
+    size: int = 100
+    tenant_id: str = "bench"
+    team_id: str = "bench"
+    relations_per_event: int = 2
+    flagged_ratio: float = 0.1
+    seed: int = 0
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_node(
+    rng: random.Random,
+    layer: MemoryLayer,
+    index: int,
+    spec: GraphSpec,
+) -> MemoryNode:
+    """Build one node with realistic micro/summary/full text and tags."""
+    node_type = rng.choice(LAYER_TYPES[layer])
+    tags = [
+        f"status:{rng.choice(STATUSES)}",
+        f"priority:{rng.choice(PRIORITIES)}",
+        f"{node_type}:{index:05d}",
+    ]
+    if layer == MemoryLayer.EVENT:
+        tags.append(f"outcome:{rng.choice(['approved', 'denied', 'deferred'])}")
+    if rng.random() < spec.flagged_ratio:
+        tags.append(f"flag:{rng.choice(FLAGS)}")
+
+    return MemoryNode(
+        symbol=f"{layer.value}.{node_type}.n{index:05d}",
+        tenant_id=spec.tenant_id,
+        team_id=spec.team_id,
+        micro=_sentence(rng, 6),
+        summary=" ".join(_sentence(rng, 12) for _ in range(3)),
+        full="\n".join(_sentence(rng, 15) for _ in range(12)),
+        tags=tags,
+        salience=round(rng.random(), 3),
+        confidence=round(rng.uniform(0.5, 1.0), 3),
+    )
+
+
+def make_graph(spec: GraphSpec) -> list[MemoryNode]:
+    """Build ``spec.size`` nodes; events link to entities, policies and goals."""
+    rng = random.Random(spec.seed)
+    by_layer: dict[MemoryLayer, list[MemoryNode]] = {layer: [] for layer, _ in LAYER_MIX}
+    nodes: list[MemoryNode] = []
+
+    for index in range(spec.size):
+        layer = _pick_layer(rng)
+        node = make_node(rng, layer, index, spec)
+        by_layer[layer].append(node)
+        nodes.append(node)
+
+    for node in by_layer[MemoryLayer.EVENT]:
+        for _ in range(spec.relations_per_event):
+            target_layer = rng.choice(list(EVENT_LINKS))
+            if not by_layer[target_layer]:
+                continue
+            target = rng.choice(by_layer[target_layer])
+            node.relationships.append(
+                Relationship(
+                    source_symbol=node.symbol,
+                    target_symbol=target.symbol,
+                    relation_type=EVENT_LINKS[target_layer],
+                )
+            )
+
+    return nodes
+
+
+def _pick_layer(rng: random.Random) -> MemoryLayer:
+    roll = rng.random()
+    for layer, share in LAYER_MIX:
+        roll -= share
+        if roll < 0:
+            return layer
+    return MemoryLayer.EVENT
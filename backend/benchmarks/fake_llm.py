@@ -0,0 +1,124 @@
+"""Recorded-response stand-in for the Anthropic messages API.
+
+Responses are keyed by a hash of (model, system, messages), so a recording
+made against the live API replays deterministically offline. Prompts with no
+recording get a canned reply and are counted as misses.
+
+Recording file format::
+
+    {"responses": {"<sha256>": {"text": "...", "output_tokens": 42}}}
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.tokens import count_tokens
+
+MISSING_RESPONSE = "(no recorded response)"
+
+
+def prompt_key(model: str, system: str, messages: list[dict[str, Any]]) -> str:
+    """Stable key for a request."""
+    payload = json.dumps(
+        {"model": model, "system": system, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class _TextBlock:
+    text: str
+    type: str = "text"
+
+
+@dataclass
+class _Usage:
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class FakeMessage:
+    """Subset of ``anthropic.types.Message`` the agents read."""
+
+    content: list[_TextBlock]
+    usage: _Usage
+    model: str
+    recorded: bool
+    stop_reason: str = "end_turn"
+
+
+class _Messages:
+    def __init__(self, llm: "FakeLLM"):
+        self._llm = llm
+
+    async def create(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        system: str = "",
+        max_tokens: int = 1024,
+        **_: Any,
+    ) -> FakeMessage:
+        return self._llm.respond(model, system, messages)
+
+
+@dataclass
+class FakeLLM:
+    """Drop-in for ``AsyncAnthropic`` that replays recorded responses."""
+
+    responses: dict[str, dict[str, Any]] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def __post_init__(self) -> None:
+        self.messages = _Messages(self)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "FakeLLM":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(responses=data.get("responses", {}))
+
+    def record(self, model: str, system: str, messages: list[dict[str, Any]], text: str) -> None:
+        """Add a response, e.g. when building a recording from live runs."""
+        self.responses[prompt_key(model, system, messages)] = {
+            "text": text,
+            "output_tokens": count_tokens(text),
+        }
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(
+            json.dumps({"responses": self.responses}, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+    def respond(self, model: str, system: str, messages: list[dict[str, Any]]) -> FakeMessage:
+        recorded = self.responses.get(prompt_key(model, system, messages))
+        if recorded is None:
+            self.misses += 1
+            text, output_tokens = MISSING_RESPONSE, 0
+        else:
+            self.hits += 1
+            text = recorded["text"]
+            output_tokens = recorded.get("output_tokens", count_tokens(text))
+
+        input_text = system + "".join(_message_text(m) for m in messages)
+        return FakeMessage(
+            content=[_TextBlock(text=text)],
+            usage=_Usage(input_tokens=count_tokens(input_text), output_tokens=output_tokens),
+            model=model,
+            recorded=recorded is not None,
+        )
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content if isinstance(block, dict))
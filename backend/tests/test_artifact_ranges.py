@@ -0,0 +1,33 @@
+"""Range header parsing for artifact downloads."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.missions import _parse_range
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=900-", (900, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=900-5000", (900, 999)),
+        (None, None),
+        ("items=0-9", None),
+        ("bytes=0-9,20-29", None),
+        ("bytes=abc-", None),
+        ("bytes=500-100", None),  # Invalid range: served in full
+    ],
+)
+def test_parse_range(header: str | None, expected: tuple[int, int] | None) -> None:
+    assert _parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-1200", "bytes=-0"])
+def test_range_is_unsatisfiable(header: str) -> None:
+    with pytest.raises(HTTPException) as e:
+        _parse_range(header, 1000)
+
+    assert e.value.status_code == 416
+    assert e.value.headers == {"Content-Range": "bytes */1000"}
@@ -0,0 +1,71 @@
+"""Ledger writer failure handling."""
+
+import asyncio
+import logging
+from types import TracebackType
+from uuid import uuid4
+
+import pytest
+
+from app.models.passport import ConfidenceVector, LedgerEntry
+from app.platform.ledger import LedgerWriteError, LedgerWriter
+
+
+class _FailingSession:
+    """Session whose commits always fail."""
+
+    async def __aenter__(self) -> "_FailingSession":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    def add_all(self, rows: list[object]) -> None:
+        pass
+
+    async def commit(self) -> None:
+        raise ConnectionError("database unavailable")
+
+
+def _writer() -> LedgerWriter:
+    return LedgerWriter(_FailingSession, flush_interval=0, max_retries=1)  # type: ignore[arg-type]
+
+
+def _entry(sequence: int) -> LedgerEntry:
+    return LedgerEntry(
+        sequence=sequence,
+        agent_id="intake",
+        action="classify",
+        inputs_summary="",
+        outputs_summary="",
+        duration_ms=1,
+        confidence=ConfidenceVector(value=0.5),
+    )
+
+
+def test_close_raises_when_entries_are_lost() -> None:
+    async def run() -> None:
+        async with _writer() as writer:
+            await writer.append(uuid4(), _entry(1))
+
+    with pytest.raises(LedgerWriteError):
+        asyncio.run(run())
+
+
+def test_run_failure_is_not_masked_by_ledger_failure(caplog: pytest.LogCaptureFixture) -> None:
+    passport_id = uuid4()
+
+    async def run() -> None:
+        async with _writer() as writer:
+            await writer.append(passport_id, _entry(7))
+            raise ValueError("team run failed")
+
+    with caplog.at_level(logging.ERROR), pytest.raises(ValueError, match="team run failed"):
+        asyncio.run(run())
+
+    assert f"{passport_id}#7" in caplog.text
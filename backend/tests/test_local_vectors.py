@@ -0,0 +1,199 @@
+"""Offline semantic search: HashingProvider over the local vector backend."""
+
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.memory.embeddings import EmbeddingStore, embedding_text, tag_key
+from app.memory.vectors.local import LocalVectorBackend
+from app.memory.vectors.providers import HashingProvider, content_hash
+from app.models.memory import MemoryLayer, MemoryNode
+
+
+def _node(symbol: str, text: str, tags: list[str] | None = None) -> MemoryNode:
+    return MemoryNode(
+        symbol=symbol,
+        tenant_id="tenant",
+        team_id="team",
+        micro=text,
+        summary=text,
+        full=text,
+        tags=tags or [],
+    )
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    return np.random.default_rng(0).normal(size=(12, 8)).astype(np.float32)
+
+
+@pytest.fixture
+def backend(tmp_path: Path, vectors: np.ndarray) -> LocalVectorBackend:
+    backend = LocalVectorBackend(tmp_path / "collection")
+    backend.upsert(
+        [f"n{i}" for i in range(len(vectors))],
+        vectors.tolist(),
+        [{"row": i, "even": i % 2 == 0} for i in range(len(vectors))],
+    )
+    return backend
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> EmbeddingStore:
+    return EmbeddingStore(
+        uuid4(),
+        "team",
+        backend=LocalVectorBackend(tmp_path / "store"),
+        provider=HashingProvider(cache_size=0),
+    )
+
+
+def test_query_returns_nearest_first(backend: LocalVectorBackend, vectors: np.ndarray) -> None:
+    matches = backend.query([vectors[3].tolist()], limit=3)[0]
+
+    assert matches[0].id == "n3"
+    assert matches[0].distance == pytest.approx(0.0, abs=1e-4)
+    assert [m.distance for m in matches] == sorted(m.distance for m in matches)
+
+
+def test_query_filters_inside_search(backend: LocalVectorBackend, vectors: np.ndarray) -> None:
+    matches = backend.query([vectors[3].tolist()], limit=4, where={"even": True})[0]
+
+    assert len(matches) == 4
+    assert all(m.metadata["even"] for m in matches)
+    assert backend.query([vectors[3].tolist()], limit=4, where={"row": 99}) == [[]]
+
+
+def test_delete_removes_rows(backend: LocalVectorBackend, vectors: np.ndarray) -> None:
+    backend.delete(["n3", "missing"])
+
+    assert backend.count() == len(vectors) - 1
+    assert backend.get(ids=["n3"]) == []
+    assert "n3" not in [m.id for m in backend.query([vectors[3].tolist()], limit=20)[0]]
+
+
+def test_reload_from_disk(
+    tmp_path: Path, backend: LocalVectorBackend, vectors: np.ndarray
+) -> None:
+    backend.update(["n1"], metadatas=[{"even": True}])
+    backend.update(["n2"], embeddings=[vectors[5].tolist()])
+    backend.delete(["n0"])  # Tombstone
+    backend.delete(["n4", "n6"])  # Reaches the compaction threshold
+    backend.upsert(["n12"], [vectors[0].tolist()], [{"row": 12}])
+
+    reloaded = LocalVectorBackend(tmp_path / "collection")
+
+    assert reloaded.count() == len(vectors) - 2
+    assert reloaded.get(ids=["n1"])[0].metadata == {"row": 1, "even": True}
+    stored = reloaded.get(ids=["n2", "n12"], include_embeddings=True)
+    assert np.allclose(stored[0].embedding, vectors[5])
+    assert np.allclose(stored[1].embedding, vectors[0])
+    assert {m.id for m in reloaded.query([vectors[5].tolist()], limit=2)[0]} == {"n2", "n5"}
+
+
+def test_metadata_update_keeps_vector_file(tmp_path: Path, backend: LocalVectorBackend) -> None:
+    files = {p.name: p.read_bytes() for p in (tmp_path / "collection").glob("vectors.*")}
+
+    backend.update(["n1"], metadatas=[{"even": True}])
+
+    assert {p.name: p.read_bytes() for p in (tmp_path / "collection").glob("vectors.*")} == files
+
+
+def test_saved_rows_are_never_overwritten(
+    tmp_path: Path, backend: LocalVectorBackend, vectors: np.ndarray
+) -> None:
+    path = tmp_path / "collection"
+    records = (path / "records.json").read_bytes()
+    saved = {p.name: p.read_bytes()[: vectors.nbytes] for p in path.glob("vectors.*")}
+
+    backend.update(["n2"], embeddings=[vectors[5].tolist()])
+    (path / "records.json").write_bytes(records)  # As if the process died before saving
+
+    assert {p.name: p.read_bytes()[: vectors.nbytes] for p in path.glob("vectors.*")} == saved
+    reloaded = LocalVectorBackend(path)
+    assert np.allclose(reloaded.get(ids=["n2"], include_embeddings=True)[0].embedding, vectors[2])
+
+
+def test_dimension_mismatch_is_rejected(backend: LocalVectorBackend) -> None:
+    with pytest.raises(ValueError):
+        backend.upsert(["x"], [[0.0, 1.0]], [{}])
+
+
+def test_semantic_search_with_tags(store: EmbeddingStore) -> None:
+    brakes = _node("event.inspection.001", "brake pads worn on truck", ["facility:dayton"])
+    tires = _node("event.inspection.002", "tire tread low on van", ["facility:dayton"])
+    other = _node("event.inspection.003", "brake pads worn on bus", ["facility:xenia"])
+    store.upsert_many([brakes, tires, other])
+
+    matches = store.find_similar("worn brake pads", limit=3)
+    assert matches[0][0] in {str(brakes.id), str(other.id)}
+
+    scoped = store.find_similar("worn brake pads", limit=3, tags=["facility:dayton"])
+    assert [node_id for node_id, _, _ in scoped][0] == str(brakes.id)
+    assert str(other.id) not in [node_id for node_id, _, _ in scoped]
+
+    layered = store.find_similar("worn brake pads", limit=3, layer=MemoryLayer.ENTITY)
+    assert layered == []
+
+
+def test_removed_tag_keys_are_dropped(store: EmbeddingStore) -> None:
+    node = _node("event.finding.001", "leaking hydraulic line", ["status:open", "priority:high"])
+    store.upsert_many([node])
+    assert [node_id for node_id, _ in store.find_by_tags(["status:open"])] == [str(node.id)]
+
+    node.tags = ["status:closed", "priority:high"]
+    store.upsert_many([node])
+
+    metadata = store.find_by_tags(["status:closed"])[0][1]
+    assert tag_key("status:open") not in metadata
+    assert store.find_by_tags(["status:open"]) == []
+    assert store.find_by_tags(["priority:high"])[0][0] == str(node.id)
+
+    node.tags = []
+    store.update_metadata([node])
+    assert store.find_by_tags(["priority:high"]) == []
+
+
+def test_store_delete(store: EmbeddingStore) -> None:
+    node = _node("event.finding.002", "cracked windshield")
+    store.upsert_many([node])
+
+    store.delete(node.id)
+
+    assert store.count() == 0
+    assert store.find_similar("cracked windshield") == []
+
+
+def test_shared_cache_evicts_oldest(tmp_path: Path) -> None:
+    shared = LocalVectorBackend(tmp_path / "shared")
+    provider = HashingProvider(cache_size=0, shared_cache=shared, shared_cache_size=10)
+
+    provider.embed([f"text {i}" for i in range(8)])
+    # Written last but without a store time, so they are the oldest
+    legacy = [content_hash(f"legacy {i}") for i in range(3)]
+    shared.upsert(legacy, [[0.0] * provider.dimensions] * 3, [{"model": provider.name}] * 3)
+    provider.embed(["text 8"])
+
+    assert shared.count() == 9
+    assert shared.get(ids=legacy) == []
+    assert len(shared.get(ids=[content_hash(f"text {i}") for i in range(9)])) == 9
+
+
+def test_preloaded_vectors_are_reused(store: EmbeddingStore) -> None:
+    node = _node("event.finding.003", "corroded battery terminal", ["status:open"])
+    other = _node("event.finding.004", "flat tire")
+    snapshot_vector = [1.0] + [0.0] * (store.provider.dimensions - 1)
+    store.preload(
+        [str(node.id), str(other.id)],
+        [snapshot_vector, snapshot_vector],
+        [content_hash(embedding_text(node)), "hash of older text"],
+    )
+
+    store.upsert_many([node, other])
+
+    stored = {r.id: r for page in store.iter_records() for r in page}
+    assert stored[str(node.id)].embedding == snapshot_vector
+    assert stored[str(node.id)].metadata[tag_key("status:open")] is True
+    assert stored[str(other.id)].embedding != snapshot_vector  # Text changed: re-embedded
@@ -0,0 +1,81 @@
+"""Keyset cursors and the statements that page memory listings."""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.memory import QueryRequest, _paginate
+from app.db.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.memory.queries import MemoryQueryBuilder
+from app.memory.storage import MemoryStorage, NodeFilter
+from app.models.memory import MemoryResolution
+
+
+def _sql(newest_first: bool = False, after: tuple[datetime, UUID] | None = None) -> str:
+    storage = MemoryStorage(None, uuid4())  # type: ignore[arg-type]  # Only compiles SQL
+    stmt = storage._find_stmt(
+        NodeFilter(team_id="team"),
+        MemoryResolution.MICRO,
+        prefetch=None,
+        limit=20,
+        offset=0,
+        after=after,
+        newest_first=newest_first,
+    )
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip() -> None:
+    created, node_id = datetime(2026, 10, 19, 8, 30, 15, 250), uuid4()
+
+    token = encode_cursor(created, node_id)
+
+    assert decode_cursor(token, datetime, UUID) == (created, node_id)
+
+
+def test_cursor_rejects_garbage() -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", datetime, UUID)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(encode_cursor(0.5, uuid4()), datetime, UUID)
+
+
+def test_default_order_is_salience() -> None:
+    sql = _sql()
+
+    assert "ORDER BY memory_nodes.salience DESC, memory_nodes.id DESC" in sql
+
+
+def test_newest_first_orders_by_creation() -> None:
+    sql = _sql(newest_first=True)
+
+    assert "ORDER BY memory_nodes.created_at DESC, memory_nodes.id DESC" in sql
+    assert "salience DESC" not in sql
+
+
+def test_cursor_keys_on_creation_not_salience() -> None:
+    sql = _sql(after=(datetime(2026, 10, 19), uuid4()))
+
+    assert "(memory_nodes.created_at, memory_nodes.id) < (" in sql
+    assert "ORDER BY memory_nodes.created_at DESC, memory_nodes.id DESC" in sql
+
+
+def test_queries_keep_salience_order_by_default() -> None:
+    builder = _paginate(_builder(), QueryRequest(offset=40))
+
+    assert not builder._newest_first
+    assert (builder._offset, builder._cursor) == (40, None)
+
+
+def test_queries_page_by_cursor_when_asked() -> None:
+    newest = _paginate(_builder(), QueryRequest(order="newest"))
+    continued = _paginate(_builder(), QueryRequest(cursor="token"))
+
+    assert newest._newest_first and newest._cursor is None
+    assert continued._newest_first and continued._cursor == "token"
+
+
+def _builder() -> MemoryQueryBuilder:
+    return MemoryQueryBuilder(None, uuid4(), "")  # type: ignore[arg-type]  # No team: no vectors
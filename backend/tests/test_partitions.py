@@ -0,0 +1,83 @@
+"""Moving a tenant's memory rows out of the DEFAULT partitions.
+
+Needs PostgreSQL migrated to head; skipped unless ``TEST_DATABASE_URL`` is set.
+"""
+
+import os
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db import TenantModel
+from app.db.partitions import move_from_default, partition_name
+from app.memory.storage import MemoryStorage
+from app.models.memory import MemoryNode, Relationship, RelationType
+
+if not os.environ.get("TEST_DATABASE_URL"):
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+
+async def test_move_from_default_keeps_rows_and_search_vectors(
+    connection: AsyncConnection,
+) -> None:
+    session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+    tenant_id = uuid4()
+    # Core insert: skips the mapper hook that creates the tenant's partitions
+    await session.execute(
+        insert(TenantModel.__table__).values(
+            id=tenant_id,
+            name="Legacy",
+            slug=f"legacy-{tenant_id.hex[:8]}",
+            settings={},
+            created_at=datetime.utcnow(),
+            is_active=True,
+        )
+    )
+    storage = MemoryStorage(session, tenant_id)
+    await storage.create(_node("entity.vehicle.truck-7", "Truck 7"))
+    await storage.create(
+        _node(
+            "event.finding.001",
+            "Brake line leak on truck 7",
+            [
+                Relationship(
+                    source_symbol="event.finding.001",
+                    target_symbol="entity.vehicle.truck-7",
+                    relation_type=RelationType.INVOLVES,
+                )
+            ],
+        )
+    )
+
+    moved = await move_from_default(session, tenant_id)
+
+    assert moved == {"memory_nodes": 2, "memory_relationships": 1}
+    nodes = partition_name("memory_nodes", tenant_id)
+    result = await session.execute(
+        text(f"SELECT count(*), count(search_vector) FROM {nodes} WHERE tenant_id = :tenant_id"),
+        {"tenant_id": tenant_id},
+    )
+    assert tuple(result.one()) == (2, 2)
+    for table in ("memory_nodes", "memory_relationships"):
+        result = await session.execute(
+            text(f"SELECT count(*) FROM {table}_default WHERE tenant_id = :tenant_id"),
+            {"tenant_id": tenant_id},
+        )
+        assert result.scalar() == 0
+    found = await storage.find_by_pattern("event.finding.*", team_id="legacy")
+    assert [n.symbol for n in found] == ["event.finding.001"]
+
+
+def _node(symbol: str, text: str, relationships: list[Relationship] | None = None) -> MemoryNode:
+    return MemoryNode(
+        symbol=symbol,
+        tenant_id="legacy",
+        team_id="legacy",
+        micro=text,
+        summary=text,
+        full=text,
+        relationships=relationships or [],
+    )
@@ -0,0 +1,280 @@
+"""Index use of every MemoryStorage query (EXPLAIN against a migrated database).
+
+Each test calls a real MemoryStorage method, captures the SQL it emits with a
+``before_cursor_execute`` hook and EXPLAINs every statement that reads or
+writes the memory tables with the same parameters. Sequential scans are
+disabled, so a small database still shows which index the planner *can* use:
+every statement must be served by an index, prune to the tenant's partition,
+and the method's statements together must use the expected indexes.
+
+Needs PostgreSQL migrated to head (``alembic upgrade head``); skipped unless
+``TEST_DATABASE_URL`` is set. Everything runs in a transaction that is rolled
+back.
+"""
+
+import json
+import os
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db import TenantModel
+from app.db.pagination import plan_relations
+from app.memory.storage import MemoryStorage, NodeFilter
+from app.models.memory import MemoryLayer, MemoryNode, Relationship, RelationType
+
+if not os.environ.get("TEST_DATABASE_URL"):
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+TEAM = "plans"
+MEMORY_TABLES = ("memory_nodes", "memory_relationships")
+
+Call = Callable[[MemoryStorage], Awaitable[Any]]
+
+# Method call -> indexes its statements must use (parent index names)
+CASES: dict[str, tuple[Call, set[str]]] = {
+    "get_by_symbol": (
+        lambda s: s.get_by_symbol("event.finding.001"),
+        {"uq_memory_nodes_tenant_symbol"},
+    ),
+    "get_by_id": (lambda s: s.get_by_id(uuid4()), {"memory_nodes_pkey"}),
+    "get_many_by_symbols": (
+        lambda s: s.get_many_by_symbols(["event.finding.001", "entity.vehicle.truck-7"]),
+        {"uq_memory_nodes_tenant_symbol"},
+    ),
+    "find_by_team": (
+        lambda s: s.find(NodeFilter(team_id=TEAM)),
+        {"ix_memory_nodes_scope_salience"},
+    ),
+    "find_newest_first": (
+        lambda s: s.find(NodeFilter(team_id=TEAM), newest_first=True),
+        {"ix_memory_nodes_scope_created"},
+    ),
+    "find_by_team_keyset": (
+        lambda s: s.find(NodeFilter(team_id=TEAM), after=(datetime.utcnow(), uuid4())),
+        {"ix_memory_nodes_scope_created"},
+    ),
+    "find_with_total": (
+        lambda s: s.find_with_total(NodeFilter(team_id=TEAM)),
+        {"ix_memory_nodes_scope_salience"},
+    ),
+    "find_by_layer": (
+        lambda s: s.find_by_layer(MemoryLayer.EVENT, team_id=TEAM),
+        {"ix_memory_nodes_scope_layer_salience"},
+    ),
+    "find_by_type": (
+        lambda s: s.find(NodeFilter(team_id=TEAM, node_type="finding")),
+        {"ix_memory_nodes_scope_type_salience"},
+    ),
+    "find_by_pattern_prefix": (
+        lambda s: s.find_by_pattern("event.finding.*", team_id=TEAM),
+        {"ix_memory_nodes_symbol_prefix"},
+    ),
+    "find_by_pattern_infix": (
+        lambda s: s.find_by_pattern("*.finding.*", team_id=TEAM),
+        {"ix_memory_nodes_symbol_trgm"},
+    ),
+    "find_by_pattern_suffix": (
+        lambda s: s.find_by_pattern("*.truck-7", team_id=TEAM),
+        {"ix_memory_nodes_symbol_trgm"},
+    ),
+    "find_by_tags": (
+        lambda s: s.find_by_tags(["status:blocked"], team_id=TEAM),
+        {"ix_memory_nodes_scope_tags"},
+    ),
+    "find_by_text": (
+        lambda s: s.find(NodeFilter(team_id=TEAM, text='"brake line" leak*')),
+        {"ix_memory_nodes_scope_search"},
+    ),
+    "rank_text": (
+        lambda s: s.rank_text("brake line", NodeFilter(team_id=TEAM)),
+        {"ix_memory_nodes_scope_search"},
+    ),
+    "headlines": (lambda s: s.headlines("brake", [uuid4()]), {"memory_nodes_pkey"}),
+    "count": (
+        lambda s: s.count(NodeFilter(team_id=TEAM, layer=MemoryLayer.EVENT)),
+        {"ix_memory_nodes_scope_layer_salience"},
+    ),
+    "exists": (
+        lambda s: s.exists(NodeFilter(team_id=TEAM, layer=MemoryLayer.EVENT)),
+        {"ix_memory_nodes_scope_layer_salience"},
+    ),
+    "count_by_layer": (
+        lambda s: s.count_by_layer(TEAM),
+        {"ix_memory_nodes_scope_layer_salience"},
+    ),
+    "get_related_outgoing": (
+        lambda s: s.get_related("event.finding.001", [RelationType.INVOLVES]),
+        {
+            "uq_memory_nodes_tenant_symbol",
+            "ix_memory_relationships_source_id",
+            "memory_nodes_pkey",
+        },
+    ),
+    "get_related_incoming": (
+        lambda s: s.get_related("entity.vehicle.truck-7", direction="incoming"),
+        {
+            "uq_memory_nodes_tenant_symbol",
+            "ix_memory_relationships_target_id",
+            "memory_nodes_pkey",
+        },
+    ),
+    "get_related_many": (
+        lambda s: s.get_related_many([uuid4()], [RelationType.INVOLVES]),
+        {"ix_memory_relationships_source_id", "memory_nodes_pkey"},
+    ),
+    "traverse": (
+        lambda s: s.traverse("event.finding.001", [RelationType.INVOLVES], max_depth=1),
+        {"uq_memory_nodes_tenant_symbol", "ix_memory_relationships_source_id"},
+    ),
+    "boost_salience_many": (
+        lambda s: s.boost_salience_many(["event.finding.001"]),
+        {"uq_memory_nodes_tenant_symbol"},
+    ),
+    "decay_salience": (
+        lambda s: s.decay_salience(TEAM),
+        {"ix_memory_nodes_scope_salience"},
+    ),
+    "delete": (
+        lambda s: s.delete("event.finding.001"),
+        {
+            "uq_memory_nodes_tenant_symbol",
+            "ix_memory_relationships_source_id",
+            "ix_memory_relationships_target_id",
+        },
+    ),
+}
+
+
+@pytest.fixture
+async def storage(connection: AsyncConnection) -> MemoryStorage:
+    """Storage for a new tenant (with its partitions) holding a small graph."""
+    session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+    tenant_id = uuid4()
+    session.add(TenantModel(id=tenant_id, name="Plans", slug=f"plans-{tenant_id.hex[:8]}"))
+    await session.flush()
+
+    storage = MemoryStorage(session, tenant_id)
+    await storage.create(_node("entity.vehicle.truck-7", "Truck 7", []))
+    await storage.create(
+        _node(
+            "event.finding.001",
+            "Brake line leak on truck 7",
+            ["status:blocked"],
+            [
+                Relationship(
+                    source_symbol="event.finding.001",
+                    target_symbol="entity.vehicle.truck-7",
+                    relation_type=RelationType.INVOLVES,
+                )
+            ],
+        )
+    )
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    return storage
+
+
+@pytest.mark.parametrize("name", list(CASES))
+async def test_statements_use_expected_indexes(
+    name: str, storage: MemoryStorage, connection: AsyncConnection
+) -> None:
+    call, expected = CASES[name]
+
+    statements = await _capture(connection, lambda: call(storage))
+    assert statements, f"{name} emitted no memory queries"
+
+    used: set[str] = set()
+    for statement, parameters in statements:
+        plan = await _explain(connection, statement, parameters)
+        nodes = _plan_nodes(plan)
+        scanned = [n["Relation Name"] for n in nodes if n.get("Node Type") == "Seq Scan"]
+        assert not [r for r in scanned if r.startswith(MEMORY_TABLES)], (
+            f"{name}: sequential scan in\n{statement}"
+        )
+        partitions = [r for r in plan_relations(plan) if r.startswith(MEMORY_TABLES)]
+        assert all(r.endswith(storage.tenant_id.hex) for r in partitions), (
+            f"{name}: not pruned to the tenant's partition: {partitions}"
+        )
+        used |= {n["Index Name"] for n in nodes if "Index Name" in n}
+
+    assert expected <= await _parent_indexes(connection, used), name
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _node(
+    symbol: str,
+    text: str,
+    tags: list[str],
+    relationships: list[Relationship] | None = None,
+) -> MemoryNode:
+    return MemoryNode(
+        symbol=symbol,
+        tenant_id="plans",
+        team_id=TEAM,
+        micro=text,
+        summary=text,
+        full=text,
+        tags=tags,
+        relationships=relationships or [],
+    )
+
+
+async def _capture(
+    connection: AsyncConnection, call: Callable[[], Awaitable[Any]]
+) -> list[tuple[str, Any]]:
+    """Statements on the memory tables that ``call`` sends to the database."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(_conn: Any, _cursor: Any, statement: str, parameters: Any, *_: Any) -> None:
+        reads_memory = any(table in statement for table in MEMORY_TABLES)
+        if reads_memory and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    sync_engine = connection.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        await call()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def _explain(connection: AsyncConnection, statement: str, parameters: Any) -> Any:
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _plan_nodes(plan: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+async def _parent_indexes(connection: AsyncConnection, names: set[str]) -> set[str]:
+    """Map partition indexes to the parent index they were created from."""
+    result = await connection.execute(
+        text(
+            """
+            SELECT coalesce(parent.relname, child.relname)
+            FROM pg_class child
+            LEFT JOIN pg_inherits ON pg_inherits.inhrelid = child.oid
+            LEFT JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE child.relname = ANY(:names)
+            """
+        ),
+        {"names": list(names)},
+    )
+    return set(result.scalars())
@@ -0,0 +1,15 @@
+"""Retrieval cache behaviour that needs no Redis server."""
+
+import asyncio
+from uuid import uuid4
+
+from app.memory.cache import RetrievalCache
+
+
+def test_disabled_cache_misses_without_a_generation() -> None:
+    cache = RetrievalCache(uuid4(), "team", enabled=False)
+
+    generation, cached = asyncio.run(cache.get_many(["brake line", "truck 7"], {}))
+
+    assert generation is None
+    assert cached == [None, None]
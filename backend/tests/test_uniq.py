@@ -0,0 +1,173 @@
+"""UNI-Q codec round trips (planning/research/UNIQ_SPEC.md examples)."""
+
+import pytest
+
+from app.models.memory import MemoryNode, MemoryResolution, Relationship, RelationType
+from app.models.passport import ConfidenceVector, LedgerEntry
+from app.uniq import (
+    Caveat,
+    Layer,
+    MessageType,
+    Priority,
+    Ref,
+    Relation,
+    Status,
+    Trend,
+    UniqEntity,
+    UniqMessage,
+    UniqParseError,
+    decode_ledger_entry,
+    decode_node,
+    encode,
+    encode_ledger_entry,
+    encode_many,
+    encode_node,
+    parse,
+    parse_many,
+)
+
+SPEC_ENTITIES = [
+    "Ⓐclaims◉⁺",
+    "Ⓣ001✓⟨risk:low·μ:0.7⟩⚐",
+    "Ⓣ001✓⟨risk:low·μ:0.95⟩",
+    "Ⓣ001✓⟨risk:low·μ:0.6⟩⚑",
+    "Ⓐlegal→Ⓐcompliance",
+    "Ⓐcompliance←Ⓐlegal",
+    "Ⓐteam-a↔Ⓐteam-b",
+    "Ⓣtask-1∼Ⓣtask-2",
+    "Ⓥcall⊂Ⓔcustomer",
+    "Ⓥcall⊃Ⓞpolicy",
+    "Ⓞpolicy∧Ⓢgoal",
+    "Ⓣrev·001◉",
+    "Ⓥdecision·*→Ⓐmgmt",
+    "Ⓔvendor·*⚠",
+    "Ⓥresearch·nexus-precedents✓⟨sources:12⟩",
+    "Ⓥdecision·ref4721✓⟨amt:450⟩⚑⊂Ⓔmaria-chen Denied, escalated",
+]
+
+
+@pytest.mark.parametrize("text", SPEC_ENTITIES)
+def test_spec_entities_round_trip(text: str) -> None:
+    assert encode(parse(text)) == text
+
+
+def test_parse_fields() -> None:
+    entity = parse("Ⓥdecision·ref4721✓⁺⑤↗⟨amt:450⟩⚑⊂Ⓔmaria-chen Denied, escalated")
+
+    assert entity.ref == Ref(Layer.EVENT, "decision", "ref4721")
+    assert entity.status == Status.COMPLETE
+    assert entity.priority == Priority.HIGH
+    assert entity.progress == 5
+    assert entity.trend == Trend.IMPROVING
+    assert entity.tag("amt") == "450"
+    assert entity.caveats == [Caveat.ATTENTION]
+    assert entity.relations == [(Relation.INVOLVES, Ref(Layer.ENTITY, "maria-chen"))]
+    assert entity.text == "Denied, escalated"
+
+
+def test_stable_trend_and_depends_on_are_distinct() -> None:
+    assert Trend.STABLE.value != Relation.DEPENDS_ON.value
+
+    entity = parse("Ⓣreview≡→Ⓐlegal")
+    assert entity.trend == Trend.STABLE
+    assert entity.relations == [(Relation.DEPENDS_ON, Ref(Layer.AGENT, "legal"))]
+
+    assert parse("Ⓣreview→Ⓐlegal").trend is None
+
+
+def test_entities_joined_by_semicolon_round_trip() -> None:
+    entities = [
+        UniqEntity(ref=Ref(Layer.EVENT, "a"), status=Status.ACTIVE, text="one; two"),
+        UniqEntity(ref=Ref(Layer.EVENT, "b"), text="three \\ four"),
+        UniqEntity(ref=Ref(Layer.EVENT, "c")),
+    ]
+
+    encoded = encode_many(entities, sep=";")
+
+    assert list(parse_many(encoded)) == entities
+
+
+def test_parse_many_lines_and_separators() -> None:
+    parsed = list(parse_many("Ⓐa◉ first;Ⓐb○\n Ⓐc✓ third"))
+
+    assert [e.ref.kind for e in parsed] == ["a", "b", "c"]
+    assert [e.text for e in parsed] == ["first", "", "third"]
+
+
+def test_parse_rejects_trailing_entities() -> None:
+    with pytest.raises(UniqParseError):
+        parse("Ⓐa one;Ⓐb two")
+
+
+def test_message_round_trip() -> None:
+    text = "Q:wc042│Ⓐclaims→Ⓐops│Ⓣrev·ctr│Ⓔmedimg·mri⟨wc:042·pt:JD·need:vendor-agr⟩"
+
+    message = UniqMessage.parse(text)
+
+    assert message.type == MessageType.QUERY
+    assert message.context_id == "wc042"
+    assert message.encode() == text
+    assert message.entities(0)[0].relations == [
+        (Relation.DEPENDS_ON, Ref(Layer.AGENT, "ops"))
+    ]
+    assert message.entities(2)[0].tags == ["wc:042", "pt:JD", "need:vendor-agr"]
+
+
+def test_node_round_trip() -> None:
+    node = MemoryNode(
+        symbol="event.decision.ref4721",
+        tenant_id="tenant",
+        team_id="claims",
+        micro="Denied; escalated to review",
+        summary="Claim denied",
+        full="Claim denied",
+        tags=["status:complete", "priority:high", "flag:attention", "amt:450"],
+        relationships=[
+            Relationship(
+                source_symbol="event.decision.ref4721",
+                target_symbol="entity.customer.maria-chen",
+                relation_type=RelationType.INVOLVES,
+            )
+        ],
+    )
+
+    decoded = decode_node(encode_node(node))
+
+    assert decoded["symbol"] == node.symbol
+    assert decoded["micro"] == node.micro
+    assert sorted(decoded["tags"]) == sorted(node.tags)
+    assert decoded["relationships"] == [
+        {
+            "source_symbol": node.symbol,
+            "target_symbol": "entity.customer.maria-chen",
+            "relation_type": RelationType.INVOLVES,
+        }
+    ]
+    assert decode_node(
+        encode_node(node, MemoryResolution.SUMMARY), MemoryResolution.SUMMARY
+    )["summary"] == node.summary
+
+
+def test_ledger_entry_round_trip() -> None:
+    entry = LedgerEntry(
+        sequence=3,
+        agent_id="librarian",
+        action="retrieve",
+        inputs_summary="query",
+        outputs_summary="4 nodes; 2 precedents",
+        duration_ms=120,
+        tokens_used=800,
+        confidence=ConfidenceVector(value=0.85),
+    )
+
+    decoded = decode_ledger_entry(encode_ledger_entry(entry))
+
+    assert decoded == {
+        "agent_id": "librarian",
+        "action": "retrieve",
+        "sequence": 3,
+        "duration_ms": 120,
+        "tokens_used": 800,
+        "confidence": 0.85,
+        "outputs_summary": "4 nodes; 2 precedents",
+    }